@@ -0,0 +1,217 @@
+# 上报系统：检测状态与解出的帧经有界队列汇总，后台线程成批发送
+import json
+import socket
+import threading
+import time
+from collections import deque
+
+
+class UDPTransport:
+    """每批一个 UDP 数据报（JSON Lines），不建立连接，发送失败不重试"""
+
+    def __init__(self, host="127.0.0.1", port=9000):
+        self.addr = (host, port)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, data):
+        self.sock.sendto(data, self.addr)
+
+    def close(self):
+        self.sock.close()
+
+
+class TCPTransport:
+    """TCP 长连接（JSON Lines），断开后在下一批发送时重连"""
+
+    def __init__(self, host="127.0.0.1", port=9000, timeout=1.0):
+        self.addr = (host, port)
+        self.timeout = timeout
+        self.sock = None
+
+    def send(self, data):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.addr, timeout=self.timeout)
+        try:
+            self.sock.sendall(data)
+        except OSError:
+            self.close()
+            raise
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class FileTransport:
+    """追加写入 JSON Lines 文件"""
+
+    def __init__(self, path):
+        self.path = path
+        self.f = open(path, "ab")
+
+    def send(self, data):
+        self.f.write(data)
+        self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+
+class ReportSystem:
+    """
+    非阻塞批量上报
+    - 解调 / 监测线程只调用 report_*，向有界队列追加一条记录后立即返回，从不等待 I/O
+    - 后台线程攒够 batch_size 条或等待 flush_interval 秒后，把一批记录编码为 JSON Lines 一次发出
+    - 队列满时按 policy 丢弃："drop_oldest" 丢弃最早的记录，"drop_newest" 丢弃新记录
+    - 发送失败的批次计入 send_errors 并丢弃，不回灌队列；无法编码为 JSON 的记录计入 dropped
+    - 发送端由后台线程在退出前关闭，不会与正在进行的发送并发
+    """
+
+    POLICIES = ("drop_oldest", "drop_newest")
+
+    def __init__(self, transport, max_queue=4096, batch_size=64, flush_interval=0.05, policy="drop_oldest",
+                 metrics=None):
+        """
+        Args:
+            transport: 提供 send(bytes) / close() 的发送端
+            max_queue: 队列容量（条）
+            batch_size: 每批最多记录数
+            flush_interval: 不满一批时的最长等待时间 (s)
+            policy: 队列满时的丢弃策略
+            metrics: 可选的 tools.metrics.Metrics，记录每批发送耗时（采样数记为记录条数）与丢弃数
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"不支持的丢弃策略: {policy}")
+        self.transport = transport
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.metrics = metrics
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self.running = False
+
+        self.queued = 0  # 成功入队的记录数
+        self.sent = 0  # 已发送的记录数
+        self.dropped = 0  # 因队列满或无法编码丢弃的记录数
+        self.batches = 0  # 已发送的批次数
+        self.send_errors = 0  # 发送失败的批次数
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, record):
+        """入队一条记录（dict），不阻塞；返回是否入队"""
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                if self.metrics is not None:
+                    self.metrics.drop("report")
+                if self.policy == "drop_newest":
+                    return False
+                self._queue.popleft()
+            self._queue.append(record)
+            self.queued += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    def report_state(self, state, **fields):
+        """上报检测状态（如 "L1"），附加字段原样写入"""
+        return self.submit({"type": "state", "time": time.time(), "state": state, **fields})
+
+    def report_frame(self, channel, frame):
+        """上报一帧（protocol.parser.Frame），签名与 DemodWorker 的 on_frame 回调一致"""
+        return self.submit({
+            "type": "frame",
+            "time": time.time(),
+            "channel": channel,
+            "position": frame.position,
+            "sync_errors": frame.sync_errors,
+            "payload": frame.payload.hex(),
+        })
+
+    def _take_batch(self):
+        with self._cond:
+            if len(self._queue) < self.batch_size and self.running:
+                self._cond.wait(self.flush_interval)
+            n = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(n)]
+
+    def _encode(self, batch):
+        """编码为 JSON Lines，跳过无法编码的记录（计入丢弃），返回 (数据, 条数)"""
+        lines = []
+        for r in batch:
+            try:
+                lines.append(json.dumps(r, ensure_ascii=False) + "\n")
+            except (TypeError, ValueError):
+                with self._cond:
+                    self.dropped += 1
+                if self.metrics is not None:
+                    self.metrics.drop("report")
+        return "".join(lines).encode(), len(lines)
+
+    def _send(self, batch):
+        t0 = time.perf_counter()
+        data, n = self._encode(batch)
+        if not n:
+            return
+        try:
+            self.transport.send(data)
+        except OSError:
+            self.send_errors += 1
+            return
+        finally:
+            if self.metrics is not None:
+                self.metrics.record("report.send", time.perf_counter() - t0, n)
+        self.sent += n
+        self.batches += 1
+
+    def _run(self):
+        try:
+            while self.running:
+                batch = self._take_batch()
+                if batch:
+                    self._send(batch)
+            # 退出前发送剩余记录
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                self._send(batch)
+        finally:
+            self.transport.close()
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._queue)
+        return {
+            "queued": self.queued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "pending": pending,
+            "batches": self.batches,
+            "send_errors": self.send_errors,
+        }
+
+    def stop(self, timeout=2.0):
+        """
+        停止发送线程：剩余记录发完后由线程关闭发送端
+        Rets:
+            线程是否已在 timeout 内退出；未退出时发送端保持打开，由线程在发送结束后关闭
+        """
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+        if self._thread is None:
+            self.transport.close()
+            return True
+        self._thread.join(timeout=timeout)
+        return not self._thread.is_alive()
@@ -1,46 +1,179 @@
 import numpy as np
-from dsp.rrc import rrc_filter
+from dsp.ddc import NCO
+from dsp.channelizer import DecimatingChannelizer
+from dsp.rrc import RRCFilter
+from dsp.discriminator import QuadratureDiscriminator
+from dsp.symbol_sync import TimingRecovery
+from dsp.multi_level_decision import MultiLevelSlicer
+from dsp.utils import as_complex
+from dsp.buffers import BufferPool
+from tools.metrics import stage_span
 
 class BroadcastFrontend:
     """
     - 在一级 / 二级干扰存在时
     - 提取干净的广播源基带
+    - RRC 抽头只设计一次，跨数据块连续滤波
+    - 滤波与 AGC 都在同一个输出缓冲区上原地完成
     """
 
     def __init__(self,
                  fs=2e6,
                  rs=250e3,
                  alpha=0.25,
-                 num_taps=88):
+                 num_taps=88,
+                 pool=None):
 
         self.fs = fs
         self.rs = rs
         self.alpha = alpha
         self.num_taps = num_taps
 
-    def process(self, iq):
+        self.rrc = RRCFilter(
+            rs=self.rs,
+            fs=self.fs,
+            alpha=self.alpha,
+            numtaps=self.num_taps,
+            pool=pool
+        )
+
+    def reset(self):
+        self.rrc.reset()
+
+    def process(self, iq, out=None):
         """
         输入：Pluto 基带 IQ（433.2 MHz 对齐）
-        输出：广播源净化基带
+        输出：广播源净化基带（相对输入滞后 self.rrc.delay 个采样）
+        out: 可选的输出缓冲区（长度与输入相同）
         """
 
         # ① RRC 窄带滤波
-        bb = rrc_filter(
-            iq,
-            fs=self.fs,
-            rs=self.rs,
-            alpha=self.alpha,
-            num_taps=self.num_taps
-        )
+        bb = self.rrc.process(iq, out=out)
 
-        # ② 软件 AGC
-        power = np.mean(np.abs(bb)**2)
+        # ② 软件 AGC（vdot 求功率不产生 |bb|^2 临时数组，归一化原地完成）
+        power = np.vdot(bb, bb).real / len(bb) if len(bb) else 0.0
         if power > 1e-8:
-            bb = bb / np.sqrt(power)
+            bb *= bb.real.dtype.type(1 / np.sqrt(power))
 
         return bb
 
 
+class BaseFSKDemod:
+    """
+    4-FSK 解调链路：
+    - NCO 下变频到信道中心；decimation > 1 时改由单信道的 DecimatingChannelizer 下变频并抽取，
+      后级在 fs / decimation 上运行
+    - RRC 滤波 -> 正交鉴频 -> 定时恢复 -> 多级判决（电平跨块跟踪）
+    - 各级状态跨数据块保持，连续喂入不会在块边界重新锁定
+    - single_precision=True 时输入（含 int16 原始数据）转为 complex64，下变频 / 滤波 / 鉴频全程单精度
+    - 各级的中间结果与工作区都来自链路自己的缓冲区池 (self.pool)；
+      调用方给出 out 时数据块长度不变的稳态下每块不再分配数组
+    """
+
+    STAGES = ("filter", "discriminate", "sync", "decide")  # instrument() 计时的各级
+
+    def __init__(self, fs, offset, baud, sps, alpha=0.25, single_precision=False, decimation=1):
+        """
+        Args:
+            fs: 采样率
+            offset: 信道中心相对 LO 的频偏 (Hz)
+            baud: 符号率（仅用于滤波器设计）
+            sps: 每符号采样点数（定时恢复使用 fs / sps 作为符号率）
+            alpha: RRC 滚降系数
+            single_precision: 是否走单精度快速路径
+            decimation: 信道化抽取倍数（须整除 sps，见 dsp.channelizer.plan_decimation）
+        """
+        if sps % decimation:
+            raise ValueError("sps 必须是抽取倍数的整数倍")
+        self.fs = fs
+        self.offset = offset
+        self.baud = baud
+        self.sps = sps
+        self.single_precision = single_precision
+        self.decimation = decimation
+        self.fs_out = fs / decimation
+        sps_out = sps // decimation
+
+        self.pool = BufferPool()
+        if decimation > 1:
+            self.nco = None
+            self.channelizer = DecimatingChannelizer(
+                fs, {"channel": {"offset": offset, "baud": baud, "decimation": decimation}}, alpha=alpha,
+                pool=self.pool)
+        else:
+            self.nco = NCO(fs, offset)
+            self.channelizer = None
+        self.rrc = RRCFilter(rs=baud, fs=self.fs_out, alpha=alpha, numtaps=11 * sps_out, pool=self.pool)
+        self.disc = QuadratureDiscriminator(self.fs_out, lpf_cutoff=baud, fast_atan=single_precision, pool=self.pool)
+        self.sync = TimingRecovery(self.fs_out, self.fs_out / sps_out, pool=self.pool)
+        self.slicer = MultiLevelSlicer(pool=self.pool)
+
+        self.metrics = None
+        self.stages = dict.fromkeys(self.STAGES)  # 各级的 tools.metrics.Stage（未启用时为 None）
+
+    def instrument(self, metrics, prefix=""):
+        """启用逐级计时：filter / discriminate / sync / decide 各级记为 "<prefix>.<级>"；metrics 为 None 时关闭"""
+        self.metrics = metrics
+        p = f"{prefix}." if prefix else ""
+        # 各级阶段在启用时取出，每块数据不再拼接名称、查表
+        self.stages = {k: None if metrics is None else metrics.stage(p + k) for k in self.STAGES}
+
+    def reset(self):
+        if self.channelizer is not None:
+            self.channelizer.reset()
+        else:
+            self.nco.reset()
+        self.rrc.reset()
+        self.disc.reset()
+        self.sync.reset()
+        self.slicer.reset()
+
+    def demod_symbols(self, iq, out=None):
+        """
+        输入一块宽带 IQ，返回本块判决出的符号 (0~3)，无符号时返回 None
+        out: 可选的 int64 符号缓冲区，长度不小于本块采样数（int16 原始数据为其一半）；给出时返回其前若干个元素
+        """
+        st, n, pool = self.stages, len(iq), self.pool
+        with stage_span(st["filter"], n):
+            if self.single_precision:
+                n = len(iq) // 2 if np.asarray(iq).dtype == np.int16 else n
+                iq = as_complex(iq, np.complex64, out=pool.get(self, "iq", n, np.complex64))
+            # 下变频（抽取）结果原地滤波
+            if self.channelizer is not None:
+                bb = self.channelizer.process(iq)["channel"]
+                n = len(bb)
+            else:
+                bb = self.nco.mix(iq, out=pool.get(self, "bb", n, np.result_type(iq, np.complex64)))
+            bb = self.rrc.process(bb, out=bb)
+        with stage_span(st["discriminate"], n):
+            freq_dev = self.disc.process(bb, out=pool.get(self, "freq", n, self.disc.dtype))
+        with stage_span(st["sync"], n):
+            samples, _ = self.sync.process(
+                freq_dev, out=(pool.get(self, "samples", n, np.float64), pool.get(self, "locked", n, np.int64)))
+        if len(samples) == 0:
+            return None
+        with stage_span(st["decide"], n):
+            confidence = pool.get(self, "confidence", n, np.float64)
+            if out is None:
+                out = np.empty(len(samples), dtype=np.int64)
+            symbols, _ = self.slicer.process(samples, out=(out, confidence))
+        return symbols
+
+    def process(self, iq, out=None):
+        """
+        输入一块宽带 IQ，返回本块解出的比特（每符号 2 bit），无符号时返回 None
+        out: 可选的 uint8 比特缓冲区，长度不小于本块采样数的 2 倍；给出时返回其前若干个元素
+        """
+        n = len(iq) // 2 if np.asarray(iq).dtype == np.int16 else len(iq)
+        symbols = self.demod_symbols(iq, out=self.pool.get(self, "symbols", n, np.int64))
+        if symbols is None:
+            return None
+        bits = np.empty(2 * len(symbols), dtype=np.uint8) if out is None else out[:2 * len(symbols)]
+        np.right_shift(symbols, 1, out=bits[0::2], casting="unsafe")
+        np.bitwise_and(symbols, 1, out=bits[1::2], casting="unsafe")
+        return bits
+
+
 
 
 
@@ -1,28 +1,100 @@
 import threading
 import time
+from collections import deque
 
 class DemodWorker(threading.Thread):
-    def __init__(self, name, demod, iq_source):
+    def __init__(self, name, demod, iq_source, verbose=True, parser=None, on_frame=None, metrics=None):
+        """
+        parser: 可选的 protocol.parser.FrameParser，设置后按符号组帧
+        on_frame: 每解出一帧时的回调 on_frame(name, frame)
+        metrics: 可选的 tools.metrics.Metrics，记录读取耗时、数据龄与解调各级耗时
+        """
         super().__init__(daemon=True)
         self.name = name
         self.demod = demod
         self.iq_source = iq_source
+        self.verbose = verbose
+        self.parser = parser
+        self.on_frame = on_frame
+        self.metrics = metrics
+        if metrics is not None and hasattr(demod, "instrument"):
+            demod.instrument(metrics, name)
         self.running = False
+        self.blocks = 0  # 已处理的数据块数
+        self.bits = 0  # 已解出的比特数
+        self.frames = 0  # 已解出的帧数
+
+        # 暂停 / 恢复：暂停时线程保持存活，恢复只需置位事件
+        self.active = threading.Event()
+        self.active.set()
+        self._resync = False
+        self._resumed_at = None
+        self.first_block_latency = deque(maxlen=256)  # 恢复到处理完首块的耗时 (s)
 
     def run(self):
         self.running = True
-        print(f"[{self.name}] started")
+        if self.verbose:
+            print(f"[{self.name}] started")
 
         while self.running:
+            if not self.active.wait(timeout=0.05):
+                continue
+            if self._resync:
+                # 在工作线程内丢弃暂停期间积压的数据并清空解调状态
+                if hasattr(self.iq_source, "seek_latest"):
+                    self.iq_source.seek_latest()
+                self.demod.reset()
+                if self.parser is not None:
+                    self.parser.reset()
+                self._resync = False
+
+            t0 = time.perf_counter()
             iq = self.iq_source.read()
             if iq is None:
-                time.sleep(0.01)
+                time.sleep(0.001)
                 continue
+            if self.metrics is not None:
+                self.metrics.record(f"{self.name}.read", time.perf_counter() - t0, len(iq))
+                if hasattr(self.iq_source, "age"):
+                    self.metrics.observe(f"{self.name}.buffer_age_ms", self.iq_source.age() * 1e3)
+
+            if self.parser is None:
+                bits = self.demod.process(iq)
+                num_bits = 0 if bits is None else len(bits)
+            else:
+                symbols = self.demod.demod_symbols(iq)
+                num_bits = 0 if symbols is None else 2 * len(symbols)
+                if symbols is not None:
+                    self._handle_frames(self.parser.process(symbols))
+            self.blocks += 1
+            if self._resumed_at is not None:
+                self.first_block_latency.append(time.perf_counter() - self._resumed_at)
+                self._resumed_at = None
+            if num_bits:
+                self.bits += num_bits
+                if self.verbose:
+                    print(f"[{self.name}] decoded {num_bits} bits")
+
+    def _handle_frames(self, frames):
+        for frame in frames:
+            self.frames += 1
+            if self.verbose:
+                print(f"[{self.name}] frame @{frame.position}: {len(frame.payload)} bytes")
+            if self.on_frame is not None:
+                self.on_frame(self.name, frame)
+
+    def pause(self):
+        self.active.clear()
 
-            bits = self.demod.process(iq)
-            if bits is not None:
-                print(f"[{self.name}] decoded {len(bits)} bits")
+    def resume(self):
+        if self.active.is_set():
+            return
+        self._resync = True
+        self._resumed_at = time.perf_counter()
+        self.active.set()
 
     def stop(self):
-        print(f"[{self.name}] stopped")
+        if self.verbose:
+            print(f"[{self.name}] stopped")
         self.running = False
+        self.active.set()
@@ -0,0 +1,228 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from dsp import kernels
+from protocol.frame_sync import bits_to_symbols
+
+START_TIMEOUT = 30.0  # 等待子进程就绪的最长时间 (s)
+
+
+def _demod_loop(name, demod, shm_name, num_slots, block_size, task_q, result_q):
+    """子进程：从共享内存槽读取 IQ，解调后把 (空闲槽号, 代号, 比特) 送回主进程；任务的代号变化时先复位解调状态"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = np.ndarray((num_slots, block_size), dtype=np.complex64, buffer=shm.buf)
+    generation = 0
+    try:
+        # spawn 出的子进程不继承主进程已加载的内核，先加载再通知就绪
+        kernels.warmup()
+        result_q.put(None)
+        while True:
+            task = task_q.get()
+            if task is None:
+                break
+            slot, n, gen = task
+            if gen != generation:
+                demod.reset()
+                generation = gen
+            bits = demod.process(slots[slot, :n])
+            result_q.put((slot, gen, bits))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        del slots
+        shm.close()
+
+
+class ProcessDemodWorker:
+    """
+    多进程解调后端，接口与 DemodWorker 一致 (start / stop / running)
+    - 每条解调链路运行在独立进程中，不再与主循环争抢 GIL；子进程以 spawn 方式启动，
+      不继承主进程中其他线程持有的锁（多线程进程中 fork 可能死锁），解调器经 pickle 传入
+    - IQ 数据经 multiprocessing.shared_memory 槽传递，队列中只传槽号
+    - 子进程处理不过来且无空闲槽时直接丢弃数据块，不阻塞读取
+    - 每次恢复代号加 1，任务与结果都带代号：子进程在新代号的第一块前复位解调器，
+      收集线程在新代号的第一个结果前复位组帧器，恢复前的结果不会混入新的帧
+    - stop() 等送数 / 收集线程与子进程都退出后才释放共享内存
+    """
+
+    def __init__(self, name, demod, iq_source, num_slots=8, block_size=1024 * 16,
+                 drop_when_full=True, verbose=True, parser=None, on_frame=None, metrics=None):
+        """
+        Args:
+            name: 链路名称
+            demod: 解调器对象（需可 pickle，在子进程中运行）
+            iq_source: 提供 read() 的数据源（如 RingCursor）
+            num_slots: 共享内存槽数量
+            block_size: 每槽采样点数
+            drop_when_full: 无空闲槽时丢弃数据块 (False 则等待，用于离线基准)
+            verbose: 是否打印启动 / 停止与解码结果
+            parser: 可选的 FrameParser，在主进程收集线程中按比特组帧
+            on_frame: 每解出一帧时的回调 on_frame(name, frame)
+            metrics: 可选的 Metrics，记录主进程侧的读取耗时、数据龄与丢弃数（子进程内各级不计时）
+        """
+        self.name = name
+        self.demod = demod
+        self.iq_source = iq_source
+        self.num_slots = num_slots
+        self.block_size = block_size
+        self.drop_when_full = drop_when_full
+        self.verbose = verbose
+        self.parser = parser
+        self.on_frame = on_frame
+        self.metrics = metrics
+        self.running = False
+
+        # 暂停 / 恢复：暂停时子进程保持存活，只停止送数
+        self.active = threading.Event()
+        self.active.set()
+        self._resync = False
+        self._generation = 0  # 恢复次数，只在送数线程中修改
+        self._parser_generation = 0  # 组帧器对应的代号，只在收集线程中访问
+
+        self.blocks = 0  # 已处理的数据块数
+        self.bits = 0  # 已解出的比特数
+        self.frames = 0  # 已解出的帧数
+        self.dropped = 0  # 无空闲槽而丢弃的数据块数
+
+        self._shm = None
+        self._proc = None
+        self._feeder = None
+        self._collector = None
+
+    def start(self):
+        ctx = mp.get_context("spawn")
+        nbytes = self.num_slots * self.block_size * np.dtype(np.complex64).itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._slots = np.ndarray((self.num_slots, self.block_size), dtype=np.complex64, buffer=self._shm.buf)
+
+        self._task_q = ctx.Queue()
+        self._result_q = ctx.Queue()
+        self._free = queue.SimpleQueue()
+        for i in range(self.num_slots):
+            self._free.put(i)
+
+        self._proc = ctx.Process(
+            target=_demod_loop,
+            args=(self.name, self.demod, self._shm.name, self.num_slots, self.block_size,
+                  self._task_q, self._result_q),
+            daemon=True,
+        )
+        self._proc.start()
+        # 等子进程导入模块、加载内核并连上共享内存，首块数据不承担启动开销
+        try:
+            self._result_q.get(timeout=START_TIMEOUT)
+        except queue.Empty:
+            self._proc.terminate()
+            self._proc.join()
+            self._proc = None
+            self._slots = None
+            self._shm.close()
+            self._shm.unlink()
+            raise RuntimeError(f"[{self.name}] 解调子进程 {START_TIMEOUT:.0f}s 内未就绪")
+
+        self.running = True
+        self._feeder = threading.Thread(target=self._feed, daemon=True)
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._feeder.start()
+        self._collector.start()
+        if self.verbose:
+            print(f"[{self.name}] started (process {self._proc.pid})")
+
+    def _feed(self):
+        while self.running:
+            if not self.active.wait(timeout=0.05):
+                continue
+            if self._resync:
+                if hasattr(self.iq_source, "seek_latest"):
+                    self.iq_source.seek_latest()
+                self._generation += 1
+                self._resync = False
+
+            t0 = time.perf_counter()
+            iq = self.iq_source.read()
+            if iq is None:
+                time.sleep(0.001)
+                continue
+            if self.metrics is not None:
+                self.metrics.record(f"{self.name}.read", time.perf_counter() - t0, len(iq))
+                if hasattr(self.iq_source, "age"):
+                    self.metrics.observe(f"{self.name}.buffer_age_ms", self.iq_source.age() * 1e3)
+
+            for start in range(0, len(iq), self.block_size):
+                chunk = iq[start:start + self.block_size]
+                try:
+                    if self.drop_when_full:
+                        slot = self._free.get_nowait()
+                    else:
+                        slot = self._free.get(timeout=1.0)
+                except queue.Empty:
+                    self.dropped += 1
+                    if self.metrics is not None:
+                        self.metrics.drop(self.name)
+                    continue
+                self._slots[slot, :len(chunk)] = chunk
+                self._task_q.put((slot, len(chunk), self._generation))
+
+    def _collect(self):
+        while self.running or not self._free.qsize() == self.num_slots:
+            try:
+                slot, gen, bits = self._result_q.get(timeout=0.1)
+            except queue.Empty:
+                if not self._proc.is_alive():
+                    break
+                continue
+            self._free.put(slot)
+            self.blocks += 1
+            if bits is not None:
+                self.bits += len(bits)
+                if self.verbose:
+                    print(f"[{self.name}] decoded {len(bits)} bits")
+                if self.parser is not None:
+                    self._parse(gen, bits)
+
+    def _parse(self, gen, bits):
+        # 结果按提交顺序返回，代号变化即恢复后的第一块
+        if gen != self._parser_generation:
+            self.parser.reset()
+            self._parser_generation = gen
+        for frame in self.parser.process(bits_to_symbols(bits)):
+            self.frames += 1
+            if self.on_frame is not None:
+                self.on_frame(self.name, frame)
+
+    def pause(self):
+        self.active.clear()
+
+    def resume(self):
+        if self.active.is_set():
+            return
+        self._resync = True
+        self.active.set()
+
+    def stop(self):
+        if self.verbose:
+            print(f"[{self.name}] stopped")
+        self.running = False
+        self.active.set()
+        if self._proc is None:
+            return
+
+        # 送数线程退出后不再写共享内存 / 提交任务，结束标记排在所有任务之后
+        self._feeder.join()
+        self._task_q.put(None)
+        self._proc.join(timeout=1.0)
+        if self._proc.is_alive():
+            self._proc.terminate()
+            self._proc.join()
+        # 子进程退出后收集线程取完剩余结果即退出
+        self._collector.join()
+
+        self._slots = None
+        self._shm.close()
+        self._shm.unlink()
+        self._proc = None
@@ -0,0 +1,151 @@
+import time
+from collections import deque
+
+import numpy as np
+
+from demod.base_demod import BaseFSKDemod
+from demod.demod_worker import DemodWorker
+from dsp.channelizer import plan_decimation
+from protocol.parser import FrameParser
+
+
+class WorkerPool:
+    """
+    预热的解调线程池
+    - 启动时为每个等级建好解调链路（滤波器已设计、各级缓存已预热）并挂起
+    - 状态切换只是暂停 / 恢复线程，不再创建销毁线程和重新设计滤波器
+    - 带迟滞：新状态需连续出现 switch_hold 次且距上次切换不少于 min_dwell 秒才切换
+    - 记录切换耗时与恢复后首块处理延迟
+    """
+
+    def __init__(self,
+                 ring,
+                 levels,
+                 fs,
+                 worker_class=DemodWorker,
+                 switch_hold=3,
+                 min_dwell=0.0,
+                 verbose=True,
+                 reporter=None,
+                 single_precision=False,
+                 metrics=None,
+                 channelize=False):
+        """
+        Args:
+            ring: IQRingBuffer，每个等级各取一个读游标
+            levels: {等级: (offset, baud, sps)}
+            fs: 采样率
+            worker_class: DemodWorker 或 ProcessDemodWorker
+            switch_hold: 新状态需连续出现的检测次数
+            min_dwell: 两次切换之间的最短间隔 (s)
+            verbose: 是否打印解码结果
+            reporter: 可选的 ReportSystem，设置后各链路组帧并上报解出的帧（状态切换由主控上报）
+            single_precision: 解调链路是否走单精度快速路径
+            metrics: 可选的 tools.metrics.Metrics，传给各解调线程
+            channelize: 是否按符号率抽取（plan_decimation），抽取倍数 > 1 的等级以抽取信道化代替全速率下变频
+        """
+        self.ring = ring
+        self.levels = levels
+        self.fs = fs
+        self.worker_class = worker_class
+        self.switch_hold = switch_hold
+        self.min_dwell = min_dwell
+        self.verbose = verbose
+        self.reporter = reporter
+        self.single_precision = single_precision
+        self.stage_metrics = metrics
+        self.channelize = channelize
+
+        self.workers = {}
+        self.current = "NONE"
+
+        # 迟滞状态
+        self._candidate = None
+        self._candidate_count = 0
+        self._last_switch = -float("inf")
+
+        # 统计
+        self.switches = 0
+        self.suppressed = 0  # 被迟滞过滤掉的状态抖动次数
+        self.switch_latency = deque(maxlen=1024)  # 暂停 / 恢复调用耗时 (s)
+
+    def start(self):
+        for level, (offset, baud, sps) in self.levels.items():
+            decimation = plan_decimation(self.fs, baud, sps) if self.channelize else 1
+            demod = BaseFSKDemod(self.fs, offset, baud, sps=sps, single_precision=self.single_precision,
+                                 decimation=decimation)
+            # 预热：跑一块空数据，让各级缓存与 FFT 计划就绪
+            demod.process(np.zeros(self.ring.block_size, dtype=np.complex64))
+            demod.reset()
+
+            extra = {}
+            if self.reporter is not None:
+                extra = {"parser": FrameParser(), "on_frame": self.reporter.report_frame}
+            if self.stage_metrics is not None:
+                extra["metrics"] = self.stage_metrics
+            w = self.worker_class(level, demod, self.ring.cursor(level), verbose=self.verbose, **extra)
+            w.pause()
+            w.start()
+            self.workers[level] = w
+
+    def update(self, state):
+        """输入本次检测状态，按迟滞规则决定是否切换，返回当前生效状态"""
+        if state == self.current:
+            if self._candidate is not None:
+                self.suppressed += 1
+            self._candidate = None
+            self._candidate_count = 0
+            return self.current
+
+        if state == self._candidate:
+            self._candidate_count += 1
+        else:
+            if self._candidate is not None:
+                self.suppressed += 1
+            self._candidate = state
+            self._candidate_count = 1
+
+        now = time.monotonic()
+        if self._candidate_count >= self.switch_hold and now - self._last_switch >= self.min_dwell:
+            self.activate(state)
+            self._last_switch = now
+        return self.current
+
+    def activate(self, state):
+        """立即切换到 state（"NONE" 表示全部暂停），不经迟滞"""
+        t0 = time.perf_counter()
+        for level, w in self.workers.items():
+            if level != state:
+                w.pause()
+        if state in self.workers:
+            self.workers[state].resume()
+        self.switch_latency.append(time.perf_counter() - t0)
+
+        self.current = state
+        self.switches += 1
+        self._candidate = None
+        self._candidate_count = 0
+
+    def metrics(self):
+        lat = np.array(self.switch_latency) * 1e6
+        first = {}
+        for level, w in self.workers.items():
+            fb = np.array(getattr(w, "first_block_latency", ())) * 1e3
+            if len(fb):
+                first[level] = {"mean_ms": float(fb.mean()), "max_ms": float(fb.max())}
+        return {
+            "current": self.current,
+            "switches": self.switches,
+            "suppressed": self.suppressed,
+            "switch_latency_us": {
+                "mean": float(lat.mean()) if len(lat) else 0.0,
+                "max": float(lat.max()) if len(lat) else 0.0,
+            },
+            "first_block_latency": first,
+        }
+
+    def stop(self):
+        for level, w in self.workers.items():
+            w.stop()
+            self.ring.release(w.iq_source)
+        self.workers = {}
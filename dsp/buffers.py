@@ -0,0 +1,44 @@
+import numpy as np
+
+
+class BufferPool:
+    """
+    按用途复用的预分配缓冲区（每条解调链路一个）
+    - get(owner, name, shape, dtype) 返回固定用途的缓冲区视图，只在容量不足或类型不同时重新分配，
+      数据块长度不变时稳态下不再分配数组
+    - 扩容时多留 1/4 余量：每块符号数这类小幅波动的长度不会反复分配
+    - 键为 (id(owner), name)：同一条链路的各级共用一个池，互不冲突
+    - 缓冲区内容只在下一次以同一键 get 之前有效；不加锁，只能在一个线程内使用
+    """
+
+    def __init__(self):
+        self._arrays = {}
+        self.allocations = 0  # 累计分配次数（稳态下不再增长）
+
+    def get(self, owner, name, shape, dtype=np.complex64):
+        """
+        Args:
+            owner: 使用缓冲区的对象
+            name: 用途
+            shape: 长度，或二维形状 (行, 列)
+            dtype: 数据类型
+        Rets:
+            指定形状的缓冲区（内容未初始化）
+        """
+        size = shape if isinstance(shape, int) else shape[0] * shape[1]
+        key = (id(owner), name)
+        arr = self._arrays.get(key)
+        if arr is None or len(arr) < size or arr.dtype != dtype:
+            grow = arr is not None and arr.dtype == dtype
+            arr = np.empty(size + size // 4 if grow else size, dtype=dtype)
+            self._arrays[key] = arr
+            self.allocations += 1
+        arr = arr[:size]
+        return arr if isinstance(shape, int) else arr.reshape(shape)
+
+    @property
+    def nbytes(self):
+        return sum(arr.nbytes for arr in self._arrays.values())
+
+    def clear(self):
+        self._arrays.clear()
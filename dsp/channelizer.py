@@ -0,0 +1,152 @@
+import numpy as np
+from scipy import signal
+
+from dsp.ddc import NCO
+from dsp.buffers import BufferPool
+
+MIN_SPS = 4  # 抽取后每符号至少保留的采样点数（鉴频与定时恢复所需）
+STOPBAND_DB = 60  # 抗混叠滤波器的阻带衰减 (dB)
+
+
+def channels_from_pool(pool):
+    """从算子池配置 (如 demod.threshold_cfg.OPERATOR_POOL) 中取出 {名称: {"offset", "baud"}}"""
+    return {name: {"offset": cfg["offset"], "baud": cfg["baud"]} for name, cfg in pool.items()}
+
+
+def plan_decimation(fs, baud, sps=None, min_sps=MIN_SPS):
+    """
+    按符号率选择抽取倍数：抽取后每符号不少于 min_sps 个采样点
+    Args:
+        sps: 可选，抽取前的每符号采样点数；给出时取能整除 sps 的最大倍数（定时恢复要求整数 sps）
+    Rets:
+        抽取倍数 D (>= 1)
+    """
+    limit = max(1, int(fs // (min_sps * baud)))
+    if sps is None:
+        return limit
+    return max(d for d in range(1, limit + 1) if sps % d == 0)
+
+
+def design_taps(fs, bandwidth, decimation, stopband_db=STOPBAND_DB):
+    """
+    抗混叠低通（Kaiser 窗）：通带 bandwidth / 2，阻带从 fs / D - bandwidth / 2 开始，
+    即抽取后折叠进通带的频段；信道选择由后级 RRC 完成，这里只需防止混叠，抽头很少
+    """
+    fs_out = fs / decimation
+    passband, stopband = bandwidth / 2, fs_out - bandwidth / 2
+    numtaps, beta = signal.kaiserord(stopband_db, (stopband - passband) / (fs / 2))
+    return signal.firwin(numtaps, (passband + stopband) / 2, window=("kaiser", beta), fs=fs)
+
+
+class DecimatingChannelizer:
+    """
+    逐信道抽取信道化器
+    - 每个信道的带宽 (1 + alpha) * baud 与输出采样率 fs / D 都由其符号率决定（plan_decimation）
+    - D > 1 的信道：下变频 + 抗混叠低通合并为一组复系数带通抽头，只在保留的输出点上计算
+      （每个抽头一次跨步乘加），输出速率上的相位连续 NCO 再把信道搬到零频
+    - D = 1 的信道没有混叠，只做 NCO 下变频（信道滤波即后级 RRC），与 BaseFSKDemod 原有前端相同
+    - 各信道独立计算，不共用多相滤波 + FFT 信道组：三个等级带宽不等、L1 必须保持全速率，
+      且同一时刻只有一个等级在解调，共用的均匀信道组每块都要为空闲信道付出计算
+    - 跨数据块保存历史采样，分块输出与整段处理一致；工作区与输出来自缓冲区池，稳态下每块不再分配
+    """
+
+    def __init__(self, fs, channels, alpha=0.25, min_sps=MIN_SPS, stopband_db=STOPBAND_DB, pool=None):
+        """
+        Args:
+            fs: 输入信号采样率 (Hz)
+            channels: {名称: {"offset": 频偏, "baud": 符号率}}（如 channels_from_pool(OPERATOR_POOL)），
+                      可选 "decimation" 指定抽取倍数（默认 plan_decimation）
+            alpha: 信号的 RRC 滚降系数（决定信道带宽）
+            min_sps: 抽取后每符号至少保留的采样点数
+            stopband_db: 抗混叠滤波器的阻带衰减
+            pool: 工作区所在的缓冲区池（默认独立的池）
+        """
+        self.fs = fs
+        self.channels = {}
+        for name, cfg in channels.items():
+            baud = cfg["baud"]
+            decimation = cfg.get("decimation") or plan_decimation(fs, baud, min_sps=min_sps)
+            bandwidth = (1 + alpha) * baud
+            if fs / decimation < bandwidth:
+                raise ValueError(f"信道 {name}: 抽取 {decimation} 倍后采样率低于信号带宽")
+            taps = design_taps(fs, bandwidth, decimation, stopband_db) if decimation > 1 else np.ones(1)
+            fs_out = fs / decimation
+            # 带通抽头（时间反转，与输入的跨步切片逐个相乘）：h[i] * exp(j2π f i / fs)
+            i = np.arange(len(taps))[::-1]
+            bandpass = taps[::-1] * np.exp(2j * np.pi * cfg["offset"] * i / fs)
+            self.channels[name] = {
+                "offset": cfg["offset"],
+                "baud": baud,
+                "bandwidth": bandwidth,
+                "decimation": decimation,
+                "fs_out": fs_out,
+                "taps": taps,
+                "bandpass": bandpass,
+                "bandpass32": bandpass.astype(np.complex64),
+                "nco": NCO(fs_out if decimation > 1 else fs, cfg["offset"]),
+            }
+        self.L = max(len(ch["taps"]) for ch in self.channels.values()) if self.channels else 1
+        self.pool = BufferPool() if pool is None else pool
+
+        self.reset()
+
+    def reset(self):
+        """清空历史采样与 NCO 相位"""
+        self._hist = np.zeros(self.L - 1, dtype=np.complex128)
+        self._consumed = 0  # 已输入的采样总数
+        for ch in self.channels.values():
+            ch["next"] = 0  # 下一个输出对应的输入绝对序号
+            ch["nco"].reset()
+
+    def process(self, iq, out=None):
+        """
+        信道化一块宽带数据
+        Args:
+            iq: 宽带复数IQ数据块
+            out: 可选的 {名称: 输出缓冲区}，长度不小于 len(iq) // D + 1
+        Returns:
+            {名称: 该信道抽取后的基带数据块}（未给出 out 时为缓冲区池中的数组，下一次调用前有效）
+        """
+        iq = np.asarray(iq)
+        n = len(iq)
+        dtype = np.result_type(iq, np.complex64)
+        L = self.L
+
+        buf = self.pool.get(self, "buf", L - 1 + n, dtype)
+        buf[:L - 1] = self._hist
+        buf[L - 1:] = iq
+        abs0 = self._consumed - (L - 1)  # buf[0] 的绝对序号
+        self._consumed += n
+
+        result = {}
+        for name, ch in self.channels.items():
+            D = ch["decimation"]
+            dst = out[name] if out is not None else self.pool.get(self, ("out", name), n // D + 1, dtype)
+            if D == 1:
+                result[name] = ch["nco"].mix(iq, out=dst[:n])
+                continue
+
+            last = self._consumed - 1
+            count = (last - ch["next"]) // D + 1 if last >= ch["next"] else 0
+            y = dst[:count]
+            if count:
+                if dtype == np.complex64:
+                    bandpass = ch["bandpass32"]
+                else:
+                    bandpass = ch["bandpass"]
+                start = ch["next"] - (len(bandpass) - 1) - abs0
+                acc = self.pool.get(self, "acc", count, dtype)
+                tmp = self.pool.get(self, "tmp", count, dtype)
+                stop = start + D * (count - 1) + 1
+                np.multiply(buf[start:stop:D], bandpass[0], out=acc)
+                for k in range(1, len(bandpass)):
+                    np.multiply(buf[start + k:stop + k:D], bandpass[k], out=tmp)
+                    acc += tmp
+                ch["nco"].mix(acc, out=y)
+                ch["next"] += D * count
+            result[name] = y
+
+        if L > 1:
+            self._hist = self.pool.get(self, "hist", L - 1, dtype)
+            self._hist[:] = buf[len(buf) - (L - 1):]
+        return result
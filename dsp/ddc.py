@@ -1,7 +1,7 @@
 import numpy as np
 
 
-def ddc(iq, fs, fc):
+def ddc(iq, fs, fc, out=None):
     """
     数字下变频
 
@@ -9,11 +9,62 @@ def ddc(iq, fs, fc):
     iq: 复数IQ数据数组
     fs: 输入信号采样率 (Hz)
     fc: 中心频率 (Hz)
+    out: 可选的输出缓冲区（长度与输入相同）
 
     Returns:
     下变频后的基带信号
     """
-    t = np.arrange(len(iq)) / fs
+    t = np.arange(len(iq)) / fs
     lo = np.exp(-2j * np.pi * fc * t)
-    baseband = iq * lo
-    return baseband
+    return np.multiply(iq, lo, out=out)
+
+
+class NCO:
+    """
+    相位连续的数控振荡器（流式下变频）
+    - 本振表只在块长变大时重算一次，之后每块只做一次复数乘法（可直接写入调用方的缓冲区）
+    - 相位跨数据块累积，块边界无相位跳变
+    """
+
+    def __init__(self, fs, fc):
+        """
+        Args:
+            fs: 输入信号采样率 (Hz)
+            fc: 下变频频率 (Hz)
+        """
+        self.fs = fs
+        self.fc = fc
+        self._step = -2 * np.pi * fc / fs  # 每个采样的相位增量
+        self._table = np.zeros(0, dtype=np.complex128)
+        self._table64 = np.zeros(0, dtype=np.complex64)
+        self.reset()
+
+    def reset(self):
+        self.phase = 0.0
+
+    def mix(self, iq, out=None):
+        """
+        对一块数据做下变频
+        Args:
+            iq: 复数IQ数据块
+            out: 可选的输出缓冲区（长度与输入相同，不能与 iq 重叠）
+        Returns:
+            下变频后的基带数据块
+        """
+        iq = np.asarray(iq)
+        n = len(iq)
+        dtype = np.result_type(iq, np.complex64)
+        if out is None:
+            out = np.empty(n, dtype=dtype)
+        if len(self._table) < n:
+            self._table = np.exp(1j * self._step * np.arange(n))
+            self._table64 = self._table.astype(np.complex64)
+        rot = np.exp(1j * self.phase)
+        # 单精度输入：本振表与相位旋转均为 complex64，不升为双精度
+        if dtype == np.complex64:
+            np.multiply(self._table64[:n], np.complex64(rot), out=out)
+        else:
+            np.multiply(self._table[:n], rot, out=out)
+        np.multiply(iq, out, out=out)
+        self.phase = float(np.mod(self.phase + self._step * n, 2 * np.pi))
+        return out
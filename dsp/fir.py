@@ -0,0 +1,128 @@
+import numpy as np
+from scipy import fft as sp_fft
+
+from dsp.buffers import BufferPool
+
+
+def _next_pow2(n):
+    return 1 << (int(n) - 1).bit_length()
+
+
+class StreamingFIR:
+    """
+    流式 overlap-save FIR 滤波器
+    - 抽头的 FFT 只计算一次
+    - 跨数据块保存 numtaps-1 个历史采样，块边界无瞬态
+    - 输出为因果卷积（与 lfilter 一致），相对 mode="same" 滞后 self.delay 个采样
+    - 拼接 / 分段 / FFT 的工作区来自缓冲区池，FFT 原地计算；给出 out 时每块不再分配数组
+    - 实数输入把相邻两段放进一个复数段的实部 / 虚部，一次复数 FFT 同时滤波两段（抽头为实数）
+    """
+
+    def __init__(self, taps, nfft=None, pool=None):
+        """
+        Args:
+            taps: 实系数 FIR 抽头
+            nfft: 每段 FFT 长度 (默认取不小于 8 倍抽头数的 2 的幂)
+            pool: 工作区所在的缓冲区池（默认独立的池）
+        """
+        self.taps = np.asarray(taps, dtype=np.float64)
+        self.numtaps = len(self.taps)
+        self.delay = (self.numtaps - 1) // 2
+
+        if nfft is None:
+            nfft = _next_pow2(max(8 * self.numtaps, 256))
+        if nfft < self.numtaps:
+            raise ValueError("nfft 必须不小于抽头数")
+        self.nfft = nfft
+        self.step = nfft - self.numtaps + 1  # 每段有效输出长度
+
+        # 预先计算抽头频响
+        # 单精度输入 (complex64 / float32) 使用单精度频响，全程不升为双精度
+        self._H = np.fft.fft(self.taps, nfft)
+        self._H32 = self._H.astype(np.complex64)
+        self._tiles = {}  # 按行复制的频响（见 _tiled）
+        self.pool = BufferPool() if pool is None else pool
+
+        self.reset()
+
+    def reset(self):
+        """清空历史采样"""
+        self._hist = None
+
+    def _tiled(self, H, rows):
+        """频响按行复制成 (rows, nfft)：与 (rows, nfft) 工作区原地广播相乘时 NumPy 会整块复制输入，同形状相乘则不会"""
+        tiled = self._tiles.get(H.dtype)
+        if tiled is None or len(tiled) < rows:
+            tiled = np.tile(H, (rows, 1))
+            self._tiles[H.dtype] = tiled
+        return tiled[:rows]
+
+    def process(self, x, out=None):
+        """
+        滤波一块数据
+        Args:
+            x: 输入数据块（实数或复数）
+            out: 可选的输出缓冲区（长度与 x 相同，可以就是 x 本身）
+        Returns:
+            与 x 等长的滤波结果
+        """
+        x = np.asarray(x)
+        n = len(x)
+        is_complex = np.iscomplexobj(x)
+        L = self.numtaps
+
+        if self._hist is None or np.iscomplexobj(self._hist) != is_complex:
+            self._hist = np.zeros(L - 1, dtype=x.dtype)
+
+        if n == 0:
+            return x.copy() if out is None else out
+
+        # 历史 + 新数据，尾部补零到整数段
+        dtype = np.result_type(self._hist, x)
+        num_seg = -(-n // self.step)
+        total = (num_seg - 1) * self.step + self.nfft
+        buf = self.pool.get(self, "buf", total, dtype)
+        buf[:L - 1] = self._hist
+        buf[L - 1:L - 1 + n] = x
+        buf[L - 1 + n:] = 0
+        if out is None:
+            out = np.empty(n, dtype=dtype)
+
+        # 各段复制进二维工作区，一次性原地 FFT（scipy.fft 的单精度变换不升为双精度）
+        size = buf.itemsize
+        segs = np.ndarray((num_seg, self.nfft), dtype, buffer=buf, strides=(self.step * size, size))
+        single = dtype in (np.complex64, np.float32)
+        H = self._H32 if single else self._H
+        if is_complex:
+            work = self.pool.get(self, "work", (num_seg, self.nfft), dtype)
+            work[:] = segs
+        else:
+            # 第 2k 段放实部、第 2k+1 段放虚部
+            work = self.pool.get(self, "work", (-(-num_seg // 2), self.nfft), H.dtype)
+            work.real[:] = segs[0::2]
+            work.imag[:num_seg // 2] = segs[1::2]
+            work.imag[num_seg // 2:] = 0
+        work = sp_fft.fft(work, axis=1, overwrite_x=True)
+        work *= self._tiled(H, len(work))
+        work = sp_fft.ifft(work, axis=1, overwrite_x=True)
+
+        # 每段后 step 个点为有效输出，按段写入 out
+        full = n // self.step
+        rows = out[:full * self.step].reshape(full, self.step)
+        rem = n - full * self.step
+        if is_complex:
+            rows[:] = work[:full, L - 1:]
+            if rem:
+                out[full * self.step:] = work[full, L - 1:L - 1 + rem]
+        else:
+            rows[0::2] = work.real[:(full + 1) // 2, L - 1:]
+            rows[1::2] = work.imag[:full // 2, L - 1:]
+            if rem:
+                last = work.real if full % 2 == 0 else work.imag
+                out[full * self.step:] = last[full // 2, L - 1:L - 1 + rem]
+
+        if self._hist.dtype == dtype:
+            self._hist[:] = buf[n:n + L - 1]
+        else:
+            self._hist = buf[n:n + L - 1].copy()
+        return out
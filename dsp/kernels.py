@@ -0,0 +1,56 @@
+# 可选的 Numba 加速内核
+# - 导入时检测 numba：可用时 accelerate() 返回 JIT 编译的版本，否则原样返回参考实现，调用方无需判断
+# - JIT 使用 cache=True，编译结果缓存到磁盘（模块旁的 __pycache__，或 NUMBA_CACHE_DIR），
+#   只有第一次运行需要编译，之后进程启动直接加载
+# - nogil=True：解调线程在内核中释放 GIL，多条链路可以真正并行
+# - 环境变量 DSP_KERNELS=numpy 强制使用参考实现（对比测试与排查问题用）
+import os
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKEND = "numba" if numba is not None and os.environ.get("DSP_KERNELS", "").lower() != "numpy" else "numpy"
+
+_compiled = []  # (JIT 函数, 预热参数列表)
+_references = {}  # JIT 函数 -> 参考实现
+
+
+def jit(func):
+    """返回 func 的 JIT 版本；numba 不可用或被禁用时返回 None"""
+    if BACKEND != "numba":
+        return None
+    return numba.njit(cache=True, nogil=True)(func)
+
+
+def accelerate(reference, loop=None, warmup_args=None):
+    """
+    选择内核实现
+    Args:
+        reference: NumPy / Python 参考实现
+        loop: 可选的逐点循环版本（与 reference 签名、结果一致），只在 JIT 时使用；默认直接编译 reference
+        warmup_args: 可选，返回参数元组列表的函数；warmup() 用每组参数调用一次以触发编译 / 加载缓存，
+                     实时路径上出现的每种参数类型组合（如单 / 双精度输入）都要有一组，否则首块数据时才编译
+    Rets:
+        JIT 版本或 reference
+    """
+    fast = jit(reference if loop is None else loop)
+    if fast is None:
+        return reference
+    _references[fast] = reference
+    if warmup_args is not None:
+        _compiled.append((fast, warmup_args))
+    return fast
+
+
+def reference(func):
+    """accelerate() 返回的函数对应的参考实现（未加速时即其本身），用于等价性测试"""
+    return _references.get(func, func)
+
+
+def warmup():
+    """在进入实时处理之前加载（必要时编译）全部内核，避免第一块数据的延迟尖峰"""
+    for func, args in _compiled:
+        for a in args():
+            func(*a)
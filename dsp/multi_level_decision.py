@@ -1,36 +1,171 @@
 import numpy as np
 
+from dsp import kernels
+from dsp.buffers import BufferPool
+
 
 def multi_level_decision(synced_samples):
     """
     多级判决：将同步后的频率样本映射到4个符号
+    Rets:
+        symbols: 符号序列 (0~3)
+        estimated_levels: 估计的四个电平（空输入时为空数组）
     """
+    synced_samples = np.asarray(synced_samples)
     if len(synced_samples) == 0:
-        return np.array([], dtype=int)
+        return np.array([], dtype=int), np.array([], dtype=synced_samples.dtype)
 
     # 自适应计算判决门限
-    # 先对样本进行排序，找到四个聚类中心
-    sorted_samples = np.sort(synced_samples)
-    n = len(sorted_samples)
+    # 取四个分位点作为聚类中心（partition 只做局部排序，O(n)）
+    n = len(synced_samples)
 
     # 简单估计四个电平（假设均匀分布）
     level_indices = [int(n * i / 4) for i in range(4)]
-    estimated_levels = sorted_samples[level_indices]
+    estimated_levels = np.partition(synced_samples, level_indices)[level_indices]
 
     # 计算判决门限（相邻电平的中点）
     thresholds = (estimated_levels[:-1] + estimated_levels[1:]) / 2
 
-    symbols = np.zeros_like(synced_samples, dtype=int)
+    # 判决逻辑：落在第几个门限之后即为第几个符号
+    symbols = np.searchsorted(thresholds, synced_samples, side="right").astype(int)
+
+    return symbols, estimated_levels
+
+
+class MultiLevelSlicer:
+    """
+    流式四电平判决器
+    - 判决为一次 searchsorted（slice_symbols 内核），代价随样本数线性增长；结果可写入调用方的缓冲区
+    - 电平跨数据块跟踪：每块做一次 k-means 更新并按 decay 指数平滑，不再逐块重新排序
+    - 输出每个符号的置信度（到最近门限的距离 / 半个电平间隔，0~1）
+    """
+
+    def __init__(self, num_levels=4, decay=0.8, iterations=1, pool=None):
+        """
+        Args:
+            num_levels: 电平数
+            decay: 旧电平的保留权重（0 表示每块完全重新估计）
+            iterations: 每块 k-means 迭代次数
+            pool: 工作区所在的缓冲区池（默认独立的池）
+        """
+        self.num_levels = num_levels
+        self.decay = decay
+        self.iterations = iterations
+        self.pool = BufferPool() if pool is None else pool
+        self.reset()
+
+    def reset(self):
+        self.levels = None
+
+    @property
+    def thresholds(self):
+        return (self.levels[:-1] + self.levels[1:]) / 2
+
+    def _init_levels(self, x):
+        # 用各区间中心分位点初始化（例如 4 电平取 1/8, 3/8, 5/8, 7/8）
+        n = len(x)
+        idx = [min(n - 1, int(n * (2 * i + 1) / (2 * self.num_levels))) for i in range(self.num_levels)]
+        self.levels = np.partition(x, idx)[idx].astype(np.float64)
+
+    def _update_levels(self, x, decay, sym, conf):
+        # sym / conf 为判决输出缓冲区，这里只作临时空间
+        for _ in range(self.iterations):
+            slice_symbols(x, self.levels, sym, conf)
+            counts = np.bincount(sym, minlength=self.num_levels)
+            sums = np.bincount(sym, weights=x, minlength=self.num_levels)
+            seen = counts > 0
+            means = self.levels.copy()
+            means[seen] = sums[seen] / counts[seen]
+            self.levels = decay * self.levels + (1 - decay) * means
+            self.levels.sort()
+
+    def process(self, synced_samples, out=None):
+        """
+        判决一块同步后的样本
+        Args:
+            synced_samples: 同步后的样本
+            out: 可选的输出缓冲区 (symbols, confidence)，int64 / float64，长度均不小于样本数
+        Rets:
+            symbols: 符号序列 (0 ~ num_levels-1)
+            confidence: 每个符号的置信度 (0~1)
+        """
+        x = np.asarray(synced_samples)
+        n = len(x)
+        if n == 0:
+            return np.array([], dtype=int), np.array([], dtype=np.float64)
+        if x.dtype != np.float64:
+            x = self.pool.get(self, "x", n, np.float64)
+            x[:] = synced_samples
+
+        if out is None:
+            out = (np.empty(n, dtype=np.int64), np.empty(n, dtype=np.float64))
+        symbols, confidence = out[0][:n], out[1][:n]
 
-    # 判决逻辑
-    for i, sample in enumerate(synced_samples):
-        if sample < thresholds[0]:
-            symbols[i] = 0
-        elif sample < thresholds[1]:
-            symbols[i] = 1
-        elif sample < thresholds[2]:
-            symbols[i] = 2
+        if self.levels is None:
+            # 首块：分位点初始化后直接用本块均值，不做平滑
+            self._init_levels(x)
+            self._update_levels(x, 0.0, symbols, confidence)
         else:
-            symbols[i] = 3
+            self._update_levels(x, self.decay, symbols, confidence)
 
-    return symbols, estimated_levels
+        return slice_symbols(x, self.levels, symbols, confidence)
+
+    def soft_symbols(self, synced_samples):
+        """软判决：按当前电平线性映射到连续符号值 (0 ~ num_levels-1)"""
+        return np.interp(synced_samples, self.levels, np.arange(self.num_levels, dtype=np.float64))
+
+
+def slice_symbols(x, levels, symbols, confidence):
+    """
+    按已排序的电平判决并计算置信度（MultiLevelSlicer 的判决部分），结果写入 symbols / confidence
+    numba 可用时替换为 JIT 版本（dsp.kernels）
+    Rets:
+        symbols: 符号序列 (0 ~ len(levels)-1)
+        confidence: 样本到最近判决门限的距离 / 半个电平间隔 (0~1)
+    """
+    num_levels = len(levels)
+    thresholds = (levels[:-1] + levels[1:]) / 2
+    sym = np.searchsorted(thresholds, x, side="right")
+
+    spacing = np.diff(levels)
+    half = np.empty(num_levels)
+    half[0] = spacing[0] / 2
+    half[-1] = spacing[-1] / 2
+    half[1:-1] = np.minimum(spacing[:-1], spacing[1:]) / 2
+    bounds = np.concatenate(([-np.inf], thresholds, [np.inf]))
+    dist = np.minimum(x - bounds[sym], bounds[sym + 1] - x)
+    symbols[:] = sym
+    confidence[:] = np.clip(dist / np.maximum(half[sym], 1e-12), 0.0, 1.0)
+
+    return symbols, confidence
+
+
+def _slice_symbols_loop(x, levels, symbols, confidence):
+    # 逐样本单次遍历版本（JIT 用），结果与 slice_symbols 一致
+    num_levels = len(levels)
+    thresholds = (levels[:-1] + levels[1:]) / 2
+    half = np.empty(num_levels)
+    half[0] = (levels[1] - levels[0]) / 2
+    half[-1] = (levels[-1] - levels[-2]) / 2
+    for j in range(1, num_levels - 1):
+        half[j] = min(levels[j] - levels[j - 1], levels[j + 1] - levels[j]) / 2
+
+    for i in range(len(x)):
+        v = x[i]
+        k = 0
+        while k < num_levels - 1 and thresholds[k] <= v:
+            k += 1
+        symbols[i] = k
+        lo = thresholds[k - 1] if k > 0 else -np.inf
+        hi = thresholds[k] if k < num_levels - 1 else np.inf
+        c = min(v - lo, hi - v) / max(half[k], 1e-12)
+        confidence[i] = min(max(c, 0.0), 1.0)
+    return symbols, confidence
+
+
+slice_symbols = kernels.accelerate(
+    slice_symbols, _slice_symbols_loop,
+    # 输入是定时恢复输出的 float64 样本，单精度链路也只有这一种签名
+    warmup_args=lambda: [(np.linspace(-1.0, 1.0, 8), np.array([-0.75, -0.25, 0.25, 0.75]),
+                          np.empty(8, dtype=np.int64), np.empty(8))],
+)
@@ -1,11 +1,24 @@
+from functools import lru_cache
+
 import numpy as np
 from commpy.filters import rrcosfilter
 from scipy.signal import fftconvolve
 
+from dsp.fir import StreamingFIR
+
 """注意commpy库在pip中叫scikit-commpy 安装时请使用pip install scikit-commpy"""
 
 
-def rrc_filter(iq, rs, fs, alpha, numtaps):
+@lru_cache(maxsize=32)
+def rrc_taps(rs, fs, alpha, numtaps):
+    """按 (rs, fs, alpha, numtaps) 缓存的根升余弦抽头（只读数组）"""
+    ts = 1 / rs  # 符号周期
+    _, taps = rrcosfilter(numtaps, alpha, ts, fs)
+    taps.setflags(write=False)
+    return taps
+
+
+def rrc_filter(iq, rs, fs, alpha, numtaps, out=None):
     """对iq信号进行根升余弦滤波
 
     Args:
@@ -15,11 +28,26 @@ def rrc_filter(iq, rs, fs, alpha, numtaps):
         fs: 输入信号采样率 (Hz) 即规则手册中SampleRate
         alpha: 滤波器滚降系数
         numtaps: 滤波器抽头数量
+        out: 可选的输出缓冲区（长度与输入相同）
 
     Returns:
-        滤波后的IQ信号
+        滤波后的IQ信号（complex64 输入保持 complex64）
     """
-    ts = 1 / rs  # 符号周期
-    _, taps = rrcosfilter(numtaps, alpha, ts, fs)
+    taps = rrc_taps(rs, fs, alpha, numtaps)
+    if np.asarray(iq).dtype == np.complex64:
+        taps = taps.astype(np.float32)
     filtered_iq = fftconvolve(iq, taps, mode="same")
-    return filtered_iq
+    if out is None:
+        return filtered_iq
+    out[:] = filtered_iq
+    return out
+
+
+class RRCFilter(StreamingFIR):
+    """流式根升余弦滤波器，跨数据块连续（参数含义同 rrc_filter）"""
+
+    def __init__(self, rs, fs, alpha, numtaps, nfft=None, pool=None):
+        self.rs = rs
+        self.fs = fs
+        self.alpha = alpha
+        super().__init__(rrc_taps(rs, fs, alpha, numtaps), nfft=nfft, pool=pool)
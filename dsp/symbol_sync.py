@@ -1,98 +1,230 @@
+import math
+
 import numpy as np
 
+from dsp import kernels
+from dsp.buffers import BufferPool
+
+MAX_CLOCK_ERROR = 0.01  # 符号周期允许偏离标称值的比例（远大于晶振误差，防止环路在噪声中跑飞）
+POWER_GAIN = 0.05  # 斜率功率（定时误差归一化用）的平滑系数
+
+
+class TimingRecovery:
+    """
+    判决反馈定时恢复（流式版本）
+    - 捕获：复位后缓存 acquire_symbols 个符号的数据，在 [0, sps) 的相位网格上选取眼图张开最大的相位
+      （样本到最近电平的平均距离 / 电平跨度最小），同时得到初始电平
+    - 跟踪：逐符号二阶环路。定时误差取 (y - â) * y'：â 为最近的电平，y' 为插值点处的斜率，
+      按斜率功率归一化后修正相位与符号周期（可跟踪符号时钟偏差）；电平按指数平均逐符号更新
+    - 符号间 ISI 很重时频率差分的峰值并不落在符号边界，判决反馈误差不依赖峰值，sps 4 ~ 10 都能锁定
+    - 环路逐符号推进、状态以绝对采样序号保存，分块喂入与整段处理结果一致；
+      插值样本与位置由 timing_loop 直接写入输出缓冲区
+    """
 
-def pll_function(freq_deviations, fs, symbol_rate, alpha=0.1, detect_threshold=1e4):
+    def __init__(self, fs, symbol_rate, alpha=0.15, level_alpha=0.01, num_levels=4, acquire_symbols=512,
+                 pool=None):
+        """
+        Args:
+            fs: 采样率
+            symbol_rate: 符号率
+            alpha: 环路增益，每个符号按 alpha / sps 倍的归一化定时误差修正相位（环路带宽与 sps 无关）
+            level_alpha: 电平跟踪的平滑系数
+            num_levels: 电平数
+            acquire_symbols: 捕获相位所用的符号数
+            pool: 工作区所在的缓冲区池（默认独立的池）
+        """
+        sps = int(round(fs / symbol_rate))
+        if abs(sps - fs / symbol_rate) > 1e-9 * sps:  # 允许 fs / (fs / sps) 的浮点误差
+            raise ValueError("采样率必须是符号率的整数倍")
+
+        self.fs = fs
+        self.symbol_rate = symbol_rate
+        self.sps = sps
+        self.alpha = alpha
+        self.level_alpha = level_alpha
+        self.num_levels = num_levels
+        self.acquire_symbols = acquire_symbols
+        self.gain = alpha / sps
+        # 锁定后保留的历史不超过几个采样点（输出缓冲区写满提前停止时除外）；
+        # 缓冲区按块长 + _keep 申请，历史长度逐块波动时不重新分配
+        self._keep = sps + 4
+        self.pool = BufferPool() if pool is None else pool
+
+        self.reset()
+
+    def reset(self):
+        """清空环路状态与历史样本，下一块数据重新捕获"""
+        self.t = None  # 下一个符号的插值位置（绝对采样序号），None 表示尚未捕获
+        self.period = float(self.sps)
+        self.levels = None
+        self.power = 0.0
+
+        self._offset = 0  # self._hist[0] 对应的绝对采样序号
+        self._hist = np.zeros(0)
+
+    def process(self, freq_deviations, out=None):
+        """
+        处理一块鉴频器输出
+        Args:
+            freq_deviations: 鉴频器输出的频率偏移序列（一个数据块）
+            out: 可选的输出缓冲区 (sync_symbols, locked_index)，float64 / int64，长度相同；
+                 本次输出的符号数不超过其长度，未输出的符号留到下一块
+        Rets:
+            sync_symbols: 本块内完成同步的符号样本 (ndarray, float64)
+            locked_index: 对应的锁定位置（绝对采样序号, ndarray）
+        """
+        x = np.asarray(freq_deviations)
+        h = len(self._hist)
+        dtype = np.result_type(self._hist, x) if h else x.dtype
+        m = h + len(x)
+        buf = self.pool.get(self, "buf", max(m, len(x) + self._keep), dtype)[:m]
+        buf[:h] = self._hist
+        buf[h:] = x
+        offset = self._offset
+
+        if out is None:
+            out = (np.empty(m, dtype=np.float64), np.empty(m, dtype=np.int64))
+
+        count = 0
+        if self.t is None and m >= self.acquire_symbols * self.sps + self.sps + 3:
+            # 捕获窗口固定为复位后的前若干采样点，与分块方式无关
+            self.t, self.levels, self.power = acquire(
+                buf[:self.acquire_symbols * self.sps + self.sps + 3], self.sps, self.acquire_symbols, self.num_levels)
+            self.t += offset
+        if self.t is not None:
+            count = self._run_loop(buf, offset, offset + m - 3, out)
+
+        # ---------- 保留历史：下一个插值位置向前 1 个采样点起（斜率差分需要）；捕获前全部保留 ----------
+        keep_from = offset if self.t is None else min(max(math.floor(self.t) - 1, offset), offset + m)
+        keep = buf[keep_from - offset:]
+        self._hist = self.pool.get(self, "hist", max(len(keep), self._keep), dtype)[:len(keep)]
+        self._hist[:] = keep
+        self._offset = keep_from
+
+        return out[0][:count], out[1][:count]
+
+    def _run_loop(self, buf, offset, end, out):
+        """逐符号定时环路（见 timing_loop），样本与位置写入 out，返回个数"""
+        samples, index, levels = out[0], out[1], self.levels
+        if kernels.BACKEND != "numba":
+            # 纯 Python 循环中经 memoryview 逐个存取元素得到 Python float / int，比 NumPy 标量快得多，且不复制数据
+            buf, samples, index, levels = memoryview(buf), memoryview(samples), memoryview(index), memoryview(levels)
+        count, self.t, self.period, self.power = timing_loop(
+            buf, offset, self.t, end, self.period, self.sps, self.power, levels, self.gain, self.level_alpha,
+            samples, index)
+        return count
+
+
+def acquire(y, sps, num_symbols, num_levels=4, step=0.25):
     """
-    峰值检测定时恢复环路
-    基于频率差分的峰值检测来恢复符号定时
+    定时捕获：在 [1, 1 + sps) 的相位网格上按 sps 间隔插值取 num_symbols 个样本，
+    选取样本到最近电平（各区间中心分位点）的平均距离 / 电平跨度最小的相位
+    Args:
+        y: 鉴频器输出，长度不小于 num_symbols * sps + sps + 3
+    Rets:
+        t: 第一个符号的插值位置（相对 y 的采样序号）
+        levels: 该相位下的电平估计 (float64, 升序)
+        power: 该相位下插值点斜率的均方值
+    """
+    phases = np.arange(1.0, 1.0 + sps, step)
+    pos = phases[:, None] + sps * np.arange(num_symbols)
+    grid = np.arange(len(y))
+    samples = np.interp(pos, grid, y)
+
+    idx = [min(num_symbols - 1, int(num_symbols * (2 * i + 1) / (2 * num_levels))) for i in range(num_levels)]
+    levels = np.partition(samples, idx, axis=1)[:, idx]
+    dist = np.min(np.abs(samples[:, :, None] - levels[:, None, :]), axis=2).mean(axis=1)
+    spread = np.maximum(levels[:, -1] - levels[:, 0], 1e-12)
+    best = int(np.argmin(dist / spread))
+
+    slope = (np.interp(pos[best] + 1, grid, y) - np.interp(pos[best] - 1, grid, y)) / 2
+    return float(phases[best]), levels[best].astype(np.float64), float(np.mean(slope * slope))
+
+
+def timing_loop(y, base, t, end, period, sps, power, levels, gain, level_gain, samples, index):
+    """
+    逐符号的判决反馈定时环路
+    numba 可用时替换为 JIT 版本（dsp.kernels）
+    Args:
+        y: 鉴频器输出（JIT 版本为 ndarray，参考实现也接受 memoryview / 列表），y[0] 对应绝对采样序号 base
+        t / end: 下一个符号的插值位置 / 本次允许的最大插值位置（绝对采样序号）
+        period / sps: 当前符号周期 / 标称每符号采样点数
+        power: 斜率功率（定时误差的归一化因子）
+        levels: 电平估计（原地更新）
+        gain / level_gain: 相位环路增益 / 电平平滑系数
+        samples / index: 插值样本 (float64) / 最近的采样序号 (int64) 的输出缓冲区，写满即停止
+    Rets:
+        count: 写入的符号个数
+        t, period, power: 环路状态
+    """
+    rho = gain * gain / 4  # 周期修正系数（临界阻尼）
+    lo = sps * (1 - MAX_CLOCK_ERROR)
+    hi = sps * (1 + MAX_CLOCK_ERROR)
+    half = sps / 2
+    num_levels = len(levels)
+    count = 0
+
+    while t <= end and count < len(samples):
+        i = math.floor(t)
+        f = t - i
+        j = i - base
+        # 以双精度取出：JIT 版本中 float() 对单精度元素不提升精度，+ 0.0 才与参考实现一致
+        ym = y[j - 1] + 0.0
+        y0 = y[j] + 0.0
+        y1 = y[j + 1] + 0.0
+        y2 = y[j + 2] + 0.0
+        v = y0 + f * (y1 - y0)
+        # t ± 1 处线性插值的中心差分
+        slope = (y1 - ym + f * (y2 - y1 - y0 + ym)) / 2
+
+        k = 0
+        for q in range(1, num_levels):
+            if abs(v - levels[q]) < abs(v - levels[k]):
+                k = q
+        err = v - levels[k]
+        levels[k] += level_gain * err
+
+        power += POWER_GAIN * (slope * slope - power)
+        delta = -err * slope / power if power > 0 else 0.0
+        delta = min(max(delta, -half), half)
+
+        samples[count] = v
+        index[count] = i if f < 0.5 else i + 1
+        count += 1
+
+        period = min(max(period + rho * delta, lo), hi)
+        t += period + gain * delta
+
+    return count, t, period, power
+
+
+timing_loop = kernels.accelerate(
+    timing_loop,
+    # 鉴频输出在单精度链路中为 float32，两种精度都要预先编译；其余参数类型与 _run_loop 的调用一致
+    warmup_args=lambda: [(np.zeros(16, dtype=dtype), 0, 2.0, 12, 4.0, 4, 1.0, np.array([-0.5, 0.5]), 0.04, 0.01,
+                          np.empty(4), np.empty(4, dtype=np.int64)) for dtype in (np.float32, np.float64)],
+)
+
+
+def pll_function(freq_deviations, fs, symbol_rate, alpha=0.15, detect_threshold=None):
+    """
+    判决反馈定时恢复（单块调用，流式处理请使用 TimingRecovery）
+    捕获窗口按本块长度缩短，块太短（不足 8 个符号）时返回空数组
+    与旧版峰值检测环路的差异：
+    - alpha 现为判决反馈环路增益（默认 0.15），不再是每个峰值的软更新系数（旧默认 0.1）
+    - 不再做频率差分峰值检测，detect_threshold 仅为兼容旧调用保留，取值被忽略
+    - 返回 ndarray 而非 list
     Args:
         freq_deviations: 鉴频器输出的频率偏移序列
         fs: 采样率
         symbol_rate: 符号率
-        alpha: 软更新系数 每次矫正的影响大小
-        detect_threshold: 频率变化检测的阈值
+        alpha: 环路增益
+        detect_threshold: 已废弃，忽略
     Rets:
-        sync_symbols: 完成同步符号样本列表
+        sync_symbols: 完成同步符号样本 (ndarray)
     """
-    sps = int(fs / symbol_rate)
-    if sps != fs / symbol_rate:
-        raise ValueError("采样率必须是符号率的整数倍")
-    threshold = detect_threshold
-
-    # 计算频率差分
-    freq_diff = np.diff(freq_deviations)
-
-    # 计算绝对值（关注幅度）
-    abs_freq_diff = np.abs(freq_diff)
-
-    # 初始化定时恢复状态
-    mu = 0.0  # 小数间隔
-    last_peak_time = 0
-    last_lock_time = 0  # 记录上一次锁定时间
-    symbol_counter = 0  # 符号计数器
-
-    # 存储结果
-    sync_symbols = []
-    locked_index = []
-    timing_errors = []
-
-    def linear_interpolate(sig, pos):
-        idx = int(np.floor(pos))
-        t = pos - idx
-
-        if idx < 0 or idx >= len(sig) - 1:
-            return sig[min(max(idx, 0), len(sig) - 1)]
-
-        # 线性插值
-        y0 = sig[idx]
-        y1 = sig[idx + 1]
-
-        return y0 + t * (y1 - y0)
-
-    # 主循环 - 遍历每个采样点
-    for n in range(1, len(abs_freq_diff) - 1):
-        # 检查是否是局部极大值（峰值）
-        is_peak = (
-            abs_freq_diff[n] > abs_freq_diff[n - 1]
-            and abs_freq_diff[n] > abs_freq_diff[n + 1]
-            and abs_freq_diff[n] > threshold
-        )
-
-        # 检查最小峰值间距
-        if is_peak and (n - last_peak_time) > sps // 2:
-            last_peak_time = n
-
-            # 计算期望的符号边界位置
-            # 假设峰值应该出现在符号边界（对于矩形频率响应）
-            expected_boundary = last_lock_time + sps / 2
-
-            # 计算定时误差
-            error = n - expected_boundary
-
-            # 更新环路滤波器
-            mu += alpha * error
-
-            # # 记录误差
-            # timing_errors.append(error)
-            # print(f"[{n}]UPDATE error={error}, mu={mu}")
-
-        if n >= last_lock_time + sps + mu:
-            # 符号边界到达，进行符号采样
-
-            # 插值位置
-            interp_pos = last_lock_time + sps + mu
-
-            # 采样符号
-            if interp_pos < len(freq_deviations):
-                symbol_sample = linear_interpolate(freq_deviations, interp_pos)
-                sync_symbols.append(symbol_sample)
-                locked_index.append(int(round(interp_pos)))
-                # print(
-                #     f"[{n}]SYMBOL LOCKED symbol_counter={symbol_counter}, interp_pos={interp_pos}, sample={symbol_sample}, mu={mu}"
-                # )
-
-            symbol_counter += 1
-            last_lock_time = interp_pos
-            mu = 0.0  # 重置mu以准备下一个符号
-
+    sps = int(round(fs / symbol_rate))
+    num_symbols = max(8, min(512, (len(freq_deviations) - 3) // sps - 1))
+    recovery = TimingRecovery(fs, symbol_rate, alpha=alpha, acquire_symbols=num_symbols)
+    sync_symbols, _ = recovery.process(freq_deviations)
     return sync_symbols
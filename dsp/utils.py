@@ -0,0 +1,39 @@
+import numpy as np
+
+
+def int16_to_complex64(raw, out=None):
+    """
+    I/Q 交织的 int16 原始数据 -> complex64（一次类型转换，不做缩放，数值与 pyadi rx() 一致）
+    Args:
+        raw: 长度 2n 的 int16 数组 (I0, Q0, I1, Q1, ...)
+        out: 可选的长度 n 的 complex64 输出缓冲区
+    Rets:
+        长度 n 的 complex64 数组
+    """
+    raw = np.asarray(raw)
+    n = len(raw) // 2
+    if out is None:
+        out = np.empty(n, dtype=np.complex64)
+    np.copyto(out[:n].view(np.float32), raw[:2 * n], casting="unsafe")
+    return out[:n]
+
+
+def as_complex(iq, dtype=np.complex128, out=None):
+    """
+    统一输入格式：int16 交织原始数据先转 complex64；已是目标精度时不拷贝
+    out: 可选的转换缓冲区（dtype 类型，长度不小于采样数），需要转换时写入其中
+    """
+    iq = np.asarray(iq)
+    if out is None:
+        if iq.dtype == np.int16:
+            iq = int16_to_complex64(iq)
+        return iq.astype(dtype, copy=False)
+    if iq.dtype == np.int16:
+        n = len(iq) // 2
+        np.copyto(out[:n].view(np.finfo(dtype).dtype), iq[:2 * n], casting="unsafe")
+        return out[:n]
+    if iq.dtype == dtype:
+        return iq
+    out = out[:len(iq)]
+    out[:] = iq
+    return out
@@ -1,44 +1,107 @@
-from radio.pluto_input import PlutoInput
-from monitor.energy_detector import SpectrumMonitor
-from demod.base_demod import BaseFSKDemod
+import asyncio
+import signal
+
+import numpy as np
+
+from radio.file_input import FileReceiver
+from radio.ring_buffer import IQRingBuffer
+from dsp import kernels
+from monitor.energy_detector import Energy_Detector
 from demod.demod_worker import DemodWorker
+from demod.process_worker import ProcessDemodWorker
+from demod.worker_pool import WorkerPool
+from communication.report_system import ReportSystem, UDPTransport, FileTransport
+from tools.metrics import Metrics, MetricsServer
+from orchestrator import Orchestrator
 
 FS = 2e6
 CENTER_FREQ = 433e6
 
-pluto = PlutoInput(center_freq=CENTER_FREQ, fs=FS)
-monitor = SpectrumMonitor(fs=FS)
+# 各等级解调参数：(信道频偏, 符号率, 每符号采样点数)
+DEMOD_LEVELS = {
+    "L1": (-1.3e6, 500e3, 4),
+    "L2": (-0.9e6, 285e3, 7),
+    "L3": (0, 200e3, 10),
+}
+
+# 解调后端："thread" 与主循环共享 GIL；"process" 每条链路独立进程
+WORKER_BACKEND = "thread"
+WORKER_CLASS = {"thread": DemodWorker, "process": ProcessDemodWorker}[WORKER_BACKEND]
+
+# 状态切换迟滞：新状态需连续检测到的次数
+SWITCH_HOLD = 3
 
-workers = {}
+# 离线回放：设为 .iq 文件路径则不连接 Pluto，按实时节拍回放该文件
+IQ_FILE = None
 
-def start_worker(level):
-    if level in workers:
-        return
+# 单精度快速路径：Pluto 输出 int16 原始数据，写入环形缓冲时一次转为 complex64，
+# 能量检测与解调全程 float32 / complex64
+FAST_PATH = False
 
-    if level == "L1":
-        demod = BaseFSKDemod(FS, -1.3e6, 500e3, sps=4)
-    elif level == "L2":
-        demod = BaseFSKDemod(FS, -0.9e6, 285e3, sps=7)
-    elif level == "L3":
-        demod = BaseFSKDemod(FS, 0, 200e3, sps=10)
+# 信道化：按各级符号率抽取（每符号不少于 4 个采样点），L3 以 1 MS/s 解调，L1 / L2 符号率太高仍为全速率
+CHANNELIZE = True
 
-    w = DemodWorker(level, demod, pluto)
-    w.start()
-    workers[level] = w
+# 上报：解出的帧与状态切换经后台线程成批发送，解调线程不再打印
+# REPORT_FILE 非空时写入 JSON Lines 文件，否则以 UDP 发往 REPORT_ADDR
+REPORT_ADDR = ("127.0.0.1", 9000)
+REPORT_FILE = None
 
-def stop_all_except(level):
-    for k in list(workers.keys()):
-        if k != level:
-            workers[k].stop()
-            del workers[k]
+# 埋点：每 METRICS_INTERVAL 秒输出一次各级 p50 / p99 耗时、吞吐量、数据龄与丢弃计数
+# METRICS_PORT 非空时可 GET http://127.0.0.1:<port>/ 取最近一次快照，METRICS_FILE 非空时写入 JSON 文件
+METRICS_INTERVAL = 1.0
+METRICS_PORT = 8765
+METRICS_FILE = None
 
-# 主循环
-while True:
-    iq = pluto.read()
-    state = monitor.detect(iq, CENTER_FREQ)
 
-    if state == "NONE":
-        stop_all_except(None)
+async def main():
+    if IQ_FILE is None:
+        from radio.pluto_input import PlutoReceiver
+        pluto = PlutoReceiver(fs=FS, fc=CENTER_FREQ, raw=FAST_PATH)
     else:
-        start_worker(state)
-        stop_all_except(state)
+        pluto = FileReceiver(IQ_FILE, fs=FS, fc=CENTER_FREQ, realtime=True)
+    monitor = Energy_Detector(fs=FS, dtype=np.float32 if FAST_PATH else np.float64)
+    metrics = Metrics()
+    transport = FileTransport(REPORT_FILE) if REPORT_FILE else UDPTransport(*REPORT_ADDR)
+    reporter = ReportSystem(transport, metrics=metrics).start()
+
+    # 读取任务写入环形缓冲，各解调线程各自持有读游标
+    ring = IQRingBuffer(block_size=pluto.buffer_size)
+
+    # 加速内核在进入实时处理前加载（首次运行时编译并缓存到磁盘）
+    kernels.warmup()
+
+    # 每个等级一条预热好的解调链路，检测状态变化时只暂停 / 恢复
+    pool = WorkerPool(ring, DEMOD_LEVELS, FS, worker_class=WORKER_CLASS, switch_hold=SWITCH_HOLD,
+                      verbose=False, reporter=reporter, single_precision=FAST_PATH, metrics=metrics,
+                      channelize=CHANNELIZE)
+    pool.start()
+
+    # 读取 / 检测 / 链路控制 / 上报各为独立任务
+    orch = Orchestrator(pluto, monitor, pool, ring, CENTER_FREQ, reporter=reporter, metrics=metrics)
+
+    metrics.add_source("ring", ring.stats)
+    metrics.add_source("report", reporter.stats)
+    metrics.add_source("pool", pool.metrics)
+    metrics.add_source("main", orch.stats)
+    metrics_server = MetricsServer(metrics, interval=METRICS_INTERVAL, path=METRICS_FILE, port=METRICS_PORT).start()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, orch.stop)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows 不支持，Ctrl+C 直接中断
+
+    try:
+        stats = await orch.run()
+    finally:
+        pool.stop()
+        reporter.stop()
+        metrics_server.stop()
+        pluto.close()
+    print(f"[main] {stats}")
+    print(f"[report] {reporter.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,62 +1,117 @@
-import numpy as np
+# 离线分析 .iq 录制文件的干扰等级
+# 在仓库根目录以模块方式运行（monitor / dsp 均按包导入）:
+#   python -m monitor.analyze capture.iq [--timeline timeline.npy] [--fs 2e6] [--lo 433e6]
+import argparse
 from collections import Counter
-# 从旧代码文件中引用 Energy_Detector 类
-from energy_detector import Energy_Detector
 
-def analyze_iq_file(file_path, fs=2e6, lo_freq=433e6):
+import numpy as np
+
+from monitor.energy_detector import Energy_Detector, LABELS
+
+# 时间线文件的记录格式（每个片段一行）
+TIMELINE_DTYPE = np.dtype([
+    ("time", np.float64),   # 片段起始时间 (s)
+    ("label", np.uint8),    # 判决结果，对应 LABELS
+    ("snr_l1", np.float32),
+    ("snr_l2", np.float32),
+    ("snr_bc", np.float32),
+])
+
+
+def open_iq(file_path):
+    """以内存映射方式打开 complex64 .iq 文件（不读入内存）"""
+    return np.memmap(file_path, dtype=np.complex64, mode="r")
+
+
+def iter_chunk_batches(data, chunk_size, batch_chunks=256):
+    """
+    按 (batch_chunks, chunk_size) 的矩阵逐批返回片段，内存占用与文件大小无关
+    末尾不足一个片段的采样点被丢弃
+    """
+    total_chunks = len(data) // chunk_size
+    for start in range(0, total_chunks, batch_chunks):
+        stop = min(start + batch_chunks, total_chunks)
+        block = np.asarray(data[start * chunk_size:stop * chunk_size])
+        yield start, block.reshape(stop - start, chunk_size)
+
+
+def analyze_iq_file(file_path, fs=2e6, lo_freq=433e6, timeline_path=None, batch_chunks=256):
     """
     读取指定路径的 .iq 文件并输出干扰等级判定
+    timeline_path: 若给出，将逐片段判决时间线 (TIMELINE_DTYPE) 保存为 .npy
     """
     print(f"[*] 开始分析文件: {file_path}")
-    
-    # 1. 加载 IQ 数据
+
+    # 1. 实例化检测器 (引用自旧代码)
+    detector = Energy_Detector(fs=fs)
+
+    # 2. 内存映射 + 分批检测
+    # 步长等于 FFT 长度，确保覆盖文件全长
+    chunk_size = detector.fft_size
     try:
         # 使用 complex64 对应发射端保存的格式
-        data = np.fromfile(file_path, dtype=np.complex64)
+        data = open_iq(file_path)
     except FileNotFoundError:
         print(f"[!] 错误: 找不到文件 {file_path}")
         return
-
-    # 2. 实例化检测器 (引用自旧代码)
-    detector = Energy_Detector(fs=fs)
-    
-    # 3. 执行分段检测
-    # 步长等于 FFT 长度，确保覆盖文件全长
-    chunk_size = detector.fft_size
-    results = []
-    
     total_chunks = len(data) // chunk_size
-    print(f"[*] 文件包含 {len(data)} 个采样点，分为 {total_chunks} 个片段进行处理...")
-
-    for i in range(total_chunks):
-        start = i * chunk_size
-        end = start + chunk_size
-        iq_chunk = data[start:end]
-        
-        # 调用引用过来的 detect 方法
-        label = detector.detect(iq_chunk, center_freq=lo_freq)
-        results.append(label)
-
-    # 4. 汇总统计结果
-    counts = Counter(results)
-    
+    print(f"[*] 文件包含 {total_chunks * chunk_size} 个有效采样点，分为 {total_chunks} 个片段进行处理...")
+
+    if timeline_path is not None:
+        timeline = np.lib.format.open_memmap(
+            timeline_path, mode="w+", dtype=TIMELINE_DTYPE, shape=(total_chunks,)
+        )
+    counts = np.zeros(len(LABELS), dtype=np.int64)
+
+    for start, chunks in iter_chunk_batches(data, chunk_size, batch_chunks):
+        labels, snrs = detector.detect_batch(chunks, center_freq=lo_freq)
+        counts += np.bincount(labels, minlength=len(LABELS))
+
+        if timeline_path is not None:
+            rows = timeline[start:start + len(labels)]
+            rows["time"] = (start + np.arange(len(labels))) * chunk_size / fs
+            rows["label"] = labels
+            rows["snr_l1"] = snrs["L1"]
+            rows["snr_l2"] = snrs["L2"]
+            rows["snr_bc"] = snrs["BC"]
+
+    if timeline_path is not None:
+        timeline.flush()
+        del timeline
+        print(f"[*] 判决时间线已保存: {timeline_path}")
+
+    if total_chunks == 0:
+        print("[!] 文件不足一个片段，无法判定")
+        return
+
+    # 3. 汇总统计结果
+    counts = Counter({lvl: int(c) for lvl, c in zip(LABELS, counts)})
+
     print("\n" + "="*30)
     print(f" 统计报告: {file_path}")
     print("="*30)
     for level in ["NONE", "L1", "L2", "L3"]:
         c = counts.get(level, 0)
         print(f" 干扰等级 {level:4s} | 命中: {c:5d} 次 | 占比: {(c/total_chunks)*100:5.1f}%")
-    
-    # 5. 给出最终结论
+
+    # 4. 给出最终结论
     # 排除 NONE 以外出现次数最多的等级
-    valid_results = [r for r in results if r != "NONE"]
-    if valid_results:
-        final_decision = Counter(valid_results).most_common(1)[0][0]
+    valid = {lvl: c for lvl, c in counts.items() if lvl != "NONE" and c > 0}
+    if valid:
+        final_decision = max(valid, key=valid.get)
         print("-" * 30)
         print(f" >>> 最终判定结果: {final_decision} <<<")
     else:
         print("-" * 30)
         print(" >>> 最终判定结果: 无效干扰 (NONE) <<<")
 
+    return counts
+
 if __name__ == "__main__":
-    analyze_iq_file(r"D:\NGXY\Radar\level_3_capture.iq")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="离线分析 complex64 .iq 文件的干扰等级")
+    parser.add_argument("file", help=".iq 文件路径 (complex64)")
+    parser.add_argument("--timeline", help="逐片段判决时间线保存路径 (.npy)")
+    parser.add_argument("--fs", type=float, default=2e6, help="采样率 (Hz)")
+    parser.add_argument("--lo", type=float, default=433e6, help="中心频率 (Hz)")
+    args = parser.parse_args()
+    analyze_iq_file(args.file, fs=args.fs, lo_freq=args.lo, timeline_path=args.timeline)
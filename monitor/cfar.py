@@ -0,0 +1,143 @@
+# 全频带 CFAR 检测：在整个功率谱上估计局部噪声，输出各发射源的中心频率 / 带宽 / SNR
+from collections import namedtuple
+
+import numpy as np
+
+# freq: 绝对中心频率 (Hz)，bandwidth: 占用带宽 (Hz)，snr_db: 相对局部噪声估计，level: 最近的配置信道
+Emitter = namedtuple("Emitter", ["freq", "bandwidth", "snr_db", "level"])
+
+
+def _wrap_pad(x, n):
+    # 频谱首尾在频率上相邻（±fs/2），训练窗按循环方式延拓
+    return np.concatenate((x[-n:], x, x[:n]))
+
+
+def ca_noise(power, guard, train):
+    """
+    CA-CFAR 噪声估计：两侧各 train 个训练单元的平均（跳过 guard 个保护单元）
+    用累积和求滑动窗口和，开销 O(n) 与窗口长度无关
+    """
+    n = len(power)
+    span = guard + train
+    c = np.concatenate(([0.0], np.cumsum(_wrap_pad(power.astype(np.float64), span))))
+    i = np.arange(n) + span  # 每个单元在延拓序列中的位置
+    lead = c[i - guard] - c[i - span]
+    lag = c[i + span + 1] - c[i + guard + 1]
+    return (lead + lag) / (2 * train)
+
+
+def os_noise(power, guard, train, rank=0.25):
+    """
+    OS-CFAR 噪声估计：两侧训练单元排序后取 rank 分位处的值
+    宽带信号占据部分训练窗时比 CA 更不易被抬高门限
+    """
+    span = guard + train
+    win = np.lib.stride_tricks.sliding_window_view(_wrap_pad(power, span), 2 * span + 1)
+    cells = np.concatenate((win[:, :train], win[:, train + 2 * guard + 1:]), axis=1)
+    k = min(int(rank * 2 * train), 2 * train - 1)
+    return np.partition(cells, k, axis=1)[:, k]
+
+
+class CFAR:
+    """
+    全频带 CFAR 检测
+    - 先把功率谱每 cell_bins 个频点合并为一个检测单元（降低起伏，同时缩短训练窗）
+    - 逐单元估计局部噪声（"ca" 或 "os"），超过噪声 threshold_db 的单元为命中
+    - 相邻命中单元（间隔不超过 2 * merge_cells）合并为一个发射源
+    - 按最近的配置信道标注等级
+    """
+
+    METHODS = ("ca", "os")
+
+    def __init__(self, cell_bins=16, guard=4, train=48, threshold_db=8.0, method="os", rank=0.25,
+                 min_cells=2, merge_cells=2):
+        """
+        Args:
+            cell_bins: 每个检测单元合并的 FFT 频点数
+            guard: 每侧保护单元数
+            train: 每侧训练单元数，应大于最宽信号的半宽
+            threshold_db: 检测门限（相对噪声估计）
+            method: "ca" 均值 / "os" 有序统计
+            rank: OS-CFAR 取训练单元的分位
+            min_cells: 发射源的最少单元数，更窄的命中视为噪声尖峰
+            merge_cells: 两段命中之间不超过 2 * merge_cells 个单元时合并
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"不支持的 CFAR 方法: {method}")
+        self.cell_bins = cell_bins
+        self.guard = guard
+        self.train = train
+        self.threshold_db = threshold_db
+        self.method = method
+        self.rank = rank
+        self.min_cells = min_cells
+        self.merge_cells = merge_cells
+
+    def noise(self, cells):
+        if self.method == "ca":
+            return ca_noise(cells, self.guard, self.train)
+        return os_noise(cells, self.guard, self.train, self.rank)
+
+    def find(self, power, freqs, center_freq, channels):
+        """
+        Args:
+            power: fftshift 后的线性功率谱
+            freqs: 对应的基带频率轴 (Hz)
+            center_freq: LO 频率
+            channels: {等级: 绝对频率}，用于标注最近信道
+        Rets:
+            [Emitter, ...]，按频率排序
+        """
+        m = len(power) // self.cell_bins
+        cells = power[:m * self.cell_bins].reshape(m, self.cell_bins).mean(axis=1)
+        cell_freqs = freqs[:m * self.cell_bins].reshape(m, self.cell_bins).mean(axis=1)
+        cell_bw = self.cell_bins * (freqs[1] - freqs[0])
+
+        noise = self.noise(cells)
+        hit = cells > noise * 10 ** (self.threshold_db / 10)
+        # 小间隙填平：循环闭运算（先膨胀再腐蚀），间隔不超过 2 * merge_cells 的命中连成一段
+        if self.merge_cells:
+            k = self.merge_cells
+            w = np.ones(2 * k + 1)
+            grown = np.convolve(_wrap_pad(hit.astype(np.float64), k), w, "valid") > 0
+            hit = np.convolve(_wrap_pad(grown.astype(np.float64), k), w, "valid") == 2 * k + 1
+        if not hit.any():
+            return []
+
+        # 旋转到一个未命中单元开头，跨越 ±fs/2 的信号不会被切成两段
+        if hit.all():
+            shift = 0
+        else:
+            shift = int(np.flatnonzero(~hit)[0])
+        hit = np.roll(hit, -shift)
+        edges = np.diff(np.concatenate(([0], hit.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        stops = np.flatnonzero(edges == -1)
+        keep = stops - starts >= self.min_cells
+        starts, stops = starts[keep], stops[keep]
+        if len(starts) == 0:
+            return []
+
+        # 各段的功率和 / 噪声和 / 频率加权和，一次 reduceat
+        order = (np.arange(m) + shift) % m
+        p = cells[order]
+        nz = noise[order]
+        # 频率在旋转后的序列中保持连续（跨越 +fs/2 处补一个周期）
+        f = cell_freqs[order] + np.where(order < shift, m * cell_bw, 0.0)
+        idx = np.ravel(np.column_stack((starts, stops)))
+        idx = idx[idx < m]
+        p_sum = np.add.reduceat(p, idx)[::2]
+        n_sum = np.add.reduceat(nz, idx)[::2]
+        pf_sum = np.add.reduceat(p * f, idx)[::2]
+
+        fs_span = m * cell_bw
+        names = list(channels)
+        chan = np.array([channels[c] for c in names], dtype=np.float64)
+        emitters = []
+        for a, b, ps, ns, pfs in zip(starts, stops, p_sum, n_sum, pf_sum):
+            offset = (pfs / ps + fs_span / 2) % fs_span - fs_span / 2
+            freq = center_freq + offset
+            level = names[int(np.argmin(np.abs(chan - freq)))] if names else None
+            emitters.append(Emitter(float(freq), float((b - a) * cell_bw), float(10 * np.log10(ps / ns)), level))
+        emitters.sort(key=lambda e: e.freq)
+        return emitters
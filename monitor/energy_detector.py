@@ -1,5 +1,14 @@
 import numpy as np
-from collections import deque
+from scipy import fft as sp_fft
+
+from dsp.utils import as_complex
+from monitor.cfar import CFAR
+
+# 判决结果编码（批量检测输出 uint8 标签）
+LABELS = ("NONE", "L1", "L2", "L3")
+# 状态机内部的级别顺序与无信号得分
+LEVELS = ("L1", "L2", "L3")
+NO_SIGNAL = -999.0
 
 class Energy_Detector:
     def __init__(
@@ -8,6 +17,13 @@ class Energy_Detector:
         fft_size = 4096,
         history_len = 1,
         hit_threshold = 1,
+        overlap = 0.5,
+        avg_alpha = None,
+        dtype = np.float64,
+        hysteresis_db = 0.0,
+        min_dwell = 0,
+        l3_hit_threshold = None,
+        cfar = None,
     ):
         self.fs = fs
         self.fft_size = fft_size
@@ -27,93 +43,232 @@ class Energy_Detector:
 
         self.min_abs_power = -70  # dB，极低信号直接忽略（调高以避免单点噪声误判）
 
-        # ---------- 历史一致性 ----------
+        # ---------- 判决状态机 ----------
+        # 最近 history_len 帧的 L1 / L2 / L3 得分 (dB) 存在固定大小的环形数组中，
+        # 进入 / 退出门限的命中计数随每帧增量更新，投票为 O(1)
         self.history_len = history_len
         self.hit_threshold = hit_threshold
-        self.hit_history = {
-            "L1": deque([0] * history_len, maxlen=history_len),
-            "L2": deque([0] * history_len, maxlen=history_len),
-        }
+        self.l3_hit_threshold = hit_threshold if l3_hit_threshold is None else l3_hit_threshold
+        self.hysteresis_db = hysteresis_db  # 退出门限 = 进入门限 - hysteresis_db
+        self.min_dwell = min_dwell  # 切换后至少保持的帧数
+        self.reset_state()
+
+        # ---------- 计算精度 ----------
+        # float32 时输入（含 int16 原始数据）只转换一次为 complex64，FFT 与功率谱均为单精度
+        self.dtype = np.dtype(dtype)
+        self.cdtype = np.result_type(self.dtype, np.complex64)
+        # numpy.fft 的单精度变换比双精度还慢，单精度走 scipy.fft
+        self._fft = sp_fft.fft if self.dtype == np.float32 else np.fft.fft
+
+        self.window = np.hanning(self.fft_size).astype(self.dtype)
+
+        # ---------- Welch 平均 ----------
+        # 整个数据块按 hop 切成重叠分段，一次二维 FFT；可选跨调用指数加权平均
+        # 默认关闭：平均会把单块突发拖长到后续几块，虚警率明显上升（见 test/detector_eval.py）
+        self.hop = max(1, int(self.fft_size * (1 - overlap)))
+        self.avg_alpha = avg_alpha  # 新数据权重，None 或 1 表示不做跨调用平均
+        self.avg_power = None
+
+        # 频率轴与频带索引只计算一次
+        self.freqs = np.fft.fftshift(np.fft.fftfreq(self.fft_size, 1 / self.fs))
+        self._band_cache = {}
+
+        # ---------- 全频带 CFAR ----------
+        # 与 detect 共用同一份 Welch 功率谱，不额外做 FFT
+        self.cfar = CFAR() if cfar is None else cfar
 
-        self.window = np.hanning(self.fft_size)
+    def reset_average(self):
+        self.avg_power = None
 
-    # FFT + 功率谱
+    def reset_state(self):
+        """清空判决历史，状态回到 NONE"""
+        self._scores = np.full((3, self.history_len), NO_SIGNAL)
+        self._pos = 0
+        self._enter_hits = np.zeros(3, dtype=np.int64)  # 窗口内得分超过进入门限的帧数
+        self._exit_hits = np.zeros(3, dtype=np.int64)  # 窗口内得分超过退出门限的帧数
+        self.state = "NONE"
+        self.dwell = 0  # 当前状态已保持的帧数
+        self.last_scores = np.full(3, NO_SIGNAL)
+
+    # 各级进入门限 (dB)，顺序同 LEVELS
+    @property
+    def enter_db(self):
+        return np.array([self.snr_l1, self.snr_l2, self.l3_margin])
+
+    @property
+    def exit_db(self):
+        return self.enter_db - self.hysteresis_db
+
+    # Welch 分段 FFT + 功率谱
     def compute_psd(self, iq):
-        iq = iq[:self.fft_size] * self.window
-        spec = np.fft.fftshift(np.fft.fft(iq))
-        power = np.abs(spec) ** 2
-        power_db = 10 * np.log10(power + 1e-12)
-        freqs = np.fft.fftshift(np.fft.fftfreq(self.fft_size, 1 / self.fs))
-        return freqs, power_db
+        n = self.fft_size
+        iq = as_complex(iq, self.cdtype)
+        if len(iq) < n:
+            iq = np.concatenate((iq, np.zeros(n - len(iq), dtype=self.cdtype)))
+        segs = np.lib.stride_tricks.sliding_window_view(iq, n)[::self.hop]
+        spec = self._fft(segs * self.window, axis=1)
+        power = np.fft.fftshift(np.mean(spec.real ** 2 + spec.imag ** 2, axis=0))
+
+        if self.avg_power is None or not self.avg_alpha or self.avg_alpha >= 1:
+            self.avg_power = power
+        else:
+            self.avg_power = (1 - self.avg_alpha) * self.avg_power + self.avg_alpha * power
+
+        power_db = 10 * np.log10(self.avg_power + self.dtype.type(1e-12))
+        return self.freqs, power_db
+
+    # 频带在频率轴上的索引范围（频率轴单调，掩码必为连续区间）
+    def band_slice(self, freqs, f_offset, bandwidth):
+        half_bw = bandwidth / 2
+        lo = np.searchsorted(freqs, f_offset - half_bw, side="left")
+        hi = np.searchsorted(freqs, f_offset + half_bw, side="right")
+        return slice(lo, hi)
+
+    # 按中心频率缓存 L1 / L2 / 广播频点的索引范围
+    def band_slices(self, center_freq):
+        slices = self._band_cache.get(center_freq)
+        if slices is None:
+            slices = {
+                level: self.band_slice(self.freqs, f - center_freq, self.bandwidth)
+                for level, f in self.freq_table.items()
+            }
+            slices["BC"] = self.band_slice(self.freqs, self.broadcast_freq - center_freq, self.bandwidth)
+            self._band_cache[center_freq] = slices
+        return slices
 
     # 频带平均功率
     def band_power(self, freqs, power_db, f_offset, bandwidth):
-        half_bw = bandwidth / 2
-        mask = np.abs(freqs - f_offset) <= half_bw
-        if not np.any(mask):
+        band = power_db[self.band_slice(freqs, f_offset, bandwidth)]
+        if len(band) == 0:
             return -120.0
-        return np.mean(power_db[mask])
+        return np.mean(band)
 
-    # 主检测函数
-    def detect(self, iq, center_freq, debug=False):
-        freqs, power_db = self.compute_psd(iq)
+
+    # 逐帧判决指标：每行一个功率谱 (dB)，返回 (n, 3) 的 L1 / L2 / L3 得分与各频带 SNR
+    # 得分为 SNR (dB)，不满足该级别前置条件（频带不在范围内、绝对功率过低、L3 全谱条件）时为 NO_SIGNAL
+    def frame_scores(self, power_db, center_freq):
+        slices = self.band_slices(center_freq)
+        n = len(power_db)
         # 使用中位数作为噪声底，抗离群点更好
-        noise_floor = np.median(power_db)
-        spec_std = np.std(power_db)
-        
-        # ---------- L3：宽带压制（最高优先级），增加对广播频点能量的校验 ----------
-        mean_power = np.mean(power_db)
-        bc_power = self.band_power(freqs, power_db, self.broadcast_freq - center_freq, self.bandwidth)
-        above_margin_frac = np.mean(power_db > (noise_floor + self.l3_margin / 2))
-        
-        # if debug:
-            # print("[DEBUG] mean_power", mean_power, "noise_floor", noise_floor, "spec_std", spec_std, "bc_power", bc_power, "above_frac", above_margin_frac)
-        
-        # 更保守的 L3 判定：广播点必须显著，且至少满足一项更严格的全谱条件
-        if (bc_power - noise_floor > self.l3_margin) and (
-            (mean_power - noise_floor > self.l3_margin) or (spec_std < 6) or (above_margin_frac > 0.05)
-        ):
-             if debug:
-                 print("[DEBUG] L3 triggered: mean_power", mean_power, "noise_floor", noise_floor, "spec_std", spec_std)
-             return "L3"
-
-        # ---------- L1 / L2 ----------
-        current_p = {"L1": -120.0, "L2": -120.0}
-        current_snr = {"L1": -999.0, "L2": -999.0}
-
-        for level in ["L1", "L2"]:
-            f_offset = self.freq_table[level] - center_freq
-            half_bw = self.bandwidth / 2
-            mask = np.abs(freqs - f_offset) <= half_bw
-
-            if not np.any(mask):
-                # 频点不在当前 FFT 范围内，记录未命中并跳过
-                self.hit_history[level].append(0)
+        noise_floor = np.median(power_db, axis=1)
+        spec_std = np.std(power_db, axis=1)
+        mean_power = np.mean(power_db, axis=1)
+        above_margin_frac = np.mean(power_db > (noise_floor[:, None] + self.l3_margin / 2), axis=1)
+
+        def band_mean(sl):
+            if sl.stop <= sl.start:
+                return np.full(n, -120.0)
+            return np.mean(power_db[:, sl], axis=1)
+
+        scores = np.full((n, 3), NO_SIGNAL)
+        snrs = {}
+
+        # ---------- L1 / L2：频带平均能量 + 绝对功率过滤 ----------
+        for i, level in enumerate(("L1", "L2")):
+            sl = slices[level]
+            if sl.stop <= sl.start:
+                # 频点不在当前 FFT 范围内
+                snrs[level] = np.full(n, NO_SIGNAL)
                 continue
+            p_band = band_mean(sl)
+            snrs[level] = p_band - noise_floor
+            scores[:, i] = np.where(p_band > self.min_abs_power, snrs[level], NO_SIGNAL)
 
-            # 使用频带平均能量作为判决依据（比单点峰值更稳健），并保留峰值用于 debug
-            p_band = np.mean(power_db[mask])  # 或者使用 self.band_power
-            p_peak = np.max(power_db[mask])
-            snr = p_band - noise_floor
+        # ---------- L3：广播点必须显著，且至少满足一项更严格的全谱条件 ----------
+        snrs["BC"] = band_mean(slices["BC"]) - noise_floor
+        wideband = (mean_power - noise_floor > self.l3_margin) | (spec_std < 6) | (above_margin_frac > 0.05)
+        scores[:, 2] = np.where(wideband, snrs["BC"], NO_SIGNAL)
+        return scores, snrs
 
-            current_p[level] = p_band
-            current_snr[level] = snr
+    # 推入一帧得分并更新状态，返回当前状态
+    def update(self, scores):
+        scores = np.asarray(scores, dtype=np.float64)
+        enter, exit_ = self.enter_db, self.exit_db
 
-            # 绝对功率过滤 + 对应级别的 SNR 阈值判断
-            if p_band > self.min_abs_power and ((level == "L1" and snr > self.snr_l1) or (level == "L2" and snr > self.snr_l2)):
-                self.hit_history[level].append(1)
+        # 增量维护窗口命中数：加入新帧、移出最旧帧
+        old = self._scores[:, self._pos]
+        self._enter_hits += (scores > enter).astype(np.int64) - (old > enter)
+        self._exit_hits += (scores > exit_).astype(np.int64) - (old > exit_)
+        self._scores[:, self._pos] = scores
+        self._pos = (self._pos + 1) % self.history_len
+        self.last_scores = scores
+
+        # 当前状态按退出门限投票（迟滞），其余级别按进入门限
+        votes = self._enter_hits.copy()
+        if self.state != "NONE":
+            i = LEVELS.index(self.state)
+            votes[i] = self._exit_hits[i]
+
+        if votes[2] >= self.l3_hit_threshold:
+            # L3 最高优先级
+            target = "L3"
+        else:
+            candidates = [lvl for i, lvl in enumerate(("L1", "L2")) if votes[i] >= self.hit_threshold]
+            if not candidates:
+                target = "NONE"
             else:
-                self.hit_history[level].append(0)
+                # 若有多个候选，选择当前帧 snr 最大的（相等时取 L1）
+                target = max(candidates, key=lambda lvl: scores[LEVELS.index(lvl)])
 
-        # ---------- 多帧一致性与并列判定 ----------
-        candidates = [lvl for lvl in ["L1", "L2"] if sum(self.hit_history[lvl]) >= self.hit_threshold]
+        # 最短驻留：切换后 min_dwell 帧内不再切换
+        if target != self.state and self.dwell >= self.min_dwell:
+            self.state = target
+            self.dwell = 0
+        self.dwell += 1
+        return self.state
 
+    # 主检测函数
+    def detect(self, iq, center_freq, debug=False):
+        freqs, power_db = self.compute_psd(iq)
+        scores, snrs = self.frame_scores(power_db[None, :], center_freq)
+        state = self.update(scores[0])
         if debug:
-            print("[DEBUG] current_p:", current_p, "current_snr:", current_snr, "history_sums:", {lvl: sum(self.hit_history[lvl]) for lvl in ['L1','L2']}, "cands:", candidates)
+            print("[DEBUG] scores:", dict(zip(LEVELS, scores[0])), "enter_hits:", self._enter_hits,
+                  "exit_hits:", self._exit_hits, "state:", state)
+        return state
+
+    # ---------- 全频带发射源检测 ----------
+    # 标注用的配置信道：三级干扰与广播源同频
+    @property
+    def channels(self):
+        return {**self.freq_table, "L3": self.broadcast_freq}
+
+    def find_emitters(self, center_freq, power=None):
+        """
+        在整个功率谱上做 CFAR，返回 [monitor.cfar.Emitter, ...]
+        power 为线性功率谱（fftshift 后），默认使用最近一次 compute_psd / detect 的平均功率谱
+        """
+        if power is None:
+            power = self.avg_power
+        if power is None:
+            return []
+        return self.cfar.find(power, self.freqs, center_freq, self.channels)
+
+    def detect_emitters(self, iq, center_freq):
+        """计算功率谱并检测发射源；已调用 detect 的数据块应直接用 find_emitters"""
+        self.compute_psd(iq)
+        return self.find_emitters(center_freq)
 
-        if not candidates:
-            return "NONE"
+    # ---------- 批量（离线）检测 ----------
+    # 每行一个 fft_size 片段，逐片段独立计算功率谱（不参与跨调用平均）
+    def compute_psd_batch(self, chunks):
+        spec = self._fft(as_complex(chunks, self.cdtype) * self.window, axis=1)
+        power = np.fft.fftshift(spec.real ** 2 + spec.imag ** 2, axes=1)
+        return 10 * np.log10(power + self.dtype.type(1e-12))
 
-        # 若有多个候选，选择当前帧 snr 最大的
-        best = max(candidates, key=lambda x: current_snr.get(x, -999))
-        return best
+    def detect_batch(self, chunks, center_freq):
+        """
+        对 (n_chunks, fft_size) 的片段矩阵一次性判决
+        每个片段单独做一次加窗 FFT，不做 Welch 分段平均与跨调用平均，也不更新 avg_power；
+        因此只有 avg_alpha 为 None（或 1）且每次 detect 输入恰好一个 fft_size 片段时，结果才与逐片段 detect 一致
+        功率谱与判决指标整批向量化计算，状态机逐帧推进（每帧 O(1)），状态跨批延续
+        Returns:
+            labels: uint8 标签，对应 LABELS
+            snrs: {"L1", "L2", "BC"} 各频带相对噪声底的 SNR (dB)
+        """
+        power_db = self.compute_psd_batch(chunks)
+        scores, snrs = self.frame_scores(power_db, center_freq)
+        labels = np.empty(len(scores), dtype=np.uint8)
+        for i, row in enumerate(scores):
+            labels[i] = LABELS.index(self.update(row))
+        return labels, snrs
@@ -0,0 +1,105 @@
+# 判决状态机离线评估：回放采集数据，按不同参数统计切换次数、检测延迟与虚警率
+import time
+
+import numpy as np
+
+from monitor.energy_detector import Energy_Detector, LABELS
+
+
+def iter_blocks(data, block_size):
+    """按 block_size 逐块返回（末尾不足一块的采样点被丢弃），data 可以是内存映射"""
+    for i in range(len(data) // block_size):
+        yield np.asarray(data[i * block_size:(i + 1) * block_size])
+
+
+def truth_from_segments(segments):
+    """[(标签, 块数), ...] -> 逐块真值标签数组 (uint8，对应 LABELS)"""
+    return np.concatenate([np.full(n, LABELS.index(label), dtype=np.uint8) for label, n in segments])
+
+
+def replay(data, block_size, center_freq, fs, **detector_kwargs):
+    """
+    与 main.py 相同的方式逐块调用 detect
+    Rets:
+        states: 每块判决后的状态 (uint8，对应 LABELS)
+        elapsed: 每块 detect 耗时 (s)
+    """
+    detector = Energy_Detector(fs=fs, **detector_kwargs)
+    states = []
+    elapsed = []
+    for iq in iter_blocks(data, block_size):
+        t0 = time.perf_counter()
+        state = detector.detect(iq, center_freq)
+        elapsed.append(time.perf_counter() - t0)
+        states.append(LABELS.index(state))
+    return np.array(states, dtype=np.uint8), np.array(elapsed)
+
+
+def score(states, truth, block_time):
+    """
+    对比判决序列与真值
+    - switches: 状态切换次数（每次都会触发链路切换）
+    - latency_ms: 真值变为某一干扰等级后，状态首次与之一致所需的时间；该段内未一致计为 missed
+    - false_alarm: 真值为 NONE 的块中判为有干扰的比例
+    - accuracy: 状态与真值一致的块比例
+    """
+    n = min(len(states), len(truth))
+    states = states[:n]
+    truth = truth[:n]
+
+    switches = int(np.count_nonzero(states[1:] != states[:-1])) + int(n > 0 and states[0] != 0)
+
+    # 真值分段，逐段统计首次一致的位置
+    bounds = np.flatnonzero(np.diff(truth)) + 1
+    starts = np.concatenate(([0], bounds))
+    stops = np.concatenate((bounds, [n]))
+    latency = []
+    missed = 0
+    for a, b in zip(starts, stops):
+        if truth[a] == 0:
+            continue
+        hit = np.flatnonzero(states[a:b] == truth[a])
+        if len(hit):
+            latency.append((hit[0] + 1) * block_time * 1e3)
+        else:
+            missed += 1
+
+    quiet = truth == 0
+    return {
+        "blocks": n,
+        "switches": switches,
+        "latency_ms": float(np.mean(latency)) if latency else float("nan"),
+        "latency_max_ms": float(np.max(latency)) if latency else float("nan"),
+        "missed": missed,
+        "false_alarm": float(np.mean(states[quiet] != 0)) if quiet.any() else 0.0,
+        "accuracy": float(np.mean(states == truth)) if n else 0.0,
+    }
+
+
+def evaluate(data, truth, settings, block_size, center_freq, fs):
+    """
+    逐组参数回放同一段数据并评分
+    Args:
+        data: complex IQ（数组或内存映射）
+        truth: 逐块真值 (uint8，对应 LABELS)
+        settings: {名称: Energy_Detector 参数 dict}
+        block_size: 每次 detect 的采样点数（与接收端 buffer_size 一致）
+    Rets:
+        {名称: score() 结果 + 单次 detect 耗时}
+    """
+    block_time = block_size / fs
+    results = {}
+    for name, kwargs in settings.items():
+        states, elapsed = replay(data, block_size, center_freq, fs, **kwargs)
+        res = score(states, truth, block_time)
+        res["detect_ms"] = float(np.mean(elapsed) * 1e3) if len(elapsed) else 0.0
+        results[name] = res
+    return results
+
+
+def print_report(results):
+    print(f"{'setting':<24s} {'switches':>8s} {'latency_ms':>11s} {'max_ms':>8s} {'missed':>6s} "
+          f"{'false_alarm':>11s} {'accuracy':>8s} {'detect_ms':>9s}")
+    for name, r in results.items():
+        print(f"{name:<24s} {r['switches']:>8d} {r['latency_ms']:>11.1f} {r['latency_max_ms']:>8.1f} "
+              f"{r['missed']:>6d} {r['false_alarm']:>11.3f} {r['accuracy']:>8.3f} {r['detect_ms']:>9.2f}")
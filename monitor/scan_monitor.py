@@ -0,0 +1,32 @@
+from monitor.energy_detector import Energy_Detector
+
+
+class ScanMonitor:
+    """
+    扫描接收时的多 LO 能量检测
+    - 每个 LO 独立一个 Energy_Detector，Welch 平均与命中历史不会被其他 LO 的数据污染
+    - 输入 radio.scanner.ScanBlock，按其 LO 分派并记录各 LO 最近一次判决
+    """
+
+    def __init__(self, los, fs, **detector_kwargs):
+        """
+        Args:
+            los: 扫描计划中的 LO 列表
+            fs: 采样率
+            detector_kwargs: 传给 Energy_Detector 的其余参数
+        """
+        self.detectors = {float(lo): Energy_Detector(fs=fs, **detector_kwargs) for lo in los}
+        self.states = {lo: "NONE" for lo in self.detectors}
+        self.updated = {lo: None for lo in self.detectors}  # 最近一次判决的数据块时间戳
+
+    def process(self, block):
+        """检测一块扫描数据，返回该 LO 的判决结果"""
+        lo = float(block.lo)
+        state = self.detectors[lo].detect(block.iq, lo)
+        self.states[lo] = state
+        self.updated[lo] = block.timestamp
+        return state
+
+    def active(self):
+        """当前有判决结果（非 NONE）的 {LO: 状态}"""
+        return {lo: s for lo, s in self.states.items() if s != "NONE"}
@@ -0,0 +1,238 @@
+# asyncio 主控：读取 / 检测 / 链路控制 / 上报分为独立任务
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+import numpy as np
+
+_STOP = object()  # 队列结束标记
+
+
+class _DaemonExecutor(Executor):
+    """
+    单个守护线程的执行器，供读取任务使用
+    ThreadPoolExecutor 的线程在解释器退出时会被 join，receiver.read() 卡死时进程无法退出；
+    守护线程被放弃后不影响退出
+    """
+
+    def __init__(self, name):
+        self._q = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        self._q.put((future, fn, args, kwargs))
+        return future
+
+    def _run(self):
+        while True:
+            item = self._q.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self._q.put(None)
+        if wait:
+            self._thread.join()
+
+
+class Orchestrator:
+    """
+    asyncio 主控循环
+    - 读取任务：在专用线程中调用 receiver.read()，写入环形缓冲（供解调线程）并送入检测队列；
+      检测跟不上时丢弃队列中最旧的块，读取从不等待检测
+    - 检测任务：在另一个线程中执行 detector.detect；提交前丢弃读到至今已超过 max_block_age 的旧块，
+      已提交的检测总是等待完成（检测器有跨块状态，不能在后台继续运行的同时处理下一块）
+    - 控制任务：把检测结果交给 WorkerPool（迟滞 + 暂停 / 恢复，只设置事件，直接在事件循环中调用），
+      记录 "数据读到 -> 链路切换完成" 的延迟
+    - 上报任务：把状态切换事件转交 ReportSystem
+    - 关闭：读取结束或 stop() 后，各队列依次排空再退出，最后停止线程池与上报；
+      receiver.read() 超过 read_timeout 未返回或 stop() 时不再等待这次读取，按读取结束处理；
+      任一任务异常时取消其余任务并等待其退出，异常由 run() 抛出
+    """
+
+    def __init__(self, receiver, detector, pool, ring, center_freq, reporter=None, metrics=None,
+                 queue_size=4, max_block_age=0.5, read_timeout=2.0):
+        """
+        Args:
+            receiver: 提供 read() 的接收端（PlutoReceiver / FileReceiver / SimReceiver）
+            detector: Energy_Detector
+            pool: WorkerPool（需已 start）
+            ring: IQRingBuffer，读取任务写入，解调线程各自读取
+            center_freq: 检测使用的 LO 频率
+            reporter: 可选的 ReportSystem
+            metrics: 可选的 tools.metrics.Metrics
+            queue_size: 检测队列长度（块）
+            max_block_age: 开始检测时数据块距读到的最大时长 (s)，更旧的块直接丢弃
+            read_timeout: 单次 receiver.read() 的最长等待 (s)，超时视为接收端卡死并结束读取；None 表示不限
+        """
+        self.receiver = receiver
+        self.detector = detector
+        self.pool = pool
+        self.ring = ring
+        self.center_freq = center_freq
+        self.reporter = reporter
+        self.metrics = metrics
+        self.queue_size = queue_size
+        self.max_block_age = max_block_age
+        self.read_timeout = read_timeout
+
+        self.blocks = 0  # 已读取的数据块数
+        self.detected = 0  # 已检测的数据块数
+        self.overruns = 0  # 检测队列满而丢弃的块数
+        self.stale = 0  # 等待检测时间过长而丢弃的块数
+        self.read_timeouts = 0  # receiver.read() 超时次数
+        self.switch_latency = deque(maxlen=1024)  # 读到触发切换的数据块 -> 切换完成 (s)
+        self.events = []  # (切换完成时刻, 新状态)
+
+        self._stopping = None
+        self._read_abandoned = False  # 是否有未返回的 receiver.read() 被放弃
+
+    def stop(self):
+        """请求优雅关闭（可在事件循环内调用）"""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def _read_one(self):
+        iq = self.receiver.read()
+        if iq is not None:
+            self.ring.write(iq)
+        return iq
+
+    async def _reader(self, loop, executor, detect_q):
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            while not self._stopping.is_set():
+                t0 = time.perf_counter()
+                read = loop.run_in_executor(executor, self._read_one)
+                await asyncio.wait((read, stopping), timeout=self.read_timeout,
+                                   return_when=asyncio.FIRST_COMPLETED)
+                if not read.done():
+                    # stop() 或读取超时：不再等待这次读取，其结果被丢弃
+                    read.cancel()
+                    self._read_abandoned = True
+                    if not self._stopping.is_set():
+                        self.read_timeouts += 1
+                        if self.metrics is not None:
+                            self.metrics.drop("read_timeout")
+                    break
+                iq = read.result()
+                if iq is None:
+                    break
+                t_read = time.perf_counter()
+                self.blocks += 1
+                if self.metrics is not None:
+                    self.metrics.record("main.read", t_read - t0, len(iq))
+                if detect_q.full():
+                    detect_q.get_nowait()
+                    self.overruns += 1
+                    if self.metrics is not None:
+                        self.metrics.drop("detect_queue")
+                detect_q.put_nowait((t_read, iq))
+        finally:
+            # 与正常入队相同，队列满时丢弃最旧的块，被取消时也不会阻塞在这里
+            stopping.cancel()
+            if detect_q.full():
+                detect_q.get_nowait()
+                self.overruns += 1
+            detect_q.put_nowait(_STOP)
+
+    async def _detect(self, loop, executor, detect_q, control_q):
+        while True:
+            item = await detect_q.get()
+            if item is _STOP:
+                break
+            t_read, iq = item
+            t0 = time.perf_counter()
+            if t0 - t_read > self.max_block_age:
+                self.stale += 1
+                if self.metrics is not None:
+                    self.metrics.drop("detect_stale")
+                continue
+            state = await loop.run_in_executor(executor, self.detector.detect, iq, self.center_freq)
+            self.detected += 1
+            if self.metrics is not None:
+                self.metrics.record("main.detect", time.perf_counter() - t0, len(iq))
+                self.metrics.observe("main.queue_delay_ms", (t0 - t_read) * 1e3)
+            await control_q.put((t_read, state))
+        await control_q.put(_STOP)
+
+    async def _control(self, control_q, report_q):
+        while True:
+            item = await control_q.get()
+            if item is _STOP:
+                break
+            t_read, state = item
+            before = self.pool.current
+            current = self.pool.update(state)
+            if current != before:
+                latency = time.perf_counter() - t_read
+                self.switch_latency.append(latency)
+                self.events.append((time.monotonic(), current))
+                if self.metrics is not None:
+                    self.metrics.observe("main.switch_latency_ms", latency * 1e3)
+                await report_q.put((current, latency))
+        await report_q.put(_STOP)
+
+    async def _report(self, report_q):
+        while True:
+            item = await report_q.get()
+            if item is _STOP:
+                break
+            state, latency = item
+            if self.reporter is not None:
+                self.reporter.report_state(state, latency_ms=round(latency * 1e3, 3))
+
+    async def run(self):
+        """运行直到读取结束或 stop()，返回 stats()"""
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        detect_q = asyncio.Queue(maxsize=self.queue_size)
+        control_q = asyncio.Queue()
+        report_q = asyncio.Queue()
+
+        # 读取与检测各占一个线程，慢检测不会拖住读取
+        read_exec = _DaemonExecutor("read")
+        detect_exec = ThreadPoolExecutor(max_workers=1, thread_name_prefix="detect")
+        tasks = [
+            asyncio.ensure_future(self._reader(loop, read_exec, detect_q)),
+            asyncio.ensure_future(self._detect(loop, detect_exec, detect_q, control_q)),
+            asyncio.ensure_future(self._control(control_q, report_q)),
+            asyncio.ensure_future(self._report(report_q)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # 某个任务异常时其余任务收不到 _STOP，取消并等待其退出后再停止线程
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            read_exec.shutdown(wait=not self._read_abandoned)
+            detect_exec.shutdown(wait=True)
+        return self.stats()
+
+    def stats(self):
+        lat = np.array(self.switch_latency) * 1e3
+        return {
+            "blocks": self.blocks,
+            "detected": self.detected,
+            "overruns": self.overruns,
+            "stale": self.stale,
+            "read_timeouts": self.read_timeouts,
+            "switches": len(self.events),
+            "switch_latency_ms": {
+                "p50": float(np.percentile(lat, 50)) if len(lat) else 0.0,
+                "max": float(lat.max()) if len(lat) else 0.0,
+            },
+        }
@@ -0,0 +1,121 @@
+import numpy as np
+
+
+def _reflect(value, width):
+    return int(format(value, f"0{width}b")[::-1], 2)
+
+
+class CRC:
+    """
+    查表法（逐字节）CRC 计算
+    - 256 项查找表在构造时一次生成
+    - 支持直接输入字节 / 比特数组（MSB 在前）
+    - compute_batch 对等长的多帧按列查表，一次循环处理一批帧
+    参数命名同 CRC RevEng 目录 (width / poly / init / refin / refout / xorout)
+    """
+
+    def __init__(self, width, poly, init=0, refin=False, refout=False, xorout=0, name=None):
+        if width % 8 != 0 or not 8 <= width <= 32:
+            raise ValueError("width 必须为 8 / 16 / 24 / 32")
+        self.width = width
+        self.poly = poly
+        self.init = init
+        self.refin = refin
+        self.refout = refout
+        self.xorout = xorout
+        self.name = name or f"CRC-{width}"
+        self.mask = (1 << width) - 1
+        self.table = self._make_table()
+        self._table_list = self.table.tolist()
+
+    def _make_table(self):
+        w = self.width
+        table = np.zeros(256, dtype=np.uint64)
+        if self.refin:
+            poly = _reflect(self.poly, w)
+            for i in range(256):
+                c = i
+                for _ in range(8):
+                    c = (c >> 1) ^ poly if c & 1 else c >> 1
+                table[i] = c
+        else:
+            top = 1 << (w - 1)
+            for i in range(256):
+                c = i << (w - 8)
+                for _ in range(8):
+                    c = ((c << 1) ^ self.poly) if c & top else c << 1
+                table[i] = c & self.mask
+        return table
+
+    def _init_register(self):
+        return _reflect(self.init, self.width) if self.refin else self.init
+
+    def _finalize(self, crc):
+        if self.refin != self.refout:
+            crc = _reflect(crc, self.width)
+        return crc ^ self.xorout
+
+    def compute(self, data):
+        """
+        计算一帧的 CRC
+        Args:
+            data: bytes 或 uint8 数组
+        Rets:
+            CRC 值 (int)
+        """
+        table = self._table_list
+        crc = self._init_register()
+        if self.refin:
+            for b in bytes(data):
+                crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+        else:
+            shift = self.width - 8
+            mask = self.mask
+            for b in bytes(data):
+                crc = ((crc << 8) & mask) ^ table[((crc >> shift) ^ b) & 0xFF]
+        return self._finalize(crc)
+
+    def compute_bits(self, bits):
+        """比特数组（MSB 在前，长度为 8 的整数倍）的 CRC"""
+        return self.compute(np.packbits(np.asarray(bits, dtype=np.uint8)))
+
+    def compute_batch(self, frames):
+        """
+        批量计算等长帧的 CRC
+        Args:
+            frames: 形状 (num_frames, num_bytes) 的 uint8 数组
+        Rets:
+            每帧的 CRC 值 (uint64 数组)
+        """
+        frames = np.asarray(frames, dtype=np.uint8)
+        if frames.ndim != 2:
+            raise ValueError("frames 必须为二维数组")
+        table = self.table
+        mask = np.uint64(self.mask)
+        crc = np.full(len(frames), self._init_register(), dtype=np.uint64)
+        col = np.empty(len(frames), dtype=np.uint64)
+        if self.refin:
+            for j in range(frames.shape[1]):
+                col[:] = frames[:, j]
+                crc = (crc >> np.uint64(8)) ^ table[(crc ^ col) & np.uint64(0xFF)]
+        else:
+            shift = np.uint64(self.width - 8)
+            for j in range(frames.shape[1]):
+                col[:] = frames[:, j]
+                crc = ((crc << np.uint64(8)) & mask) ^ table[((crc >> shift) ^ col) & np.uint64(0xFF)]
+        if self.refin != self.refout:
+            crc = np.array([_reflect(int(c), self.width) for c in crc], dtype=np.uint64)
+        return crc ^ np.uint64(self.xorout)
+
+    def to_bytes(self, value):
+        """CRC 值按大端序转换为字节（附加在帧尾）"""
+        return int(value).to_bytes(self.width // 8, "big")
+
+    def check(self, data, value):
+        return self.compute(data) == int(value)
+
+
+# 常用参数（校验值均为 "123456789" 的 CRC）
+CRC8 = CRC(8, 0x07, name="CRC-8")  # 0xF4
+CRC16_CCITT = CRC(16, 0x1021, init=0xFFFF, name="CRC-16/CCITT-FALSE")  # 0x29B1
+CRC32 = CRC(32, 0x04C11DB7, init=0xFFFFFFFF, refin=True, refout=True, xorout=0xFFFFFFFF, name="CRC-32")  # 0xCBF43926
@@ -0,0 +1,81 @@
+import numpy as np
+
+
+# 默认同步字：CCSDS 附加同步标记 0x1ACFFC1D，按每符号 2 bit (MSB 在前) 映射为 16 个四电平符号
+DEFAULT_SYNC_WORD = ((0x1ACFFC1D >> (2 * np.arange(15, -1, -1))) & 3).astype(np.uint8)
+
+
+def bits_to_symbols(bits):
+    """比特 (MSB 在前，两两一组) -> 四电平符号 0~3"""
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1, 2)
+    return (bits[:, 0] << 1) | bits[:, 1]
+
+
+def symbols_to_bits(symbols):
+    """四电平符号 -> 比特，与 BaseFSKDemod.process 的比特顺序一致"""
+    symbols = np.asarray(symbols, dtype=np.uint8)
+    return ((symbols[:, None] >> np.array([1, 0], dtype=np.uint8)) & 1).ravel()
+
+
+def symbols_to_bytes(symbols):
+    """每 4 个符号组成一个字节（第一个符号为最高 2 bit）"""
+    s = np.asarray(symbols, dtype=np.uint8).reshape(-1, 4)
+    return (s[:, 0] << 6) | (s[:, 1] << 4) | (s[:, 2] << 2) | s[:, 3]
+
+
+def bytes_to_symbols(data):
+    data = np.frombuffer(bytes(data), dtype=np.uint8)
+    return ((data[:, None] >> np.array([6, 4, 2, 0], dtype=np.uint8)) & 3).ravel()
+
+
+class FrameSync:
+    """
+    流式同步字搜索
+    - 逐同步字位置做向量化比较并累计不匹配数，开销为 O(len(sync_word) * n)
+    - 不匹配符号数不超过 max_errors 即判为命中
+    - 保留上一块末尾 len(sync_word)-1 个符号，跨块边界的同步字同样能找到
+    """
+
+    def __init__(self, sync_word=DEFAULT_SYNC_WORD, max_errors=1):
+        """
+        Args:
+            sync_word: 同步字符号序列 (0~3)
+            max_errors: 允许的最大错误符号数
+        """
+        self.sync_word = np.asarray(sync_word, dtype=np.uint8)
+        self.max_errors = max_errors
+        self.reset()
+
+    def reset(self):
+        self._tail = np.empty(0, dtype=np.uint8)
+        self.position = 0  # 已输入的符号总数
+        self.hits = 0
+
+    def process(self, symbols):
+        """
+        搜索一块符号
+        Args:
+            symbols: 判决后的符号序列
+        Rets:
+            starts: 命中的同步字起始位置（符号流中的绝对序号）
+            errors: 每次命中的错误符号数
+        """
+        symbols = np.asarray(symbols, dtype=np.uint8)
+        m = len(self.sync_word)
+        buf = np.concatenate((self._tail, symbols)) if len(self._tail) else symbols
+        base = self.position - len(self._tail)
+        self.position += len(symbols)
+
+        num = len(buf) - m + 1
+        if num <= 0:
+            self._tail = buf.copy()
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        mismatch = np.zeros(num, dtype=np.int64)
+        for j, s in enumerate(self.sync_word):
+            mismatch += buf[j:j + num] != s
+        idx = np.flatnonzero(mismatch <= self.max_errors)
+
+        self._tail = buf[num:].copy()
+        self.hits += len(idx)
+        return base + idx, mismatch[idx]
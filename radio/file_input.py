@@ -1 +1,109 @@
-# 离线 IQ
\ No newline at end of file
+# 离线 IQ
+import time
+import logging
+
+import numpy as np
+
+from dsp.utils import int16_to_complex64
+
+
+class FileReceiver:
+    """
+    文件回放接收端，接口与 PlutoReceiver 一致 (read / capture_stream / close)
+    - 以内存映射方式打开录制文件，不整体读入内存
+    - complex64 .iq 文件按固定块长返回零拷贝视图
+    - int16 交织的 Pluto 原始数据按块转换为 complex64（与 pyadi rx() 数值一致），
+      raw=True 时直接返回 int16 零拷贝视图，由环形缓冲在写入时一次转换
+    - 支持按采样率实时回放与尽快回放，读到文件末尾可循环
+    """
+
+    def __init__(self, path, fs=2e6, fc=433e6, buffer_size=1024 * 16,
+                 fmt="complex64", realtime=False, loop=True, max_blocks=None, raw=False):
+        """
+        :param path: 录制文件路径
+        :param fs: 采样率（实时回放的节拍）
+        :param fc: 录制时的中心频率（仅作记录）
+        :param buffer_size: 每次 read() 的采样点数
+        :param fmt: "complex64" 或 "int16"（I/Q 交织）
+        :param realtime: True 按采样率节拍回放，False 尽快回放
+        :param loop: 读到末尾后是否从头循环
+        :param max_blocks: 最多返回的数据块数（None 不限制），便于固定长度的基准测试
+        :param raw: int16 文件是否按原始交织格式返回（长度 2 * buffer_size 的 int16）
+        """
+        if fmt not in ("complex64", "int16"):
+            raise ValueError(f"不支持的文件格式: {fmt}")
+        self.path = path
+        self.fs = int(fs)
+        self.fc = int(fc)
+        self.buffer_size = int(buffer_size)
+        self.fmt = fmt
+        self.realtime = realtime
+        self.loop = loop
+        self.max_blocks = max_blocks
+        self.raw = raw and fmt == "int16"
+
+        if fmt == "complex64":
+            self._data = np.memmap(path, dtype=np.complex64, mode="r")
+            self.num_samples = len(self._data)
+        else:
+            self._data = np.memmap(path, dtype=np.int16, mode="r")
+            self.num_samples = len(self._data) // 2
+
+        self.num_blocks = self.num_samples // self.buffer_size
+        if self.num_blocks == 0:
+            raise ValueError(f"文件不足一个数据块: {path}")
+        logging.info(f"Replaying {path}: {self.num_blocks} blocks of {self.buffer_size}")
+
+        self.reset()
+
+    def reset(self):
+        """回到文件开头并重置回放节拍"""
+        self.block_index = 0  # 下一个数据块在文件中的序号
+        self.blocks_served = 0
+        self._t0 = None
+
+    def _block(self, k):
+        n = self.buffer_size
+        if self.fmt == "complex64":
+            return self._data[k * n:(k + 1) * n]
+        raw = self._data[2 * k * n:2 * (k + 1) * n]
+        if self.raw:
+            return raw
+        return int16_to_complex64(raw)
+
+    def read(self):
+        """返回下一个数据块；不循环且已读完（或达到 max_blocks）时返回 None"""
+        if self.max_blocks is not None and self.blocks_served >= self.max_blocks:
+            return None
+        if self.block_index >= self.num_blocks:
+            if not self.loop:
+                return None
+            self.block_index = 0
+
+        if self.realtime:
+            now = time.perf_counter()
+            if self._t0 is None:
+                self._t0 = now
+            due = self._t0 + self.blocks_served * self.buffer_size / self.fs
+            if due > now:
+                time.sleep(due - now)
+
+        iq = self._block(self.block_index)
+        self.block_index += 1
+        self.blocks_served += 1
+        return iq
+
+    def capture_stream(self):
+        """与 PlutoReceiver.capture_stream 相同的生成器接口"""
+        while True:
+            iq = self.read()
+            if iq is None:
+                return
+            yield iq
+
+    def update_fc(self, new_fc):
+        """回放数据的中心频率固定，仅记录"""
+        self.fc = int(new_fc)
+
+    def close(self):
+        self._data = None
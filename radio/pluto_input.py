@@ -9,17 +9,21 @@ import adi
 import time
 
 class PlutoReceiver:
-    def __init__(self, ip="ip:192.168.2.1", fs=2e6, fc=433.5e6, gain=None):
+    def __init__(self, ip="ip:192.168.2.1", fs=2e6, fc=433.5e6, gain=None, buffer_size=1024 * 16, raw=False):
         """
         PlutoSDR 接收抽象层
         :param ip: Pluto 的 IP 地址
         :param fs: 采样率 (默认 2MHz)
         :param fc: 中心频率 (需覆盖 432.2MHz - 434.92MHz)
         :param gain: 接收增益 (None 表示开启 AGC)
+        :param buffer_size: 每次 rx() 的采样点数
+        :param raw: True 时 capture_stream 产出 I/Q 交织的 int16 原始数据（不经 pyadi 转为 complex128）
         """
         self.ip = ip
         self.fs = int(fs)
         self.fc = int(fc)
+        self.buffer_size = int(buffer_size)
+        self.raw = raw
         self.sdr = None
         
         try:
@@ -36,7 +40,7 @@ class PlutoReceiver:
         self.sdr.rx_lo = self.fc
         
         # 接收 Buffer 大小 (建议为 2^N，影响实时性与 FFT 分辨率)
-        self.sdr.rx_buffer_size = 1024 * 16 
+        self.sdr.rx_buffer_size = self.buffer_size
         
         # 增益控制
         if gain is None:
@@ -45,19 +49,47 @@ class PlutoReceiver:
             self.sdr.gain_control_mode_chan0 = "manual"
             self.sdr.rx_hardwaregain_chan0 = gain
 
+    def read_raw(self):
+        """
+        读取一块 I/Q 交织的 int16 原始数据
+        pyadi 的 rx() 会先转成 complex128，这里直接取其内部的逐通道 int16 缓冲
+        _rx_buffered_data() 是 pyadi-iio 的内部接口（按 0.0.16 的 rx_core 编写，返回逐通道数组列表）；
+        不存在时退回 rx()，把复数换算回 int16（多一次转换，数值相同）
+        """
+        rx_buffered_data = getattr(self.sdr, "_rx_buffered_data", None)
+        if rx_buffered_data is not None:
+            i, q = rx_buffered_data()[:2]
+        else:
+            iq = self.sdr.rx()
+            i, q = iq.real, iq.imag
+        raw = np.empty(2 * len(i), dtype=np.int16)
+        raw[0::2] = i
+        raw[1::2] = q
+        return raw
+
+    def read(self):
+        """读取一块数据（raw 时为 int16 交织原始数据，否则为 pyadi 转换后的复数）"""
+        return self.read_raw() if self.raw else self.sdr.rx()
+
     def capture_stream(self):
         """实时产生数据块，绝不在此打印原始数据"""
         try:
             while True:
-                iq = self.sdr.rx()
+                iq = self.read()
                 yield iq
         except Exception as e:
             print(f"[Rx Error] {e}")
 
-    def update_fc(self, new_fc):
-        """动态调整中心频率 (如果干扰漂移出了当前采样带宽)"""
+    def update_fc(self, new_fc, flush=True):
+        """
+        动态调整中心频率 (如果干扰漂移出了当前采样带宽)
+        :param flush: 是否销毁内核中已缓存的接收缓冲（其中是重调前的旧 LO 数据）
+        重调后本振锁定期间的数据仍需丢弃，由 radio.scanner.ScanScheduler 按 settle_blocks 处理
+        """
         self.fc = int(new_fc)
         self.sdr.rx_lo = self.fc
+        if flush and hasattr(self.sdr, "rx_destroy_buffer"):
+            self.sdr.rx_destroy_buffer()
         logging.info(f"LO frequency updated to {self.fc/1e6} MHz")
 
     def close(self):
@@ -0,0 +1,171 @@
+# 单生产者 / 多消费者 IQ 环形缓冲
+import threading
+import logging
+import time
+
+import numpy as np
+
+from dsp.utils import int16_to_complex64
+
+
+class IQRingBuffer:
+    """
+    预分配的 complex64 环形缓冲（按数据块分槽）
+    - 只有一个生产者写入，写入从不等待消费者
+    - 每个消费者持有独立游标，读取返回槽内数据的零拷贝视图
+    - 消费者落后过多时直接跳到最新数据块，并记录溢出 / 丢弃计数
+    - 不使用锁：序号为 Python int，读写依赖 GIL 保证原子性
+    """
+
+    def __init__(self, block_size=1024 * 16, num_slots=32):
+        """
+        Args:
+            block_size: 每个槽的采样点数（与 SDR rx_buffer_size 一致）
+            num_slots: 槽数量
+        """
+        if num_slots < 4:
+            raise ValueError("num_slots 至少为 4")
+        self.block_size = block_size
+        self.num_slots = num_slots
+        self._slots = np.zeros((num_slots, block_size), dtype=np.complex64)
+        self._lengths = np.zeros(num_slots, dtype=np.int64)
+        self._stamps = np.zeros(num_slots)  # 各槽写入完成时刻 (perf_counter)，用于统计数据龄
+
+        self.write_seq = 0  # 已写完的数据块数
+        self._claim = 0  # 正在写入的数据块序号（写完前即对消费者可见）
+        self.cursors = {}
+
+    def write(self, iq):
+        """
+        写入一块数据（超过 block_size 时拆分为多个槽）
+        int16 数据按 I/Q 交织的原始格式处理，拷入槽时直接转换为 complex64，不产生中间数组
+        """
+        iq = np.asarray(iq)
+        raw = iq.dtype == np.int16
+        step = 2 * self.block_size if raw else self.block_size
+        for start in range(0, len(iq), step):
+            chunk = iq[start:start + step]
+            seq = self.write_seq
+            slot = seq % self.num_slots
+            self._claim = seq
+            if raw:
+                n = len(int16_to_complex64(chunk, out=self._slots[slot]))
+            else:
+                n = len(chunk)
+                self._slots[slot, :n] = chunk
+            self._lengths[slot] = n
+            self._stamps[slot] = time.perf_counter()
+            self.write_seq = seq + 1
+
+    def cursor(self, name, headroom=2):
+        """创建并登记一个消费者游标，从最新位置开始读取"""
+        c = RingCursor(self, name, headroom=headroom)
+        self.cursors[name] = c
+        return c
+
+    def release(self, cursor):
+        self.cursors.pop(cursor.name, None)
+
+    def stats(self):
+        """各游标的读取 / 溢出 / 丢弃计数"""
+        return {
+            "written": self.write_seq,
+            "cursors": {name: c.stats() for name, c in list(self.cursors.items())},
+        }
+
+
+class RingCursor:
+    """
+    环形缓冲的消费者游标
+    - read() 与 PlutoInput.read() 接口一致：有数据返回视图，否则返回 None
+    - 返回的视图在生产者再写入 num_slots - 1 块之前有效，可用 is_valid() 校验
+    """
+
+    def __init__(self, ring, name, headroom=2):
+        self.ring = ring
+        self.name = name
+        # 落后超过 max_lag 块即视为溢出，保留 headroom 块给正在使用的视图
+        self.max_lag = ring.num_slots - headroom
+        self.read_seq = ring.write_seq
+        self._last_seq = -1
+        self.last_stamp = None  # 上一次 read() 所得数据块的写入时刻
+
+        self.consumed = 0
+        self.overruns = 0
+        self.dropped = 0
+
+    def seek_latest(self):
+        """跳过所有未读数据块（不计入丢弃），下一次 read() 只返回新写入的数据"""
+        self.read_seq = self.ring.write_seq
+
+    def available(self):
+        return self.ring.write_seq - self.read_seq
+
+    def read(self):
+        ring = self.ring
+        write_seq = ring.write_seq
+        lag = write_seq - self.read_seq
+        if lag <= 0:
+            return None
+
+        if lag > self.max_lag:
+            # 溢出：丢弃积压，直接读取最新数据块
+            self.overruns += 1
+            self.dropped += lag - 1
+            self.read_seq = write_seq - 1
+
+        seq = self.read_seq
+        slot = seq % ring.num_slots
+        self.read_seq = seq + 1
+        self._last_seq = seq
+        self.last_stamp = ring._stamps[slot]
+        self.consumed += 1
+        return ring._slots[slot, :ring._lengths[slot]]
+
+    def age(self):
+        """上一次 read() 所得数据块从写入到现在经过的时间 (s)"""
+        if self.last_stamp is None:
+            return 0.0
+        return time.perf_counter() - self.last_stamp
+
+    def is_valid(self):
+        """上一次 read() 返回的视图是否仍未被生产者覆盖"""
+        return self._last_seq >= 0 and self.ring._claim < self._last_seq + self.ring.num_slots
+
+    def stats(self):
+        return {
+            "lag": self.available(),
+            "consumed": self.consumed,
+            "overruns": self.overruns,
+            "dropped": self.dropped,
+        }
+
+
+class CaptureThread(threading.Thread):
+    """
+    唯一的生产者线程：独占 receiver.capture_stream() 并写入环形缓冲
+    """
+
+    def __init__(self, receiver, ring):
+        super().__init__(daemon=True)
+        self.name = "capture"
+        self.receiver = receiver
+        self.ring = ring
+        self.running = False
+
+    def run(self):
+        self.running = True
+        stream = self.receiver.capture_stream()
+        try:
+            for iq in stream:
+                if not self.running:
+                    break
+                self.ring.write(iq)
+        except Exception as e:
+            logging.error(f"[capture] stopped on error: {e}")
+        finally:
+            stream.close()
+            self.running = False
+
+    def stop(self):
+        self.running = False
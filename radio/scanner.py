@@ -0,0 +1,84 @@
+# 多 LO 扫描调度
+import math
+import time
+from collections import deque, namedtuple
+
+# 扫描输出的数据块：LO、读取完成时刻 (time.monotonic)、全局序号、IQ 数据
+ScanBlock = namedtuple("ScanBlock", ["lo", "timestamp", "seq", "iq"])
+
+
+class ScanScheduler:
+    """
+    在 PlutoReceiver（或接口一致的 SimReceiver / FileReceiver）之上轮询多个 LO
+    - plan 为 [(LO 频率, 驻留时间 s), ...]，驻留时间按块长换算为整数块（至少 1 块）
+    - 每次重调后丢弃 settle_blocks 块锁定过程中的数据，只输出稳定数据
+    - 每块标注 LO 与时间戳；统计重调耗时、丢弃块数与各 LO 的重访间隔
+    - 只有一个 LO 时不重调，等价于连续接收
+    """
+
+    def __init__(self, receiver, plan, settle_blocks=1):
+        """
+        Args:
+            receiver: 提供 read() / update_fc() / fs / buffer_size 的接收端
+            plan: [(lo, dwell_s), ...]
+            settle_blocks: 重调后丢弃的数据块数
+        """
+        if not plan:
+            raise ValueError("扫描计划不能为空")
+        self.receiver = receiver
+        self.settle_blocks = settle_blocks
+        block_time = receiver.buffer_size / receiver.fs
+        self.plan = [(float(lo), max(1, math.ceil(dwell / block_time - 1e-9))) for lo, dwell in plan]
+        self.los = [lo for lo, _ in self.plan]
+
+        self.seq = 0
+        self.cycles = 0  # 完整扫描轮数
+        self.discarded = 0  # 重调后丢弃的数据块数
+        self.retune_time = deque(maxlen=1024)  # update_fc 调用耗时 (s)
+        self.revisit = {lo: deque(maxlen=256) for lo in self.los}  # 同一 LO 两次驻留开始的间隔 (s)
+        self._last_visit = {}
+
+    def _retune(self, lo):
+        t0 = time.perf_counter()
+        self.receiver.update_fc(lo)
+        self.retune_time.append(time.perf_counter() - t0)
+        for _ in range(self.settle_blocks):
+            if self.receiver.read() is None:
+                return False
+            self.discarded += 1
+        return True
+
+    def scan(self):
+        """生成器：按计划循环输出 ScanBlock；接收端返回 None 时结束"""
+        single = len(self.plan) == 1
+        if single and int(self.receiver.fc) != int(self.plan[0][0]):
+            if not self._retune(self.plan[0][0]):
+                return
+        while True:
+            for lo, dwell in self.plan:
+                if not single and not self._retune(lo):
+                    return
+                now = time.monotonic()
+                if lo in self._last_visit:
+                    self.revisit[lo].append(now - self._last_visit[lo])
+                self._last_visit[lo] = now
+
+                for _ in range(dwell):
+                    iq = self.receiver.read()
+                    if iq is None:
+                        return
+                    yield ScanBlock(lo, time.monotonic(), self.seq, iq)
+                    self.seq += 1
+            self.cycles += 1
+
+    def stats(self):
+        def mean_ms(d):
+            return sum(d) / len(d) * 1e3 if d else 0.0
+
+        return {
+            "cycles": self.cycles,
+            "blocks": self.seq,
+            "discarded": self.discarded,
+            "retune_ms": mean_ms(self.retune_time),
+            "revisit_ms": {lo: mean_ms(d) for lo, d in self.revisit.items()},
+        }
@@ -0,0 +1,78 @@
+# 仿真接收机：无硬件时替代 PlutoReceiver，用于扫描调度与重调时序的基准测试
+import time
+
+import numpy as np
+
+
+class SimReceiver:
+    """
+    仿真 PlutoReceiver（接口一致：read / capture_stream / update_fc / close）
+    - 发射源为 radio.synth.FSKEmitter（如 preset_emitter(level, fc)），其频偏以构造时的 fc 为参考，
+      即绝对频率 fc + freq_offset；只合成落在当前 LO 采样带宽内的发射源，叠加噪声底
+    - update_fc 阻塞 retune_delay 秒模拟本振重调；随后 settle_buffers 块为锁定过程中的无效数据
+      （仍按旧 LO 合成并叠加幅度瞬态），调度器应将其丢弃
+    - realtime=True 时按采样率节拍返回数据
+    """
+
+    def __init__(self, emitters=(), fs=2e6, fc=433e6, buffer_size=1024 * 16, noise_db=-60,
+                 retune_delay=0.002, settle_buffers=1, realtime=True, seed=0):
+        self.emitters = list(emitters)
+        self.fs = int(fs)
+        self.fc = int(fc)
+        self.freqs = [fc + e.freq_offset for e in self.emitters]  # 各发射源的绝对频率
+        self.buffer_size = int(buffer_size)
+        self.noise_amp = 10 ** (noise_db / 20) / np.sqrt(2)
+        self.retune_delay = retune_delay
+        self.settle_buffers = settle_buffers
+        self.realtime = realtime
+        self.rng = np.random.default_rng(seed)
+
+        self._synth_lo = self.fc  # 合成数据实际使用的 LO（锁定前为旧值）
+        self._settle_left = 0
+        self._next_due = None
+        self.retunes = 0
+        self.blocks = 0
+        self.settling_blocks = 0  # 已返回的无效（锁定中）数据块数
+
+    def read(self):
+        n = self.buffer_size
+        if self.realtime:
+            now = time.perf_counter()
+            if self._next_due is None:
+                self._next_due = now
+            self._next_due += n / self.fs
+            if self._next_due > now:
+                time.sleep(self._next_due - now)
+
+        iq = self.noise_amp * (self.rng.standard_normal(n) + 1j * self.rng.standard_normal(n))
+        for e, freq in zip(self.emitters, self.freqs):
+            if abs(freq - self._synth_lo) < self.fs / 2:
+                e.freq_offset = freq - self._synth_lo  # 相位跨块累积，换 LO 时保持连续
+                iq += e.generate(n)
+
+        if self._settle_left > 0:
+            # 锁定过程：旧 LO 数据 + 幅度瞬态
+            iq *= np.linspace(1.0, 0.1, n)
+            self._settle_left -= 1
+            self.settling_blocks += 1
+            if self._settle_left == 0:
+                self._synth_lo = self.fc
+        self.blocks += 1
+        return iq.astype(np.complex64)
+
+    def capture_stream(self):
+        while True:
+            yield self.read()
+
+    def update_fc(self, new_fc, flush=True):
+        self.fc = int(new_fc)
+        time.sleep(self.retune_delay)
+        self.retunes += 1
+        self._next_due = None  # 重调期间采样流中断，节拍重新开始
+        if self.settle_buffers > 0:
+            self._settle_left = self.settle_buffers
+        else:
+            self._synth_lo = self.fc
+
+    def close(self):
+        pass
@@ -0,0 +1,144 @@
+# 向量化多发射源合成：按块流式生成带标签的测试 IQ（广播源 + 各级干扰 + AWGN）
+import numpy as np
+
+from dsp.fir import StreamingFIR
+from dsp.rrc import rrc_taps
+
+# 4FSK 符号 0~3 对应的归一化频率（最大符号对应最大频偏）
+SYMBOL_LEVELS = np.array([-3, -1, 1, 3], dtype=np.float64) / 3.0
+
+# 广播源与各级干扰的默认参数（同 tx 测试脚本）：名称, 绝对频率, 符号率, 滚降, 抽头数, 功率 (dB)
+PRESETS = {
+    "BC": ("红方广播源", 433.2e6, 250e3, 0.25, 88, -60),
+    "L1": ("一级干扰", 432.2e6, 500e3, 0.25, 44, -10),
+    "L2": ("二级干扰", 432.6e6, 285e3, 0.25, 77, 10),
+    "L3": ("三级干扰", 433.2e6, 200e3, 0.25, 110, -10),
+}
+
+
+class FSKEmitter:
+    """
+    4-RRC-FSK 发射源（调制方式同 tx 测试脚本的 WaveSource / RRCFSKSource）
+    - 符号冲激按 int(k * sps) 放置，一次索引赋值完成上采样
+    - RRC 频率成形使用 StreamingFIR，抽头按参数缓存
+    - 基带 FSK 与频偏合并为一次 cumsum，相位跨块连续
+    - 输出为因果滤波结果，相对 WaveSource 的 mode="same" 滞后 fir.delay 个采样
+    """
+
+    def __init__(self, freq_offset, baud, power_db=0.0, alpha=0.25, num_taps=88, deviation=None, fs=2e6,
+                 level=None, name="", clock_ppm=0.0, freq_drift=0.0, seed=None):
+        """
+        Args:
+            freq_offset: 相对 LO 的频偏 (Hz)
+            baud: 符号率
+            power_db: 相对满量程的功率 (dB)
+            alpha / num_taps: RRC 频率成形参数
+            deviation: 最大频偏（默认等于符号率，同 WaveSource）
+            level: 标签（"L1" / "L2" / "L3"）；None 表示常开的发射源（如广播源）
+            clock_ppm: 符号时钟误差 (ppm)
+            freq_drift: 载波频偏漂移速度 (Hz/s)
+            seed: 符号随机数种子
+        """
+        self.freq_offset = freq_offset
+        self.baud = baud
+        self.amp = 10 ** (power_db / 20)
+        self.deviation = baud if deviation is None else deviation
+        self.fs = fs
+        self.level = level
+        self.name = name
+        self.clock_ppm = clock_ppm
+        self.freq_drift = freq_drift
+        self.sps = fs / (baud * (1 + clock_ppm * 1e-6))
+        taps = np.array(rrc_taps(baud, fs, alpha, num_taps))
+        self.fir = StreamingFIR(taps / np.sum(taps))  # 保持直流增益
+        self.seed = seed
+        self.reset()
+
+    def reset(self):
+        self.rng = np.random.default_rng(self.seed)
+        self.fir.reset()
+        self.phase = 0.0
+        self._n = 0  # 已生成的采样数
+        self._k = 0  # 下一个待放置的符号序号
+        self.last_symbols = np.empty(0, dtype=np.int64)  # 最近一块发送的符号 (0~3)
+        self.last_symbol_pos = np.empty(0, dtype=np.int64)  # 其冲激在该块内的位置（滤波前）
+
+    def generate(self, n):
+        """生成 n 个采样 (complex64)"""
+        n0 = self._n
+        k_end = int(np.ceil((n0 + n) / self.sps)) + 1
+        pos = (np.arange(self._k, k_end) * self.sps).astype(np.int64)
+        pos = pos[pos < n0 + n]
+        symbols = self.rng.integers(0, 4, len(pos))
+        self._k += len(pos)
+        self._n += n
+        self.last_symbols = symbols
+        self.last_symbol_pos = pos - n0
+
+        up = np.zeros(n)
+        up[pos - n0] = SYMBOL_LEVELS[symbols]
+        freq = self.deviation * self.fir.process(up)
+        freq += self.freq_offset
+        if self.freq_drift:
+            freq += self.freq_drift * (n0 + np.arange(n)) / self.fs
+
+        phase = np.cumsum(freq)
+        phase *= 2 * np.pi / self.fs
+        phase += self.phase
+        self.phase = float(np.mod(phase[-1], 2 * np.pi))
+        # 相位取模后降为单精度，实部 / 虚部分别用单精度 cos / sin 写入
+        # （比 complex64 的 np.exp 快一个数量级）
+        phase = np.mod(phase, 2 * np.pi, out=phase).astype(np.float32)
+        out = np.empty(n, dtype=np.complex64)
+        np.cos(phase, out=out.real)
+        np.sin(phase, out=out.imag)
+        out *= np.float32(self.amp)
+        return out
+
+
+def preset_emitter(level, center_freq, fs=2e6, **kwargs):
+    """按 PRESETS 创建发射源；level 为 "BC" 时为常开的广播源"""
+    name, freq, baud, alpha, num_taps, power_db = PRESETS[level]
+    params = dict(power_db=power_db, alpha=alpha, num_taps=num_taps, fs=fs,
+                  level=None if level == "BC" else level, name=name)
+    params.update(kwargs)
+    return FSKEmitter(freq - center_freq, baud, **params)
+
+
+class Synthesizer:
+    """
+    多发射源 + AWGN 的流式合成
+    - 功率均相对满量程，某发射源的 SNR = power_db - noise_db（按整个 fs 带宽计）
+    - render 按计划逐块输出 (iq, 标签)：level 为 None 的发射源常开，其余只在标签一致的块内发射
+    """
+
+    def __init__(self, emitters, fs=2e6, noise_db=-60.0, seed=None):
+        self.emitters = list(emitters)
+        self.fs = fs
+        self.noise_amp = 10 ** (noise_db / 20) / np.sqrt(2)
+        self.rng = np.random.default_rng(seed)
+
+    def noise(self, n):
+        w = self.rng.standard_normal(2 * n, dtype=np.float32).view(np.complex64)
+        w *= self.noise_amp
+        return w
+
+    def generate(self, n, label="NONE"):
+        """生成 n 个采样：常开发射源 + level 等于 label 的发射源 + 噪声"""
+        iq = self.noise(n) if self.noise_amp > 0 else np.zeros(n, dtype=np.complex64)
+        for e in self.emitters:
+            if e.level is None or e.level == label:
+                iq += e.generate(n)
+        return iq
+
+    def render(self, plan, block_size):
+        """
+        Args:
+            plan: [(标签, 块数), ...]，标签为 "NONE" / "L1" / "L2" / "L3"
+            block_size: 每块采样数
+        Yields:
+            (iq, 标签)
+        """
+        for label, num_blocks in plan:
+            for _ in range(num_blocks):
+                yield self.generate(block_size, label), label
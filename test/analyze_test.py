@@ -0,0 +1,131 @@
+import sys
+import os
+import io
+import time
+import subprocess
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dsp_benchmark import make_scenario, FS, CENTER_FREQ
+from monitor.analyze import analyze_iq_file, open_iq, TIMELINE_DTYPE
+from monitor.energy_detector import Energy_Detector, LABELS
+
+# 离线分析验证：在生成的录制文件上以 python -m monitor.analyze 方式运行，并检查判决时间线；
+# 批量判决与逐片段 detect 一致，内存占用与文件大小无关，耗时随文件长度线性增长
+
+FFT_SIZE = 4096
+BATCH_CHUNKS = 37  # 不整除片段数，覆盖末批不满的情况
+SCALES = (1, 4)  # 内存 / 耗时对比的文件长度倍数
+
+
+def write_capture(path, levels=("L1", "L3")):
+    """按顺序拼接各等级场景，写成 complex64 .iq 文件，返回每段的片段数"""
+    segments = []
+    with open(path, "wb") as f:
+        for level in levels:
+            iq = np.concatenate(make_scenario(level))
+            iq.astype(np.complex64).tofile(f)
+            segments.append((level, len(iq) // FFT_SIZE))
+    return segments
+
+
+def check_timeline(timeline, segments):
+    """每段内多数片段判为该段的等级"""
+    labels = timeline["label"]
+    assert len(labels) == sum(n for _, n in segments)
+    start = 0
+    for level, n in segments:
+        counts = np.bincount(labels[start:start + n], minlength=len(LABELS))
+        assert LABELS[int(np.argmax(counts))] == level, (level, counts)
+        start += n
+
+
+def write_repeated(path, src, times):
+    """src 文件内容重复 times 次写入 path"""
+    data = np.fromfile(src, dtype=np.complex64)
+    with open(path, "wb") as f:
+        for _ in range(times):
+            data.tofile(f)
+
+
+def quiet_analyze(path, **kwargs):
+    """运行 analyze_iq_file，丢弃其打印输出，返回 (统计, 耗时 s, tracemalloc 峰值 bytes)"""
+    tracemalloc.start()
+    try:
+        t0 = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            counts = analyze_iq_file(path, fs=FS, lo_freq=CENTER_FREQ, batch_chunks=BATCH_CHUNKS, **kwargs)
+        elapsed = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return counts, elapsed, peak
+
+
+def run_analyze_test():
+    with tempfile.TemporaryDirectory() as tmp:
+        capture = os.path.join(tmp, "capture.iq")
+        segments = write_capture(capture)
+
+        # 1. 命令行：仓库根目录下以模块方式运行
+        timeline_path = os.path.join(tmp, "timeline.npy")
+        res = subprocess.run([sys.executable, "-m", "monitor.analyze", capture, "--timeline", timeline_path,
+                              "--fs", str(FS), "--lo", str(CENTER_FREQ)],
+                             cwd=ROOT, capture_output=True, text=True)
+        assert res.returncode == 0, res.stderr
+        assert "最终判定结果" in res.stdout, res.stdout
+        timeline = np.load(timeline_path)
+        assert timeline.dtype == TIMELINE_DTYPE
+        check_timeline(timeline, segments)
+        print(f"[OK] python -m monitor.analyze: {len(timeline)} 个片段，各段判决与场景等级一致")
+
+        # 2. 函数接口：统计结果与时间线一致
+        counts = analyze_iq_file(capture, fs=FS, lo_freq=CENTER_FREQ)
+        expected = np.bincount(timeline["label"], minlength=len(LABELS))
+        assert [counts[lvl] for lvl in LABELS] == expected.tolist()
+        print("[OK] analyze_iq_file 统计与时间线一致")
+
+        # 3. 分批判决 (detect_batch) 与逐片段 detect 一致：末尾附加不足一个片段的采样点
+        with open(capture, "ab") as f:
+            np.zeros(FFT_SIZE // 3, dtype=np.complex64).tofile(f)
+        timeline_path = os.path.join(tmp, "timeline_batched.npy")
+        quiet_analyze(capture, timeline_path=timeline_path)
+        batched = np.load(timeline_path)["label"]
+        data = open_iq(capture)
+        detector = Energy_Detector(fs=FS)
+        seq = [LABELS.index(detector.detect(data[i * FFT_SIZE:(i + 1) * FFT_SIZE], CENTER_FREQ))
+               for i in range(len(data) // FFT_SIZE)]
+        assert batched.tolist() == seq
+        assert np.array_equal(batched, timeline["label"])
+        print(f"[OK] 每批 {BATCH_CHUNKS} 片段的 detect_batch 与逐片段 detect 一致 ({len(seq)} 片段)")
+
+        # 4. 内存占用与耗时：文件长度放大 SCALES 倍
+        rows = []
+        for scale in SCALES:
+            path = os.path.join(tmp, f"capture_x{scale}.iq")
+            write_repeated(path, capture, scale)
+            runs = [quiet_analyze(path) for _ in range(3)]
+            counts = runs[0][0]
+            assert sum(counts.values()) == len(open_iq(path)) // FFT_SIZE
+            rows.append((scale, os.path.getsize(path), min(r[1] for r in runs), max(r[2] for r in runs)))
+            os.remove(path)
+
+        print(f"{'倍数':>4s} {'文件 (MiB)':>10s} {'耗时 (s)':>9s} {'内存峰值 (MiB)':>14s}")
+        for scale, size, elapsed, peak in rows:
+            print(f"{scale:4d} {size / 2 ** 20:10.1f} {elapsed:9.3f} {peak / 2 ** 20:14.2f}")
+        (s1, size1, t1, p1), (s2, size2, t2, p2) = rows
+        # 内存峰值由每批片段数决定，与文件大小无关（留 25% 余量给统计对象等小分配）
+        assert p2 < 1.25 * p1 and p2 < size2 / 4, (p1, p2)
+        # 线性：放大 4 倍的文件耗时不超过 4 倍的 1.5 倍
+        assert t2 / t1 < 1.5 * s2 / s1, (t1, t2)
+        print("[OK] 内存峰值与文件大小无关，耗时随文件长度线性增长")
+
+
+if __name__ == "__main__":
+    run_analyze_test()
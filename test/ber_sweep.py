@@ -0,0 +1,188 @@
+import sys
+import os
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radio.synth import FSKEmitter, Synthesizer
+from demod.base_demod import BaseFSKDemod
+
+# SER / BER 扫描：已知符号经 4-RRC-FSK 发射 + AWGN，流式送入解调链路
+# (NCO -> RRC -> 正交鉴频 -> 定时恢复 -> 多级判决)，与发送符号对齐后统计误码率与吞吐量
+# 各 (sps, Eb/N0) 点在进程池中并行
+
+FS = 2e6
+BLOCK = 1024 * 16
+SPS_LIST = (4, 7, 10)  # main.py 中各级使用的每符号采样点数
+EBN0_DB = tuple(range(0, 22, 2))
+
+WARMUP = 200  # 判决电平收敛前的符号不计入统计
+CHUNK = 50  # 对齐分段长度（符号）
+SEARCH = 4  # 相邻分段之间允许的滑码数
+
+CHECK_EBN0 = 30  # 高 Eb/N0 检查点：各 sps 的 SER 应接近 0、无滑码
+CHECK_SER = 1e-3
+
+
+def noise_db_for(ebn0_db, sps):
+    """单位功率信号下给定 Eb/N0 对应的噪声功率 (dB，按整个 fs 带宽)：N = Es * fs / Rs / (Es/N0)"""
+    esn0_db = ebn0_db + 10 * np.log10(2)  # 每符号 2 bit
+    return 10 * np.log10(sps) - esn0_db
+
+
+def align_errors(rx, tx):
+    """
+    分段对齐后统计错误符号
+    定时恢复会丢失 / 插入符号，逐段在上一段的偏移附近搜索最佳偏移，滑码不计为误码
+    Rets:
+        (比较的符号数, 错误符号数, 错误比特数, 偏移变化次数)
+    """
+    rx = rx[WARMUP:]
+    if len(rx) < 4 * CHUNK:
+        return 0, 0, 0, 0
+
+    # 首段在大范围内搜索
+    lag = WARMUP
+    best = -1
+    first = rx[:4 * CHUNK]
+    for cand in range(max(0, WARMUP - 300), WARMUP + 300):
+        ref = tx[cand:cand + len(first)]
+        if len(ref) == len(first):
+            hits = np.count_nonzero(ref == first)
+            if hits > best:
+                best, lag = hits, cand
+
+    compared = sym_err = bit_err = slips = 0
+    for start in range(0, len(rx) - CHUNK + 1, CHUNK):
+        a = rx[start:start + CHUNK]
+        lo = max(0, lag - SEARCH)
+        hi = min(len(tx) - start - CHUNK, lag + SEARCH)
+        if hi < lo:
+            break
+        cands = np.arange(lo, hi + 1)
+        refs = tx[start + cands[:, None] + np.arange(CHUNK)]
+        errs = np.count_nonzero(refs != a, axis=1)
+        k = int(np.argmin(errs))
+        if cands[k] != lag:
+            slips += 1
+            lag = int(cands[k])
+        diff = refs[k] ^ a
+        compared += CHUNK
+        sym_err += int(errs[k])
+        bit_err += int(np.count_nonzero(diff & 1) + np.count_nonzero(diff & 2))
+    return compared, sym_err, bit_err, slips
+
+
+def run_point(sps, ebn0_db, num_symbols=20000, seed=0):
+    """一个 (sps, Eb/N0) 点：生成、流式解调、对齐统计"""
+    baud = FS / sps
+    em = FSKEmitter(0.0, baud, 0.0, fs=FS, seed=seed)
+    synth = Synthesizer([em], FS, noise_db=noise_db_for(ebn0_db, sps), seed=seed + 1)
+    demod = BaseFSKDemod(FS, 0.0, baud, sps)
+
+    tx, rx = [], []
+    elapsed = 0.0
+    for _ in range(-(-num_symbols * sps // BLOCK)):
+        iq = synth.generate(BLOCK)
+        tx.append(em.last_symbols)
+        t0 = time.perf_counter()
+        symbols = demod.demod_symbols(iq)
+        elapsed += time.perf_counter() - t0
+        if symbols is not None:
+            rx.append(symbols)
+    tx = np.concatenate(tx)
+    rx = np.concatenate(rx) if rx else np.zeros(0, dtype=np.int64)
+
+    compared, sym_err, bit_err, slips = align_errors(rx, tx)
+    return {
+        "sps": sps,
+        "ebn0_db": ebn0_db,
+        "tx_symbols": len(tx),
+        "rx_symbols": len(rx),
+        "compared": compared,
+        "ser": sym_err / compared if compared else float("nan"),
+        "ber": bit_err / (2 * compared) if compared else float("nan"),
+        "slips": slips,
+        "symbols_per_s": len(rx) / elapsed if elapsed else 0.0,
+    }
+
+
+def run_sweep(sps_list=SPS_LIST, ebn0_list=EBN0_DB, num_symbols=20000, workers=None):
+    points = [(sps, e) for sps in sps_list for e in ebn0_list]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_point, sps, e, num_symbols, seed=i) for i, (sps, e) in enumerate(points)]
+        return [f.result() for f in futures]
+
+
+def run_check(sps_list=SPS_LIST, num_symbols=20000, workers=None):
+    """高 Eb/N0 下各 sps 的 SER 接近 0、无滑码、不丢符号（定时恢复锁定）"""
+    results = run_sweep(sps_list, (CHECK_EBN0,), num_symbols, workers)
+    for r in results:
+        lost = r["tx_symbols"] - r["rx_symbols"]
+        assert r["ser"] <= CHECK_SER and r["slips"] == 0 and abs(lost) <= 2, r
+    return results
+
+
+def print_table(results):
+    print(f"{'sps':>3s} {'Eb/N0':>6s} {'SER':>9s} {'BER':>9s} {'对齐符号':>8s} {'滑码':>5s} {'丢符号':>7s} {'符号/s':>10s}")
+    for r in results:
+        lost = r["tx_symbols"] - r["rx_symbols"]
+        print(f"{r['sps']:3d} {r['ebn0_db']:6.1f} {r['ser']:9.2e} {r['ber']:9.2e} {r['compared']:8d} "
+              f"{r['slips']:5d} {lost:7d} {r['symbols_per_s']:10.0f}")
+
+
+def plot(results, path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(7, 5))
+    for sps in sorted({r["sps"] for r in results}):
+        rows = [r for r in results if r["sps"] == sps]
+        ser = [max(r["ser"], 1e-6) for r in rows]
+        ax.semilogy([r["ebn0_db"] for r in rows], ser, marker="o", label=f"sps={sps}")
+    ax.set_xlabel("Eb/N0 (dB)")
+    ax.set_ylabel("SER")
+    ax.grid(True, which="both", alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="解调链路 SER / BER 扫描")
+    parser.add_argument("--symbols", type=int, default=20000, help="每个点的符号数")
+    parser.add_argument("--sps", type=int, nargs="+", default=list(SPS_LIST))
+    parser.add_argument("--ebn0", type=float, nargs="+", default=list(EBN0_DB))
+    parser.add_argument("--workers", type=int, default=None, help="进程数（默认 CPU 核数）")
+    parser.add_argument("--json", help="结果写入 JSON")
+    parser.add_argument("--csv", help="结果写入 CSV")
+    parser.add_argument("--plot", help="SER 曲线保存为图片")
+    parser.add_argument("--check", action="store_true", help=f"只运行 Eb/N0 = {CHECK_EBN0} dB 的锁定检查")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    check = run_check(args.sps, args.symbols, args.workers)
+    print_table(check)
+    print(f"[OK] Eb/N0 = {CHECK_EBN0} dB 时各 sps 的 SER <= {CHECK_SER:g}，无滑码")
+    if args.check:
+        sys.exit(0)
+    res = run_sweep(args.sps, args.ebn0, args.symbols, args.workers)
+    print_table(res)
+    print(f"[*] {len(res)} 个点，耗时 {time.perf_counter() - t0:.1f}s")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(res, f, indent=2)
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(res[0]))
+            w.writeheader()
+            w.writerows(res)
+    if args.plot:
+        plot(res, args.plot)
@@ -0,0 +1,123 @@
+import sys
+import os
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dsp_benchmark import make_scenario, FS, DEMOD_LEVELS
+from fast_path_test import to_int16
+from dsp import kernels
+from dsp.ddc import ddc
+from dsp.rrc import rrc_filter
+from dsp.discriminator import quadrature_discriminator
+from demod.base_demod import BaseFSKDemod, BroadcastFrontend
+from dsp.symbol_sync import TimingRecovery
+from dsp.channelizer import plan_decimation
+
+# 缓冲区池 / out= 接口验证：结果与默认（每块新分配）接口一致，稳态下每块不再分配数组（tracemalloc 峰值）
+# tracemalloc 同时跟踪 Python 对象与 NumPy 数据缓冲区；视图、标量、电平统计等小对象不可避免，
+# 以单块峰值小于最小的一个每块数组（L3 每块约 1600 个符号 x 8 B）为准
+
+WARMUP = 3  # 预热块数：缓冲区池在前几块内分配完毕
+LIMIT = 8192  # 每块允许的分配峰值 (bytes)
+
+
+def block_peaks(func, blocks):
+    """逐块调用 func，返回每块的 tracemalloc 峰值增量 (bytes)"""
+    for b in blocks[:WARMUP]:
+        func(b)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for b in blocks[WARMUP:]:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            func(b)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return np.array(peaks)
+
+
+def run_buffer_pool_test():
+    kernels.warmup()
+    print(f"[*] 内核后端: {kernels.BACKEND}")
+    rows = []
+    for level, (offset, baud, sps) in DEMOD_LEVELS.items():
+        blocks = make_scenario(level)
+        raws = to_int16(blocks)
+        n = len(blocks[0])
+
+        # 抽取倍数 > 1 的等级另测信道化前端（main.py 中 CHANNELIZE 打开时的链路）
+        for decimation, single, inputs in [
+            (d, single, inputs)
+            for d in sorted({1, plan_decimation(FS, baud, sps)})
+            for single, inputs in ((False, [b.astype(np.complex128) for b in blocks]), (True, raws))
+        ]:
+            kwargs = dict(single_precision=single, decimation=decimation)
+            # 1. out= 与默认接口结果一致
+            ref, fast = BaseFSKDemod(FS, offset, baud, sps, **kwargs), BaseFSKDemod(FS, offset, baud, sps, **kwargs)
+            out = np.empty(n, dtype=np.int64)
+            for x in inputs:
+                a = ref.demod_symbols(x)
+                b = fast.demod_symbols(x, out=out)
+                assert (a is None and b is None) or (np.array_equal(a, b) and np.shares_memory(b, out))
+
+            # 2. 稳态分配：整条链路 / 仅前端（下变频 + RRC + 鉴频，只测不抽取的链路）
+            demod = BaseFSKDemod(FS, offset, baud, sps, **kwargs)
+            chain = block_peaks(lambda x: demod.demod_symbols(x, out=out), inputs)
+            allocations = demod.pool.allocations
+            block_peaks(lambda x: demod.demod_symbols(x, out=out), inputs)
+            assert demod.pool.allocations == allocations, "稳态下缓冲区池不应再分配"
+
+            frontend = sync = np.zeros(1, dtype=np.int64)
+            if decimation == 1:
+                front = BaseFSKDemod(FS, offset, baud, sps, single_precision=single)
+                bb = np.empty(n, dtype=np.complex64 if single else np.complex128)
+                freq = np.empty(n, dtype=front.disc.dtype)
+                iq = [x if not single else blocks[i] for i, x in enumerate(inputs)]
+                frontend = block_peaks(
+                    lambda x: front.disc.process(front.rrc.process(front.nco.mix(x, out=bb), out=bb), out=freq), iq)
+                assert frontend.max() < LIMIT, (level, single, frontend.max())
+
+                # 定时恢复单独测：纯 NumPy 回退路径中环路经 memoryview 读写，同样不复制数据块
+                freqs = [front.disc.process(front.rrc.process(front.nco.mix(x))).copy() for x in iq]
+                tr = TimingRecovery(FS, FS / sps)
+                sync_out = (np.empty(n), np.empty(n, dtype=np.int64))
+                sync = block_peaks(lambda f: tr.process(f, out=sync_out), freqs)
+                assert sync.max() < LIMIT, (level, single, sync.max())
+
+            # 纯 NumPy 回退路径中判决参考实现有块内临时数组，只在 JIT 内核下要求整条链路零分配
+            if kernels.BACKEND == "numba":
+                assert chain.max() < LIMIT, (level, single, decimation, chain.max())
+            name = f"{level} {'float32' if single else 'float64'}" + (f" D={decimation}" if decimation > 1 else "")
+            rows.append((name, frontend.max(), sync.max(), chain.max(), demod.pool.nbytes))
+
+    # 3. BroadcastFrontend：原地 AGC 与旧版 bb / sqrt(power) 一致
+    blocks = make_scenario("L1")
+    fe, ref = BroadcastFrontend(), BroadcastFrontend()
+    out = np.empty(len(blocks[0]), dtype=np.complex64)
+    for b in blocks[:5]:
+        bb = ref.rrc.process(b)
+        bb = bb / np.sqrt(np.mean(np.abs(bb) ** 2))
+        assert np.allclose(fe.process(b, out=out), bb, rtol=1e-4, atol=1e-5)
+    bfe = block_peaks(lambda x: fe.process(x, out=out), blocks)
+    assert bfe.max() < LIMIT, bfe.max()
+    print(f"[OK] out= 结果与默认接口一致；缓冲区池预热后不再分配，BroadcastFrontend 峰值 {bfe.max()} B")
+
+    # 4. 对比：逐块调用函数式接口（每级返回新数组）
+    offset, baud, sps = DEMOD_LEVELS["L2"]
+    functional = block_peaks(
+        lambda x: quadrature_discriminator(rrc_filter(ddc(x, FS, offset), baud, FS, 0.25, 11 * sps), FS),
+        make_scenario("L2"))
+
+    print(f"{'链路':<18s} {'前端峰值 (B)':>12s} {'定时恢复峰值 (B)':>16s} {'整条链路峰值 (B)':>16s} {'缓冲区池 (KiB)':>14s}")
+    for name, front_peak, sync_peak, chain_peak, pool_bytes in rows:
+        print(f"{name:<18s} {front_peak:12d} {sync_peak:16d} {chain_peak:16d} {pool_bytes / 1024:14.0f}")
+    print(f"函数式 ddc -> rrc_filter -> quadrature_discriminator: 每块峰值 {functional.max() / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    run_buffer_pool_test()
@@ -0,0 +1,95 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dsp_benchmark import make_scenario, FS, CENTER_FREQ, BLOCK
+from detector_eval import noise_blocks
+from radio.sim_device import SimReceiver
+from radio.synth import FSKEmitter
+from monitor.energy_detector import Energy_Detector
+from monitor.cfar import CFAR, ca_noise, os_noise
+
+# 全频带 CFAR 验证：噪声估计与逐单元参考实现一致、各级干扰与非配置频点信号的检出，以及与 detect 的耗时对比
+
+CHANNEL_TOL = 20e3  # 检出中心频率与信道频率的允许偏差 (Hz)
+
+
+def check_noise_estimates():
+    rng = np.random.default_rng(0)
+    x = rng.exponential(size=256)
+    guard, train = 3, 10
+    ref_ca = np.empty(len(x))
+    ref_os = np.empty(len(x))
+    for i in range(len(x)):
+        idx = [(i + d) % len(x) for d in range(-guard - train, guard + train + 1) if abs(d) > guard]
+        ref_ca[i] = np.mean(x[idx])
+        ref_os[i] = np.sort(x[idx])[int(0.25 * 2 * train)]
+    assert np.allclose(ca_noise(x, guard, train), ref_ca)
+    assert np.allclose(os_noise(x, guard, train, 0.25), ref_os)
+    print("[OK] CA / OS 噪声估计与逐单元参考实现一致")
+
+
+def emitters_after(blocks, detector, center_freq=CENTER_FREQ):
+    for iq in blocks:
+        state = detector.detect(iq, center_freq)
+    return state, detector.find_emitters(center_freq)
+
+
+def sim_blocks(emitters, n=3):
+    sim = SimReceiver(emitters, fs=FS, fc=CENTER_FREQ, buffer_size=BLOCK, realtime=False)
+    return [sim.read() for _ in range(n)]
+
+
+def run_cfar_test():
+    check_noise_estimates()
+
+    det = Energy_Detector(fs=FS)
+    channels = det.channels
+
+    # 1. 各级干扰场景：检出对应信道的发射源
+    for level in ("L1", "L2", "L3"):
+        state, found = emitters_after(make_scenario(level)[:3], Energy_Detector(fs=FS))
+        near = [e for e in found if e.level == level and abs(e.freq - channels[level]) < CHANNEL_TOL]
+        assert near, (level, found)
+        desc = ", ".join(f"{e.freq / 1e6:.4f}MHz/{e.bandwidth / 1e3:.0f}k/{e.snr_db:.1f}dB->{e.level}" for e in found)
+        print(f"[OK] {level} 场景 (detect={state}): {desc}")
+
+    # 2. 纯噪声：CA / OS 均无检出
+    for method in CFAR.METHODS:
+        _, found = emitters_after(noise_blocks(1)[:3], Energy_Detector(fs=FS, cfar=CFAR(method=method)))
+        assert found == [], (method, found)
+    print("[OK] 纯噪声无检出")
+
+    # 3. 非配置频点的干扰：固定频点检测看不到，CFAR 给出其位置并标注最近信道
+    state, found = emitters_after(sim_blocks([FSKEmitter(433.65e6 - CENTER_FREQ, 100e3, -10, fs=FS, seed=1)]), Energy_Detector(fs=FS))
+    assert len(found) == 1 and abs(found[0].freq - 433.65e6) < CHANNEL_TOL and found[0].level == "L3", found
+    print(f"[OK] 433.65 MHz 干扰 (detect={state}) -> {found[0].freq / 1e6:.4f} MHz，标注 {found[0].level}")
+
+    # 4. 跨越 +fs/2 的信号合并为一个发射源
+    state, found = emitters_after(sim_blocks([FSKEmitter(433.99e6 - CENTER_FREQ, 100e3, -10, fs=FS, seed=2)]), Energy_Detector(fs=FS))
+    assert len(found) == 1, found
+    print(f"[OK] 跨 ±fs/2 的信号检出为一个发射源: {found[0].freq / 1e6:.4f} MHz / {found[0].bandwidth / 1e3:.0f} kHz")
+
+    # 5. 耗时：每块 detect 之后再做 CFAR 的附加开销
+    blocks = make_scenario("L2")
+    for method in CFAR.METHODS:
+        d = Energy_Detector(fs=FS, cfar=CFAR(method=method))
+        t_detect = t_cfar = 0.0
+        for iq in blocks:
+            t0 = time.perf_counter()
+            d.detect(iq, CENTER_FREQ)
+            t1 = time.perf_counter()
+            d.find_emitters(CENTER_FREQ)
+            t_cfar += time.perf_counter() - t1
+            t_detect += t1 - t0
+        n = len(blocks)
+        print(f"[{method.upper()}] detect {t_detect / n * 1e3:.3f} ms/块，CFAR {t_cfar / n * 1e3:.3f} ms/块 "
+              f"({t_cfar / t_detect * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    run_cfar_test()
@@ -0,0 +1,82 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dsp_benchmark import make_scenario, FS, CENTER_FREQ, BLOCK, DURATION
+from signal_gen import generate_signal
+from monitor.energy_detector import Energy_Detector, LABELS
+from monitor.evaluate import evaluate, print_report, truth_from_segments
+
+# 判决状态机验证：批量与逐块判决一致，以及不同迟滞 / 驻留参数下的离线评估表
+
+# 默认不做跨块 Welch 平均；"avg 0.5" 单独列出跨块平均的影响（会把单块突发拖长若干块）
+SETTINGS = {
+    "avg 0.5": {"avg_alpha": 0.5},
+    "no avg": {},
+    "vote 2/3": {"avg_alpha": None, "history_len": 3, "hit_threshold": 2},
+    "vote 2/3 + hyst 3dB": {"avg_alpha": None, "history_len": 3, "hit_threshold": 2, "hysteresis_db": 3.0},
+    "vote 3/5 + dwell 4": {"avg_alpha": None, "history_len": 5, "hit_threshold": 3, "min_dwell": 4},
+}
+
+
+def noise_blocks(seed):
+    np.random.seed(seed)
+    iq = generate_signal(FS, DURATION, CENTER_FREQ, broadcast=False, jam_level=None)
+    iq = (iq / np.max(np.abs(iq))).astype(np.complex64)
+    return [iq[i * BLOCK:(i + 1) * BLOCK] for i in range(len(iq) // BLOCK)]
+
+
+def make_capture():
+    """噪声中夹杂单块一级干扰突发（真值仍为 NONE），随后为持续的一级、三级干扰"""
+    l1 = make_scenario("L1")
+    l3 = make_scenario("L3")
+    quiet = noise_blocks(1) + noise_blocks(2)
+    for i in range(5, len(quiet), 12):
+        quiet[i] = l1[i % len(l1)]
+    blocks = quiet + l1 + noise_blocks(3) + l3 + noise_blocks(4)
+    truth = truth_from_segments([("NONE", len(quiet)), ("L1", len(l1)), ("NONE", 30), ("L3", len(l3)),
+                                 ("NONE", 30)])
+    return np.concatenate(blocks), truth
+
+
+def check_batch_matches_detect(data):
+    # 关闭跨调用平均、每次输入一个 FFT 长度时，detect 与 detect_batch 的功率谱相同
+    kwargs = {"history_len": 4, "hit_threshold": 2, "hysteresis_db": 2.0, "min_dwell": 3, "avg_alpha": None}
+    n = 4096
+    chunks = data[:len(data) // n * n].reshape(-1, n)
+    a = Energy_Detector(fs=FS, **kwargs)
+    b = Energy_Detector(fs=FS, **kwargs)
+    seq = [a.detect(c, CENTER_FREQ) for c in chunks]
+    labels = []
+    for i in range(0, len(chunks), 100):  # 分批调用，状态跨批延续
+        lab, _ = b.detect_batch(chunks[i:i + 100], CENTER_FREQ)
+        labels.extend(lab.tolist())
+    assert seq == [LABELS[x] for x in labels]
+    print(f"[OK] detect_batch 与逐片段 detect 一致 ({len(chunks)} 片段)")
+
+
+def run_detector_eval():
+    data, truth = make_capture()
+    check_batch_matches_detect(data)
+
+    results = evaluate(data, truth, SETTINGS, BLOCK, CENTER_FREQ, FS)
+    print_report(results)
+
+    base = results["no avg"]
+    voted = results["vote 2/3"]
+    # 跨块平均不应作为默认：虚警率高于逐块独立判决
+    assert Energy_Detector(fs=FS).avg_alpha is None
+    assert results["avg 0.5"]["false_alarm"] > base["false_alarm"]
+    # 单块突发在默认参数下会触发切换，多帧投票后应被抑制
+    assert base["false_alarm"] > 0 and voted["false_alarm"] < base["false_alarm"]
+    assert voted["switches"] < base["switches"]
+    for name, r in results.items():
+        assert r["missed"] == 0, (name, r)
+    print("[OK] 多帧投票抑制单块突发，所有持续干扰段均被检出")
+
+
+if __name__ == "__main__":
+    run_detector_eval()
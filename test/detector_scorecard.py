@@ -0,0 +1,201 @@
+import sys
+import os
+import json
+import time
+import argparse
+import itertools
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radio.synth import Synthesizer, preset_emitter
+from monitor.energy_detector import Energy_Detector, LABELS
+
+# 检测器记分卡：在 SNR / 干扰功率 / 频偏网格上生成带标签的数据块，批量检测后
+# 输出混淆矩阵、各级检测概率曲线与检测耗时，每次改动检测器都按准确率与开销一起评估
+
+FS = 2e6
+CENTER_FREQ = 433e6
+NOISE_DB = -60.0
+
+# 默认网格
+BC_SNRS = (-10.0, 0.0, 10.0)  # 广播源相对噪声的功率 (dB，按整个 fs 带宽)
+JAM_SNRS = (-20.0, -10.0, 0.0, 10.0, 20.0, 30.0)  # 干扰相对噪声的功率 (dB)
+OFFSETS = (0.0, 20e3, 50e3, 100e3)  # 干扰偏离配置频点 (Hz)
+
+# 待比较的检测器参数（detect_batch 逐块独立计算功率谱，avg_alpha 只在 --sequential 时有效）
+SETTINGS = {
+    "default": {},
+    "vote 2/3": {"history_len": 3, "hit_threshold": 2},
+    "vote 2/3 + hyst 3dB": {"history_len": 3, "hit_threshold": 2, "hysteresis_db": 3.0},
+}
+
+
+def scenario_grid(levels=("L1", "L2", "L3"), bc_snrs=BC_SNRS, jam_snrs=JAM_SNRS, offsets=OFFSETS):
+    """[(标签, 广播 SNR, 干扰 SNR, 频偏), ...]；无干扰场景只随广播 SNR 变化"""
+    grid = [("NONE", bc, None, 0.0) for bc in bc_snrs]
+    grid += [(lvl, bc, js, off) for lvl, bc, js, off in itertools.product(levels, bc_snrs, jam_snrs, offsets)]
+    return grid
+
+
+def render_scenario(label, bc_snr, jam_snr, offset, num_blocks, block_size, seed=0):
+    """生成一个场景的 (num_blocks, block_size) 数据块，标签恒定"""
+    emitters = [preset_emitter("BC", CENTER_FREQ, FS, power_db=NOISE_DB + bc_snr, seed=seed)]
+    if label != "NONE":
+        jam = preset_emitter(label, CENTER_FREQ, FS, power_db=NOISE_DB + jam_snr, seed=seed + 1)
+        jam.freq_offset += offset
+        emitters.append(jam)
+    synth = Synthesizer(emitters, FS, noise_db=NOISE_DB, seed=seed + 2)
+    return synth.generate(num_blocks * block_size, label).reshape(num_blocks, block_size)
+
+
+def score_blocks(detector, blocks, truth, center_freq=CENTER_FREQ, batch=True):
+    """
+    对一组数据块判决
+    Rets:
+        confusion: 4x4 混淆矩阵（行为真值、列为判决，顺序同 LABELS）
+        elapsed: 每次检测调用的耗时 (s)，批量时为单块平均
+    """
+    confusion = np.zeros((len(LABELS), len(LABELS)), dtype=np.int64)
+    if batch:
+        t0 = time.perf_counter()
+        labels, _ = detector.detect_batch(blocks, center_freq)
+        elapsed = np.full(len(blocks), (time.perf_counter() - t0) / max(len(blocks), 1))
+    else:
+        labels = np.empty(len(blocks), dtype=np.uint8)
+        elapsed = np.empty(len(blocks))
+        for i, iq in enumerate(blocks):
+            t0 = time.perf_counter()
+            labels[i] = LABELS.index(detector.detect(iq, center_freq))
+            elapsed[i] = time.perf_counter() - t0
+    np.add.at(confusion, (truth, labels), 1)
+    return confusion, elapsed
+
+
+def run_scorecard(settings=SETTINGS, grid=None, num_blocks=32, block_size=4096, batch=True):
+    """
+    Rets:
+        {设置名: {"confusion", "pd", "latency_us"}}
+        pd: {等级: {干扰 SNR: 检测概率}}（所有广播 SNR / 频偏取平均）
+    """
+    grid = scenario_grid() if grid is None else grid
+    scenarios = [(g, render_scenario(*g, num_blocks, block_size, seed=i)) for i, g in enumerate(grid)]
+    n_total = len(scenarios) * num_blocks
+
+    results = {}
+    for name, kwargs in settings.items():
+        confusion = np.zeros((len(LABELS), len(LABELS)), dtype=np.int64)
+        hits = {}
+        latency = []
+        for (label, bc_snr, jam_snr, offset), blocks in scenarios:
+            detector = Energy_Detector(fs=FS, fft_size=block_size, **kwargs)
+            truth = np.full(num_blocks, LABELS.index(label), dtype=np.uint8)
+            c, elapsed = score_blocks(detector, blocks, truth, batch=batch)
+            confusion += c
+            latency.append(elapsed)
+            if label != "NONE":
+                h = hits.setdefault(label, {}).setdefault(jam_snr, [0, 0])
+                h[0] += c[LABELS.index(label), LABELS.index(label)]
+                h[1] += num_blocks
+        latency = np.concatenate(latency) * 1e6
+        results[name] = {
+            "blocks": n_total,
+            "confusion": confusion.tolist(),
+            "accuracy": float(np.trace(confusion) / confusion.sum()),
+            "false_alarm": float(1 - confusion[0, 0] / max(confusion[0].sum(), 1)),
+            "pd": {lvl: {js: h[0] / h[1] for js, h in sorted(d.items())} for lvl, d in hits.items()},
+            "latency_us": {
+                "p50": float(np.percentile(latency, 50)),
+                "p99": float(np.percentile(latency, 99)),
+                "mean": float(np.mean(latency)),
+            },
+        }
+    return results
+
+
+def score_capture(path, truth, settings=SETTINGS, block_size=4096, batch=True):
+    """
+    回放 complex64 .iq 采集文件，按逐块真值评分
+    truth: 每 block_size 个采样一个标签 (uint8，对应 LABELS)，或 analyze.py 时间线 .npy 的路径（取 label 字段）
+    """
+    data = np.memmap(path, dtype=np.complex64, mode="r")
+    if isinstance(truth, str):
+        truth = np.load(truth)
+        truth = truth["label"] if truth.dtype.names else truth
+    n = min(len(data) // block_size, len(truth))
+    blocks = np.asarray(data[:n * block_size]).reshape(n, block_size)
+    truth = np.asarray(truth[:n], dtype=np.uint8)
+
+    results = {}
+    for name, kwargs in settings.items():
+        detector = Energy_Detector(fs=FS, fft_size=block_size, **kwargs)
+        confusion, elapsed = score_blocks(detector, blocks, truth, batch=batch)
+        latency = elapsed * 1e6
+        results[name] = {
+            "blocks": n,
+            "confusion": confusion.tolist(),
+            "accuracy": float(np.trace(confusion) / max(confusion.sum(), 1)),
+            "false_alarm": float(1 - confusion[0, 0] / max(confusion[0].sum(), 1)),
+            "pd": {},
+            "latency_us": {
+                "p50": float(np.percentile(latency, 50)),
+                "p99": float(np.percentile(latency, 99)),
+                "mean": float(np.mean(latency)),
+            },
+        }
+    return results
+
+
+def print_scorecard(results):
+    for name, r in results.items():
+        lat = r["latency_us"]
+        print(f"===== {name}: {r['blocks']} 块，准确率 {r['accuracy']:.3f}，虚警率 {r['false_alarm']:.3f}，"
+              f"检测耗时 p50 {lat['p50']:.1f} us / p99 {lat['p99']:.1f} us")
+        print("真值\\判决 " + " ".join(f"{lab:>6s}" for lab in LABELS))
+        for lab, row in zip(LABELS, r["confusion"]):
+            print(f"{lab:>9s} " + " ".join(f"{v:6d}" for v in row))
+        for lvl, curve in r["pd"].items():
+            print(f"  Pd[{lvl}] " + "  ".join(f"{js:+.0f}dB:{pd:.2f}" for js, pd in curve.items()))
+
+
+def plot_pd(results, path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    levels = sorted({lvl for r in results.values() for lvl in r["pd"]})
+    fig, axes = plt.subplots(1, len(levels), figsize=(5 * len(levels), 4), squeeze=False)
+    for ax, lvl in zip(axes[0], levels):
+        for name, r in results.items():
+            curve = r["pd"].get(lvl, {})
+            ax.plot(list(curve), list(curve.values()), marker="o", label=name)
+        ax.set_title(f"Pd {lvl}")
+        ax.set_xlabel("jammer SNR (dB)")
+        ax.set_ylim(-0.05, 1.05)
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="检测器记分卡")
+    parser.add_argument("--blocks", type=int, default=32, help="每个场景的数据块数")
+    parser.add_argument("--sequential", action="store_true", help="逐块调用 detect（默认 detect_batch）")
+    parser.add_argument("--capture", help="回放 .iq 采集文件（需同时给出 --truth）")
+    parser.add_argument("--truth", help="逐块真值：uint8 标签或 analyze.py 时间线 .npy")
+    parser.add_argument("--json", help="结果写入 JSON")
+    parser.add_argument("--plot", help="检测概率曲线保存为图片")
+    args = parser.parse_args()
+
+    if args.capture:
+        res = score_capture(args.capture, args.truth, batch=not args.sequential)
+    else:
+        res = run_scorecard(num_blocks=args.blocks, batch=not args.sequential)
+    print_scorecard(res)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(res, f, indent=2, ensure_ascii=False, default=str)
+    if args.plot:
+        plot_pd(res, args.plot)
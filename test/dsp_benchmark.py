@@ -0,0 +1,171 @@
+import sys
+import os
+import json
+import time
+import platform
+import argparse
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from signal_gen import generate_signal
+from tx_2_signals_test import WaveSource
+from monitor.energy_detector import Energy_Detector
+from dsp.ddc import ddc
+from dsp.rrc import rrc_filter
+from dsp.discriminator import quadrature_discriminator
+from dsp.symbol_sync import pll_function
+from dsp.multi_level_decision import multi_level_decision
+from demod.base_demod import BaseFSKDemod
+
+# DSP 吞吐量基准：逐级计时 + 全链路计时，可与 JSON 基线比较
+# 基线与机器相关，不入库：--baseline 指定路径（不存在或 --update 时写入，否则比较），不指定时只打印结果
+
+FS = 2e6
+CENTER_FREQ = 433e6
+BLOCK = 1024 * 16
+DURATION = 0.25  # 每个场景的信号时长 (s)
+
+# 广播源与各级干扰（参数同 tx_2_signals_test.py）
+BROADCAST = ("红方广播源", 433.2e6 - CENTER_FREQ, 250e3, 0.25, 88, -60)
+JAMS = {
+    "L1": ("一级干扰", 432.2e6 - CENTER_FREQ, 500e3, 0.25, 44, -10),
+    "L2": ("二级干扰", 432.6e6 - CENTER_FREQ, 285e3, 0.25, 77, 10),
+    "L3": ("三级干扰", 433.2e6 - CENTER_FREQ, 200e3, 0.25, 110, -10),
+}
+# 各级解调参数（同 main.py）
+DEMOD_LEVELS = {
+    "L1": (-1.3e6, 500e3, 4),
+    "L2": (-0.9e6, 285e3, 7),
+    "L3": (0, 200e3, 10),
+}
+
+
+def make_scenario(level):
+    """广播源 + 指定等级干扰 + generate_signal 噪声底，按块切分"""
+    np.random.seed(0)
+    iq = generate_signal(FS, DURATION, CENTER_FREQ, broadcast=False, jam_level=None)
+    iq = iq + WaveSource(*BROADCAST, fs=FS).generate(DURATION)
+    iq = iq + WaveSource(*JAMS[level], fs=FS).generate(DURATION)
+    iq = (iq / np.max(np.abs(iq))).astype(np.complex64)
+    n = len(iq) // BLOCK
+    return [iq[i * BLOCK:(i + 1) * BLOCK] for i in range(n)]
+
+
+def time_stage(func, inputs, repeat):
+    """对每块依次调用 func，取 repeat 次中最快的一次"""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for x in inputs:
+            func(x)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_scenario(level, repeat):
+    blocks = make_scenario(level)
+    num_samples = len(blocks) * BLOCK
+    # 逐级计时使用该等级的解调参数（同 BaseFSKDemod：RRC 11 * sps 抽头，定时恢复符号率 fs / sps）
+    offset, baud, sps = DEMOD_LEVELS[level]
+    rs = FS / sps
+
+    # 预先准备各级输入，使每一级单独计时
+    baseband = [ddc(b, FS, offset) for b in blocks]
+    filtered = [rrc_filter(b, baud, FS, 0.25, 11 * sps) for b in baseband]
+    freq_dev = [quadrature_discriminator(b, FS) for b in filtered]
+    synced = [pll_function(f, FS, rs) for f in freq_dev]
+
+    detector = Energy_Detector(fs=FS)
+
+    def full_chain(b, demod=BaseFSKDemod(FS, offset, baud, sps=sps)):
+        detector.detect(b, CENTER_FREQ)
+        demod.process(b)
+
+    stages = {
+        "detect": (lambda b: detector.detect(b, CENTER_FREQ), blocks),
+        "ddc": (lambda b: ddc(b, FS, offset), blocks),
+        "rrc_filter": (lambda b: rrc_filter(b, baud, FS, 0.25, 11 * sps), baseband),
+        "quadrature_discriminator": (lambda b: quadrature_discriminator(b, FS), filtered),
+        "pll_function": (lambda f: pll_function(f, FS, rs), freq_dev),
+        "multi_level_decision": (multi_level_decision, synced),
+        "full_chain": (full_chain, blocks),
+    }
+
+    results = {}
+    for name, (func, inputs) in stages.items():
+        elapsed = time_stage(func, inputs, repeat)
+        results[name] = {
+            "msps": num_samples / elapsed / 1e6,
+            "rt_factor": num_samples / FS / elapsed,  # >1 表示快于实时
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """返回低于基线 (1 - tolerance) 倍的条目列表"""
+    regressions = []
+    for scen, stages in results.items():
+        for stage, r in stages.items():
+            ref = baseline.get("results", {}).get(scen, {}).get(stage)
+            if ref is None:
+                continue
+            ratio = r["msps"] / ref["msps"]
+            r["vs_baseline"] = ratio
+            if ratio < 1 - tolerance:
+                regressions.append((scen, stage, ratio))
+    return regressions
+
+
+def run_benchmark(baseline_path=None, update=False, tolerance=0.2, repeat=3, levels=("L1", "L2", "L3")):
+    results = {level: bench_scenario(level, repeat) for level in levels}
+
+    print(f"{'场景':4s} {'阶段':26s} {'MS/s':>8s} {'实时倍数':>8s} {'对比基线':>8s}")
+    baseline = None
+    if baseline_path is not None and os.path.exists(baseline_path) and not update:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, tolerance) if baseline else []
+
+    for scen, stages in results.items():
+        for stage, r in stages.items():
+            vs = f"{r['vs_baseline']:7.2f}x" if "vs_baseline" in r else "      -"
+            print(f"{scen:4s} {stage:26s} {r['msps']:8.2f} {r['rt_factor']:8.2f} {vs:>8s}")
+
+    if baseline_path is None:
+        return 0
+    if baseline is None:
+        record = {
+            "meta": {
+                "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "block": BLOCK,
+                "fs": FS,
+            },
+            "results": results,
+        }
+        with open(baseline_path, "w") as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+        print(f"[*] 基线已写入 {baseline_path}")
+        return 0
+
+    if regressions:
+        print(f"[!] 以下条目低于基线 {(1 - tolerance) * 100:.0f}%：")
+        for scen, stage, ratio in regressions:
+            print(f"    {scen} {stage}: {ratio:.2f}x")
+        return 1
+    print(f"[OK] 全部条目不低于基线 {(1 - tolerance) * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DSP 吞吐量基准")
+    parser.add_argument("--baseline", help="基线 JSON 路径（不指定时只打印结果）")
+    parser.add_argument("--update", action="store_true", help="重新记录基线")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的吞吐量下降比例")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(run_benchmark(args.baseline, args.update, args.tolerance, args.repeat))
@@ -0,0 +1,118 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dsp_benchmark import make_scenario, FS, CENTER_FREQ, BLOCK, DEMOD_LEVELS
+from dsp.utils import int16_to_complex64
+from dsp.rrc import rrc_filter
+from dsp.discriminator import quadrature_discriminator
+from monitor.energy_detector import Energy_Detector
+from demod.base_demod import BaseFSKDemod
+from radio.ring_buffer import IQRingBuffer
+
+# 单精度快速路径验证：int16 原始数据 -> complex64 环形缓冲 -> float32 检测 / complex64 解调，
+# 判决结果与双精度路径一致
+
+
+def to_int16(blocks, full_scale=2047):
+    """按 Pluto 12 bit ADC 量化为 I/Q 交织的 int16"""
+    out = []
+    for b in blocks:
+        raw = np.empty(2 * len(b), dtype=np.int16)
+        raw[0::2] = np.round(b.real * full_scale)
+        raw[1::2] = np.round(b.imag * full_scale)
+        out.append(raw)
+    return out
+
+
+def best_time(func, inputs, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for x in inputs:
+            func(x)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_fast_path_test():
+    # 1. int16 -> complex64 一次转换，环形缓冲写入时直接转换
+    raw = np.arange(-8, 8, dtype=np.int16)
+    iq = int16_to_complex64(raw)
+    assert iq.dtype == np.complex64 and np.array_equal(iq, raw[0::2] + 1j * raw[1::2])
+    ring = IQRingBuffer(block_size=BLOCK)
+    cur = ring.cursor("t")
+    raw = np.random.randint(-2048, 2048, 2 * BLOCK).astype(np.int16)
+    ring.write(raw)
+    assert np.array_equal(cur.read(), int16_to_complex64(raw))
+    print("[OK] int16 交织数据写入环形缓冲时直接转换为 complex64")
+
+    # 2. 各级 dtype 保持单精度
+    b = int16_to_complex64(raw)
+    assert rrc_filter(b, 250e3, FS, 0.25, 88).dtype == np.complex64
+    assert quadrature_discriminator(b, FS).dtype == np.float32
+    demod = BaseFSKDemod(FS, *DEMOD_LEVELS["L2"], single_precision=True)
+    bb = demod.rrc.process(demod.nco.mix(b))
+    assert bb.dtype == np.complex64 and demod.disc.process(bb).dtype == np.float32
+    print("[OK] rrc_filter / NCO / RRCFilter / 鉴频器全程 complex64 / float32")
+
+    # 3. 合成场景：检测判决与双精度路径一致
+    total, same = 0, 0
+    for level in ("L1", "L2", "L3"):
+        blocks = make_scenario(level)
+        raws = to_int16(blocks)
+        ref_det = Energy_Detector(fs=FS)
+        fast_det = Energy_Detector(fs=FS, dtype=np.float32)
+        ref = [ref_det.detect(int16_to_complex64(r).astype(np.complex128), CENTER_FREQ) for r in raws]
+        fast = [fast_det.detect(r, CENTER_FREQ) for r in raws]
+        total += len(ref)
+        same += sum(a == b for a, b in zip(ref, fast))
+        assert ref == fast, (level, ref, fast)
+
+        chunks = np.stack([int16_to_complex64(r) for r in raws])[:, :4096]
+        ref_lb, _ = Energy_Detector(fs=FS, avg_alpha=None).detect_batch(chunks.astype(np.complex128), CENTER_FREQ)
+        fast_lb, _ = Energy_Detector(fs=FS, avg_alpha=None, dtype=np.float32).detect_batch(chunks, CENTER_FREQ)
+        assert np.array_equal(ref_lb, fast_lb)
+
+        # 解调：同一份量化数据上单精度与双精度的符号一致率
+        offset, baud, sps = DEMOD_LEVELS[level]
+        d64 = BaseFSKDemod(FS, offset, baud, sps)
+        d32 = BaseFSKDemod(FS, offset, baud, sps, single_precision=True)
+        s64 = [d64.demod_symbols(int16_to_complex64(r).astype(np.complex128)) for r in raws]
+        s32 = [d32.demod_symbols(r) for r in raws]
+        # 定时环路逐符号推进，两种精度的插值位置有微小差别，块边界附近的符号可能落在相邻块（至多差 1 个）
+        counts64 = np.array([0 if s is None else len(s) for s in s64])
+        counts32 = np.array([0 if s is None else len(s) for s in s32])
+        assert np.abs(counts64 - counts32).max() <= 1 and abs(counts64.sum() - counts32.sum()) <= 1
+        s64 = np.concatenate([s for s in s64 if s is not None])
+        s32 = np.concatenate([s for s in s32 if s is not None])
+        n = min(len(s64), len(s32))
+        agree = np.mean(s64[:n] == s32[:n])
+        print(f"[OK] {level}: 检测判决 {len(ref)} 块全部一致；解调符号一致率 {agree:.4f} ({n} 符号)")
+        # 场景中的干扰与 DEMOD_LEVELS 的频偏并不重合，链路多数时间在判决噪声；判决反馈定时会把两种精度的
+        # 舍入差别带入采样时刻，一致率以 98% 为限
+        assert agree > 0.98
+
+    # 4. 耗时：双精度（complex128 输入）vs 单精度（int16 输入）
+    blocks = make_scenario("L2")
+    raws = to_int16(blocks)
+    c128 = [int16_to_complex64(r).astype(np.complex128) for r in raws]
+    ref_det, fast_det = Energy_Detector(fs=FS), Energy_Detector(fs=FS, dtype=np.float32)
+    d64 = BaseFSKDemod(FS, *DEMOD_LEVELS["L2"])
+    d32 = BaseFSKDemod(FS, *DEMOD_LEVELS["L2"], single_precision=True)
+    for name, f64, f32 in [
+        ("detect", lambda x: ref_det.detect(x, CENTER_FREQ), lambda x: fast_det.detect(x, CENTER_FREQ)),
+        ("demod", d64.process, d32.process),
+    ]:
+        t64 = best_time(f64, c128)
+        t32 = best_time(f32, raws)
+        n = len(raws) * BLOCK
+        print(f"{name:7s}: float64 {n / t64 / 1e6:6.2f} MS/s, float32 {n / t32 / 1e6:6.2f} MS/s ({t64 / t32:.2f}x)")
+
+
+if __name__ == "__main__":
+    run_fast_path_test()
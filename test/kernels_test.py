@@ -0,0 +1,160 @@
+import sys
+import os
+import json
+import time
+import subprocess
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dsp import kernels
+from dsp.symbol_sync import TimingRecovery, timing_loop, acquire
+from dsp.multi_level_decision import slice_symbols
+from demod.base_demod import BaseFSKDemod
+from radio.synth import FSKEmitter, Synthesizer
+
+# 加速内核验证：JIT 版本与参考实现逐点一致（随机数据 + 解调链路真实数据），并给出逐块耗时对比
+# 整条链路另起子进程以 DSP_KERNELS=numpy 运行参考实现，两边符号序列必须完全相同
+
+FS = 2e6
+BLOCK = 1024 * 16
+SPS = 8
+CHAIN_BLOCKS = 40
+
+
+def chain_symbols(num_blocks=CHAIN_BLOCKS):
+    """合成 4-RRC-FSK + 噪声，流式解调，返回 (符号, 每块耗时 us)"""
+    baud = FS / SPS
+    synth = Synthesizer([FSKEmitter(0.0, baud, 0.0, fs=FS, seed=1)], FS, noise_db=-15, seed=2)
+    demod = BaseFSKDemod(FS, 0.0, baud, SPS)
+    blocks = [synth.generate(BLOCK) for _ in range(num_blocks)]
+    kernels.warmup()
+    out, elapsed = [], []
+    for iq in blocks:
+        t0 = time.perf_counter()
+        symbols = demod.demod_symbols(iq)
+        elapsed.append(time.perf_counter() - t0)
+        if symbols is not None:
+            out.append(symbols)
+    return np.concatenate(out), np.array(elapsed[1:]) * 1e6
+
+
+def chain_in_subprocess(backend):
+    """以指定后端在子进程中运行 chain_symbols"""
+    env = dict(os.environ, DSP_KERNELS=backend)
+    res = subprocess.run([sys.executable, os.path.abspath(__file__), "--chain"], env=env,
+                         capture_output=True, text=True, check=True)
+    symbols, median_us = json.loads(res.stdout.strip().splitlines()[-1])
+    return np.array(symbols), median_us
+
+
+def bench(func, args, repeat=200):
+    func(*args)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        func(*args)
+    return (time.perf_counter() - t0) / repeat * 1e6
+
+
+def loop_args(freq, levels=None, t=None, power=None):
+    """一块鉴频输出对应的 timing_loop 输入（捕获同 TimingRecovery.process），输出缓冲区除外"""
+    tr = TimingRecovery(FS, FS / SPS)
+    t0, levels0, power0 = acquire(freq, tr.sps, tr.acquire_symbols)
+    return (freq, 0, t0 if t is None else t, len(freq) - 3, float(tr.sps), tr.sps,
+            power0 if power is None else power, levels0 if levels is None else levels, tr.gain, tr.level_alpha)
+
+
+def call_loop(func, args, as_view=False):
+    """调用 timing_loop（电平复制一份），返回 (样本, 位置, 电平, 状态)；as_view 时按 _run_loop 的方式传入 memoryview"""
+    y, levels = args[0], np.array(args[7], dtype=np.float64)
+    samples, index = np.empty(len(args[0])), np.empty(len(args[0]), dtype=np.int64)
+    if as_view:
+        count, *state = func(memoryview(y), *args[1:7], memoryview(levels), *args[8:],
+                             memoryview(samples), memoryview(index))
+    else:
+        count, *state = func(y, *args[1:7], levels, *args[8:], samples, index)
+    return samples[:count], index[:count], levels, state
+
+
+def live_signatures():
+    """warmup() 后单 / 双精度解调链路各跑几块，返回 (预热后的签名数, 运行后的签名数)"""
+    kernels.warmup()
+    funcs = (timing_loop, slice_symbols)
+    before = [len(f.signatures) for f in funcs]
+    synth = Synthesizer([FSKEmitter(0.0, FS / SPS, 0.0, fs=FS, seed=5)], FS, noise_db=-15, seed=6)
+    for single in (False, True):
+        demod = BaseFSKDemod(FS, 0.0, FS / SPS, SPS, single_precision=single)
+        for _ in range(3):
+            iq = synth.generate(BLOCK)
+            demod.process(iq.astype(np.complex64) if single else iq)
+    return before, [len(f.signatures) for f in funcs]
+
+
+def run_kernels_test():
+    rng = np.random.default_rng(0)
+    print(f"[*] 内核后端: {kernels.BACKEND}")
+
+    # 0. 预热覆盖实时路径的全部签名：单精度链路的第一块数据不再触发编译
+    if kernels.BACKEND == "numba":
+        before, after = live_signatures()
+        assert before == after, (before, after)
+        print(f"[OK] warmup() 已编译单 / 双精度链路用到的全部签名 (timing_loop {after[0]}, slice_symbols {after[1]})")
+
+    # 1. slice_symbols：随机电平 / 电平数，包含正好落在门限上的样本
+    ref = kernels.reference(slice_symbols)
+    for _ in range(50):
+        levels = np.sort(rng.normal(size=rng.integers(2, 7)))
+        x = rng.normal(size=3000)
+        x[:len(levels) - 1] = (levels[:-1] + levels[1:]) / 2
+        s0, c0 = ref(x, levels, np.empty(len(x), np.int64), np.empty(len(x)))
+        s1, c1 = slice_symbols(x, levels, np.empty(len(x), np.int64), np.empty(len(x)))
+        assert np.array_equal(s0, s1) and np.allclose(c0, c1, rtol=0, atol=1e-12)
+    print("[OK] slice_symbols 与参考实现一致（含门限边界样本）")
+
+    # 2. timing_loop：单 / 双精度鉴频数据，捕获得到的状态与随机状态
+    ref = kernels.reference(timing_loop)
+    chain = BaseFSKDemod(FS, 0.0, FS / SPS, SPS)
+    synth = Synthesizer([FSKEmitter(0.0, FS / SPS, 0.0, fs=FS, seed=3)], FS, noise_db=-15, seed=4)
+    freq = chain.disc.process(chain.rrc.process(chain.nco.mix(synth.generate(BLOCK)))).copy()
+    cases = [loop_args(freq)]
+    for _ in range(10):
+        cases.append(loop_args(freq, levels=np.sort(rng.normal(size=rng.integers(2, 6))) * 3e4,
+                               t=float(rng.uniform(1, 20)), power=float(rng.uniform(0, 1e7))))
+    for args in cases:
+        for dtype in (np.float32, np.float64):
+            args = (args[0].astype(dtype),) + args[1:]
+            s0, i0, l0, state0 = call_loop(ref, args, as_view=True)
+            s1, i1, l1, state1 = call_loop(timing_loop, args, as_view=kernels.BACKEND != "numba")
+            assert np.array_equal(i0, i1) and np.allclose(s0, s1, rtol=1e-12, atol=1e-6)
+            assert np.allclose(l0, l1, rtol=1e-12) and np.allclose(state0, state1, rtol=1e-9)
+    print(f"[OK] timing_loop 与参考实现一致（{len(cases)} 组状态，单 / 双精度）")
+
+    # 3. 逐块耗时
+    levels = np.array([-0.75, -0.25, 0.25, 0.75])
+    x = rng.normal(size=BLOCK // SPS)
+    sym_args = (x, levels, np.empty(len(x), np.int64), np.empty(len(x)))
+    args = loop_args(freq)
+    rows = [
+        ("slice_symbols", bench(kernels.reference(slice_symbols), sym_args), bench(slice_symbols, sym_args)),
+        ("timing_loop", bench(lambda: call_loop(kernels.reference(timing_loop), args, as_view=True), (), 50),
+         bench(lambda: call_loop(timing_loop, args, as_view=kernels.BACKEND != "numba"), (), 50)),
+    ]
+
+    # 4. 整条解调链路：当前后端 vs 子进程中的参考实现
+    symbols, chain_us = chain_symbols()
+    ref_symbols, ref_us = chain_in_subprocess("numpy")
+    assert np.array_equal(symbols, ref_symbols), "解调链路符号序列与参考实现不一致"
+    print(f"[OK] 解调链路 {len(symbols)} 个符号与 DSP_KERNELS=numpy 子进程完全一致")
+    rows.append(("BaseFSKDemod 链路", ref_us, float(np.median(chain_us))))
+
+    print(f"{'内核':<18s} {'numpy (us/块)':>14s} {kernels.BACKEND + ' (us/块)':>14s} {'加速比':>7s}")
+    for name, t_ref, t_fast in rows:
+        print(f"{name:<18s} {t_ref:14.1f} {t_fast:14.1f} {t_ref / t_fast:6.1f}x")
+
+
+if __name__ == "__main__":
+    if "--chain" in sys.argv:
+        s, t = chain_symbols()
+        print(json.dumps([s.tolist(), float(np.median(t))]))
+    else:
+        run_kernels_test()
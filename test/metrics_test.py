@@ -0,0 +1,142 @@
+import sys
+import os
+import json
+import time
+import threading
+import urllib.request
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dsp_benchmark import make_scenario, FS, CENTER_FREQ, DEMOD_LEVELS
+from tools.metrics import LatencyHistogram, Metrics, MetricsServer, span
+from monitor.energy_detector import Energy_Detector
+from demod.base_demod import BaseFSKDemod
+from radio.ring_buffer import IQRingBuffer
+
+# 埋点验证：直方图分位数精度与固定内存、快照 / HTTP / 文件输出、记录与快照并发，以及对全链路吞吐量的开销 (<1%)
+
+OVERHEAD_RUNS = 21  # 开销对比的重复次数（取中位数）
+
+
+def run_pass(det, demod, blocks, metrics, parity):
+    """
+    监测 + L2 解调全链路处理一遍 blocks，逐块交替开关埋点（序号与 parity 同奇偶的块埋点），
+    同一组对象、相邻数据块之间比较，抵消内存布局与频率漂移；返回每块耗时
+    """
+    elapsed = np.empty(len(blocks))
+    for k, b in enumerate(blocks):
+        m = metrics if k % 2 == parity else None
+        demod.instrument(m, "L2")
+        t0 = time.perf_counter()
+        with span(m, "main.detect", len(b)):
+            det.detect(b, CENTER_FREQ)
+        demod.process(b)
+        elapsed[k] = time.perf_counter() - t0
+    return elapsed
+
+
+def record_concurrently(m, threads=4, per_thread=20000):
+    """多个线程持续记录，主线程同时 snapshot(reset=True)，返回各快照中的 (次数, 采样数) 合计"""
+    def worker(i):
+        for _ in range(per_thread):
+            m.record(f"t{i % 2}", 1e-4, 3)
+            m.observe("v", 1.0)
+
+    def take():
+        snap = m.snapshot(reset=True)
+        return (sum(st["count"] for st in snap["stages"].values()),
+                sum(round(st["samples_per_s"] * snap["window_s"]) for st in snap["stages"].values()),
+                sum(v["count"] for v in snap["values"].values()))
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # 频繁切换线程，放大记录与快照交错的机会
+    try:
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        for t in pool:
+            t.start()
+        totals = []
+        while any(t.is_alive() for t in pool):
+            totals.append(take())
+        for t in pool:
+            t.join()
+        totals.append(take())
+    finally:
+        sys.setswitchinterval(interval)
+    return tuple(int(x) for x in np.sum(totals, axis=0))
+
+
+def run_metrics_test():
+    # 1. 直方图：分位数相对误差不超过 1%，桶数固定
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(np.log(2e-3), 0.8, 200000)
+    h = LatencyHistogram()
+    for v in values:
+        h.record(v)
+    for q, est in zip((50, 99, 99.9), h.percentiles((50, 99, 99.9))):
+        ref = np.percentile(values, q)
+        assert abs(est / ref - 1) < 0.011, (q, est, ref)
+    print(f"[OK] 直方图 {h.num_buckets} 个桶（固定内存），p50 / p99 / p99.9 相对误差 < 1%")
+
+    # 2. 快照、文件与 HTTP 输出，数据龄
+    m = Metrics()
+    ring = IQRingBuffer(block_size=1024)
+    cur = ring.cursor("t")
+    ring.write(np.zeros(1024, dtype=np.complex64))
+    time.sleep(0.01)
+    cur.read()
+    m.observe("t.buffer_age_ms", cur.age() * 1e3)
+    for _ in range(100):
+        with m.span("stage", 1000):
+            time.sleep(0.0005)
+    m.drop("stage", 3)
+    m.add_source("ring", ring.stats)
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_metrics.json")
+    server = MetricsServer(m, interval=0.2, path=path, port=0).start()
+    time.sleep(0.3)
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/") as resp:
+        snap = json.load(resp)
+    server.stop()
+    with open(path) as f:
+        assert json.load(f)["stages"]["stage"]["count"] == 100
+    os.remove(path)
+    st = snap["stages"]["stage"]
+    assert st["count"] == 100 and 0.5 <= st["p50_ms"] < 5 and snap["drops"]["stage"] == 3
+    assert snap["values"]["t.buffer_age_ms"]["max"] >= 10 and snap["sources"]["ring"]["written"] == 1
+    print(f"[OK] HTTP / 文件快照: p50 {st['p50_ms']:.3f} ms, p99 {st['p99_ms']:.3f} ms, "
+          f"{st['samples_per_s']:.0f} 采样/s, 数据龄 {snap['values']['t.buffer_age_ms']['max']:.1f} ms")
+
+    # 3. 记录与 snapshot(reset=True) 并发：每条记录恰好计入一个快照
+    n = 4 * 20000
+    for _ in range(3):
+        count, samples, values = record_concurrently(Metrics())
+        assert count == n and samples == 3 * n and values == n, (count, samples, values)
+    print(f"[OK] {n} 条并发记录与 reset 快照交错，无丢失 / 重复")
+
+    # 4. 开销：同一条链路逐块交替开关埋点，同一数据块埋点 / 不埋点耗时比的中位数
+    blocks = make_scenario("L2")
+    det, demod = Energy_Detector(fs=FS), BaseFSKDemod(FS, *DEMOD_LEVELS["L2"])
+    m = Metrics()
+    run_pass(det, demod, blocks, m, 0)
+    even = np.arange(len(blocks)) % 2 == 0
+    ratios, per_block = [], []
+    for _ in range(OVERHEAD_RUNS):
+        a, b = run_pass(det, demod, blocks, m, 0), run_pass(det, demod, blocks, m, 1)
+        inst, bare = np.where(even, a, b), np.where(even, b, a)
+        ratios.append(inst / bare)
+        per_block.append(bare)
+    overhead = float(np.median(np.concatenate(ratios))) - 1
+    snap = m.snapshot()
+
+    print(f"{'阶段':16s} {'次数':>6s} {'p50(ms)':>8s} {'p99(ms)':>8s} {'MS/s':>7s}")
+    for name, st in snap["stages"].items():
+        busy_rate = st["samples_per_s"] / max(st["busy"], 1e-12) / 1e6  # 该阶段自身的处理速率
+        print(f"{name:16s} {st['count']:6d} {st['p50_ms']:8.3f} {st['p99_ms']:8.3f} {busy_rate:7.2f}")
+    print(f"全链路每块 {np.median(per_block) * 1e3:.3f} ms，埋点实测开销 {overhead * 100:+.2f}% "
+          f"({OVERHEAD_RUNS} 轮 x {len(blocks)} 块耗时比的中位数)")
+    assert overhead < 0.01, overhead
+
+if __name__ == "__main__":
+    run_metrics_test()
@@ -4,8 +4,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from monitor import energy_detector_7
+from monitor.energy_detector import Energy_Detector
 from signal_gen import generate_signal
 
 # 解决中文显示问题
@@ -43,7 +44,7 @@ def run_debug_test():
         
         # 2. 执行检测 (为了获取中间变量，我们手动重复部分逻辑或打印)
         # 获取 PSD 数据用于绘图
-        monitor = energy_detector_7.Energy_Detector(fs=FS)
+        monitor = Energy_Detector(fs=FS)
         freqs, psd = monitor.compute_psd(iq)
         # 将频率转为相对于中心频率的绝对频率，单位 MHz
         abs_freqs = (freqs + CENTER_FREQ) / 1e6
@@ -0,0 +1,178 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dsp_benchmark import make_scenario, FS, CENTER_FREQ, BLOCK, DURATION, DEMOD_LEVELS
+from signal_gen import generate_signal
+from radio.file_input import FileReceiver
+from radio.ring_buffer import IQRingBuffer
+from monitor.energy_detector import Energy_Detector
+from demod.worker_pool import WorkerPool
+from orchestrator import Orchestrator
+
+# asyncio 主控验证（文件回放）：状态切换顺序、检测 -> 切换延迟上界、慢检测不拖住读取、旧块丢弃与优雅关闭；
+# 检测异常时其余任务退出、接收端卡死时按超时或 stop() 结束
+
+SWITCH_HOLD = 3
+
+
+def noise_blocks():
+    np.random.seed(1)
+    iq = generate_signal(FS, DURATION, CENTER_FREQ, broadcast=False, jam_level=None)
+    iq = (iq / np.max(np.abs(iq))).astype(np.complex64)
+    return [iq[i * BLOCK:(i + 1) * BLOCK] for i in range(len(iq) // BLOCK)]
+
+
+class SlowDetector(Energy_Detector):
+    """每次检测额外耗时 delay 秒，并记录调用次数与最大并发数"""
+
+    def __init__(self, delay, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def detect(self, iq, center_freq, debug=False):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            time.sleep(self.delay)
+            return super().detect(iq, center_freq, debug)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+class FailingDetector(Energy_Detector):
+    """第 fail_at 次检测抛出异常"""
+
+    def __init__(self, fail_at, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def detect(self, iq, center_freq, debug=False):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise RuntimeError("detector failed")
+        return super().detect(iq, center_freq, debug)
+
+
+class HangingReceiver:
+    """读取 blocks 块后 read() 永久阻塞（模拟失去响应的设备）"""
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.num_blocks = blocks
+        self.iq = np.zeros(BLOCK, dtype=np.complex64)
+        self._never = threading.Event()
+
+    def read(self):
+        if self.blocks == 0:
+            self._never.wait()
+        self.blocks -= 1
+        time.sleep(BLOCK / FS)
+        return self.iq
+
+
+def run_once(path, detector, stop_after=None, src=None, **kwargs):
+    if src is None:
+        src = FileReceiver(path, fs=FS, buffer_size=BLOCK, realtime=True, loop=False)
+    ring = IQRingBuffer(block_size=BLOCK)
+    pool = WorkerPool(ring, DEMOD_LEVELS, FS, switch_hold=SWITCH_HOLD, verbose=False)
+    pool.start()
+    orch = Orchestrator(src, detector, pool, ring, CENTER_FREQ, **kwargs)
+
+    async def main():
+        if stop_after is not None:
+            asyncio.get_running_loop().call_later(stop_after, orch.stop)
+        return await orch.run()
+
+    t0 = time.perf_counter()
+    try:
+        stats = asyncio.run(main())
+    finally:
+        pool.stop()
+    elapsed = time.perf_counter() - t0
+    return orch, stats, elapsed, src.num_blocks
+
+
+def run_orchestrator_test():
+    # 回放文件：噪声 -> 一级干扰 -> 三级干扰 -> 噪声
+    segments = [noise_blocks(), make_scenario("L1"), make_scenario("L3"), noise_blocks()]
+    path = os.path.join(tempfile.mkdtemp(), "switch.iq")
+    np.concatenate([np.concatenate(s) for s in segments]).tofile(path)
+    block_time = BLOCK / FS
+
+    # 1. 正常速度：切换顺序与延迟上界
+    orch, stats, elapsed, num_blocks = run_once(path, Energy_Detector(fs=FS))
+    states = [s for _, s in orch.events]
+    assert states == ["L1", "L3", "NONE"], states
+    assert stats["blocks"] == stats["detected"] == num_blocks and stats["overruns"] == 0
+    bound = 2 * block_time
+    assert stats["switch_latency_ms"]["max"] < bound * 1e3, stats
+    print(f"[OK] 切换顺序 {states}，检测 -> 切换延迟 p50 {stats['switch_latency_ms']['p50']:.2f} ms / "
+          f"最大 {stats['switch_latency_ms']['max']:.2f} ms（上界 {bound * 1e3:.1f} ms）")
+
+    # 2. 检测慢于实时：读取不受影响，按块数丢弃旧块
+    orch, stats, elapsed, num_blocks = run_once(path, SlowDetector(2 * block_time, fs=FS))
+    expected = num_blocks * block_time
+    assert stats["blocks"] == num_blocks and stats["overruns"] > 0
+    assert elapsed < expected + 0.2, (elapsed, expected)
+    print(f"[OK] 慢检测：读取 {stats['blocks']} 块耗时 {elapsed:.2f}s (回放时长 {expected:.2f}s)，"
+          f"检测 {stats['detected']} 块，丢弃 {stats['overruns']} 块")
+
+    # 3. 旧块在提交检测前丢弃；已提交的检测全部完成，检测器从不并发运行
+    detector = SlowDetector(0.05, fs=FS)
+    orch, stats, _, _ = run_once(path, detector, max_block_age=0.02, stop_after=0.5)
+    assert stats["stale"] > 0 and stats["detected"] > 0
+    assert detector.calls == stats["detected"] and detector.max_running == 1, (detector.calls, stats)
+    assert stats["detected"] + stats["overruns"] + stats["stale"] == stats["blocks"]
+    print(f"[OK] 丢弃旧块 {stats['stale']} 个，检测 {stats['detected']} 块（无被放弃的检测调用）")
+
+    # 4. 优雅关闭：提前 stop()，队列中已读的块全部处理完再退出
+    orch, stats, elapsed, num_blocks = run_once(path, Energy_Detector(fs=FS), stop_after=0.3)
+    assert stats["blocks"] < num_blocks
+    assert stats["detected"] + stats["overruns"] + stats["stale"] == stats["blocks"]
+    print(f"[OK] 提前关闭：{elapsed:.2f}s 内读取 {stats['blocks']} 块，全部检测完毕后退出")
+
+    # 5. 检测抛出异常：其余任务被取消，run() 抛出原异常而不是挂起
+    t0 = time.perf_counter()
+    try:
+        run_once(path, FailingDetector(5, fs=FS))
+        raise AssertionError("检测异常未抛出")
+    except RuntimeError as e:
+        assert str(e) == "detector failed", e
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 2.0, elapsed
+    print(f"[OK] 检测异常：{elapsed:.2f}s 内取消其余任务并抛出")
+
+    # 6. 接收端卡死：读取超时后按读取结束处理，已读的块检测完毕
+    orch, stats, elapsed, num_blocks = run_once(None, Energy_Detector(fs=FS), src=HangingReceiver(10),
+                                                read_timeout=0.2)
+    assert stats["read_timeouts"] == 1 and stats["blocks"] == num_blocks, stats
+    assert stats["detected"] + stats["overruns"] + stats["stale"] == stats["blocks"]
+    assert elapsed < 1.0, elapsed
+    print(f"[OK] 接收端卡死：读取超时 {stats['read_timeouts']} 次，{elapsed:.2f}s 后退出")
+
+    # 7. 不设读取超时时 stop() 也能结束卡住的读取
+    orch, stats, elapsed, num_blocks = run_once(None, Energy_Detector(fs=FS), src=HangingReceiver(10),
+                                                read_timeout=None, stop_after=0.3)
+    assert stats["read_timeouts"] == 0 and stats["blocks"] == num_blocks, stats
+    assert elapsed < 1.0, elapsed
+    print(f"[OK] 读取卡住时 stop()：{elapsed:.2f}s 后退出")
+
+
+if __name__ == "__main__":
+    run_orchestrator_test()
@@ -0,0 +1,52 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radio.pluto_input import PlutoReceiver
+
+# PlutoReceiver.read_raw 验证：有 / 没有 pyadi 内部接口 _rx_buffered_data 时输出相同的 I/Q 交织 int16
+
+BLOCK = 1024 * 16
+
+
+class FakeSdr:
+    """rx() 与 pyadi 相同：把逐通道 int16 缓冲转成 complex128"""
+
+    def __init__(self, seed=0):
+        rng = np.random.default_rng(seed)
+        self.i = rng.integers(-2048, 2048, BLOCK).astype(np.int16)
+        self.q = rng.integers(-2048, 2048, BLOCK).astype(np.int16)
+
+    def rx(self):
+        return self.i + 1j * self.q
+
+
+class FakeBufferedSdr(FakeSdr):
+    def _rx_buffered_data(self):
+        return [self.i, self.q]
+
+
+def receiver(sdr):
+    # 不连接设备，只替换 sdr
+    rx = PlutoReceiver.__new__(PlutoReceiver)
+    rx.sdr = sdr
+    rx.raw = True
+    return rx
+
+
+def run_pluto_raw_test():
+    sdr = FakeSdr()
+    expected = np.empty(2 * BLOCK, dtype=np.int16)
+    expected[0::2] = sdr.i
+    expected[1::2] = sdr.q
+
+    for fake in (FakeBufferedSdr(), FakeSdr()):
+        raw = receiver(fake).read()
+        assert raw.dtype == np.int16 and np.array_equal(raw, expected), type(fake).__name__
+    print("[OK] read_raw：内部缓冲与 rx() 回退路径输出相同的 I/Q 交织 int16")
+
+
+if __name__ == "__main__":
+    run_pluto_raw_test()
@@ -0,0 +1,81 @@
+import sys
+import os
+import time
+import threading
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from demod.base_demod import BaseFSKDemod
+from demod.demod_worker import DemodWorker
+from demod.process_worker import ProcessDemodWorker
+
+# 解调后端吞吐量对比：线程 vs 进程，三路信道同时解调
+
+FS = 2e6
+BLOCK = 1024 * 16
+NUM_BLOCKS = 120
+
+CHANNELS = {
+    "L1": (-1.0e6, 500e3, 4),
+    "L2": (-0.6e6, 285e3, 7),
+    "L3": (0.0, 200e3, 10),
+}
+
+
+class ReplaySource:
+    """按 read() 接口重复返回同一数据块，共 num_blocks 次；go 置位前不返回数据（计时不含启动）"""
+
+    def __init__(self, iq, num_blocks, go):
+        self.iq = iq
+        self.remaining = num_blocks
+        self.go = go
+
+    def read(self):
+        if self.remaining <= 0 or not self.go.is_set():
+            return None
+        self.remaining -= 1
+        return self.iq
+
+
+def run_backend(worker_class, iq, **kwargs):
+    workers = []
+    go = threading.Event()
+    for name, (offset, baud, sps) in CHANNELS.items():
+        demod = BaseFSKDemod(FS, offset, baud, sps=sps)
+        workers.append(worker_class(name, demod, ReplaySource(iq, NUM_BLOCKS, go), verbose=False, **kwargs))
+
+    for w in workers:
+        w.start()
+    t0 = time.perf_counter()
+    go.set()
+    while any(w.blocks + getattr(w, "dropped", 0) < NUM_BLOCKS for w in workers):
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - t0
+
+    stats = {w.name: (w.blocks, getattr(w, "dropped", 0)) for w in workers}
+    for w in workers:
+        w.stop()
+    return elapsed, stats
+
+
+def run_benchmark():
+    np.random.seed(0)
+    iq = (np.random.randn(BLOCK) + 1j * np.random.randn(BLOCK)).astype(np.complex64)
+    total = NUM_BLOCKS * BLOCK
+
+    print("===== 解调后端吞吐量 (3 路信道) =====")
+    print(f"CPU 核数: {os.cpu_count()}")
+    backends = [
+        ("thread ", DemodWorker, {}),
+        # 离线基准中让读取端等待空闲槽，保证两种后端处理相同的数据量
+        ("process", ProcessDemodWorker, {"drop_when_full": False}),
+    ]
+    for label, cls, kwargs in backends:
+        elapsed, stats = run_backend(cls, iq, **kwargs)
+        print(f"{label}: {elapsed:6.2f}s  每路 {total / elapsed / 1e6:6.2f} MS/s  "
+              f"实时倍数 x{total / FS / elapsed:5.2f}  (处理/丢弃: {stats})")
+
+
+if __name__ == "__main__":
+    run_benchmark()
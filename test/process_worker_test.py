@@ -0,0 +1,97 @@
+import sys
+import os
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from demod.process_worker import ProcessDemodWorker
+
+# 多进程解调后端验证：spawn 启动、暂停 / 恢复后解调器与组帧器按代号同步复位、stop() 等线程与子进程退出后才释放共享内存
+
+BLOCK = 1024
+CYCLES = 20
+
+
+class StubDemod:
+    """每块输出 8 个符号，符号值 = 复位次数 % 4；delay 模拟解调耗时，使恢复时仍有旧代号的块在途"""
+
+    def __init__(self, delay=0.002):
+        self.delay = delay
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+    def process(self, iq):
+        time.sleep(self.delay)
+        r = self.resets % 4
+        return np.tile(np.array([r >> 1, r & 1], dtype=np.uint8), 8)
+
+
+class StubParser:
+    """检查每个符号都与自身复位次数一致：组帧器与子进程中的解调器复位次数相同"""
+
+    def __init__(self):
+        self.resets = 0
+        self.symbols = 0
+        self.mismatches = 0
+
+    def reset(self):
+        self.resets += 1
+
+    def process(self, symbols):
+        self.symbols += len(symbols)
+        self.mismatches += int(np.count_nonzero(symbols != self.resets % 4))
+        return []
+
+
+class Source:
+    def __init__(self):
+        self.iq = np.zeros(BLOCK, dtype=np.complex64)
+
+    def read(self):
+        return self.iq
+
+    def seek_latest(self):
+        pass
+
+
+def run_process_worker_test():
+    # 1. spawn 启动；暂停 / 恢复交替，恢复前的结果不混入复位后的组帧器
+    parser = StubParser()
+    w = ProcessDemodWorker("T", StubDemod(), Source(), num_slots=4, block_size=BLOCK, verbose=False, parser=parser)
+    w.start()
+    assert type(w._proc).__name__ == "SpawnProcess", type(w._proc)
+    for _ in range(CYCLES):
+        time.sleep(0.02)
+        w.pause()
+        time.sleep(0.005)
+        w.resume()
+    time.sleep(0.05)
+    w.stop()
+    assert parser.symbols > 0 and parser.mismatches == 0, (parser.symbols, parser.mismatches)
+    assert 0 < parser.resets <= CYCLES, parser.resets
+    print(f"[OK] {CYCLES} 次暂停 / 恢复：组帧器复位 {parser.resets} 次，{parser.symbols} 个符号全部属于当前代号")
+
+    # 2. 子进程处理慢时 stop() 等在途块处理完、线程退出后才释放共享内存
+    w = ProcessDemodWorker("S", StubDemod(delay=0.3), Source(), num_slots=2, block_size=BLOCK, verbose=False)
+    w.start()
+    time.sleep(0.05)
+    shm_name = w._shm.name
+    t0 = time.perf_counter()
+    w.stop()
+    elapsed = time.perf_counter() - t0
+    assert not w._feeder.is_alive() and not w._collector.is_alive() and w._proc is None
+    assert w.blocks >= 1
+    try:
+        shared_memory.SharedMemory(name=shm_name).close()
+        raise AssertionError("共享内存未释放")
+    except FileNotFoundError:
+        pass
+    print(f"[OK] stop() 耗时 {elapsed:.2f}s：送数 / 收集线程与子进程均已退出后释放共享内存（处理 {w.blocks} 块）")
+
+
+if __name__ == "__main__":
+    run_process_worker_test()
@@ -0,0 +1,171 @@
+import sys
+import os
+import json
+import time
+import socket
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from communication.report_system import ReportSystem, UDPTransport, TCPTransport, FileTransport
+from protocol.parser import Frame
+
+# 上报系统验证：UDP / TCP / 文件三种发送端、队列满时的丢弃策略、慢速发送端下 report 调用不阻塞、
+# 无法编码的记录计入丢弃、发送线程退出后才关闭发送端
+
+UDP_MAX_LOSS = 0.1  # UDP 不保证送达：本机回环下允许的最大丢失比例
+
+
+class UDPCollector(threading.Thread):
+    """本地 UDP 收集端（替代真实上级系统）"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self.records = []
+        self.running = True
+
+    def run(self):
+        while self.running:
+            try:
+                data, _ = self.sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            self.records += [json.loads(line) for line in data.decode().splitlines()]
+
+
+class TCPCollector(threading.Thread):
+    """本地 TCP 收集端"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.srv.bind(("127.0.0.1", 0))
+        self.srv.listen(1)
+        self.port = self.srv.getsockname()[1]
+        self.data = b""
+
+    def run(self):
+        conn, _ = self.srv.accept()
+        while True:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            self.data += chunk
+        conn.close()
+
+
+class SlowTransport:
+    """每批耗时 delay 秒的发送端，模拟阻塞的网络"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.records = 0
+        self.closed = False
+
+    def send(self, data):
+        assert not self.closed, "发送端已关闭"
+        time.sleep(self.delay)
+        self.records += data.count(b"\n")
+
+    def close(self):
+        self.closed = True
+
+
+def frame(i):
+    return Frame(i, bytes([i % 256]) * 8, 0)
+
+
+def run_report_system_test():
+    # 1. UDP：发送计数准确，接收端只检查丢失有界、收到的记录内容正确
+    col = UDPCollector()
+    col.start()
+    rep = ReportSystem(UDPTransport("127.0.0.1", col.port), batch_size=32).start()
+    for i in range(1000):
+        rep.report_frame("L1", frame(i))
+    rep.report_state("L2", snr=12.5)
+    rep.stop()
+    time.sleep(0.3)
+    col.running = False
+    assert rep.stats()["sent"] == 1001 and rep.stats()["send_errors"] == 0
+    assert (1 - UDP_MAX_LOSS) * 1001 <= len(col.records) <= 1001, len(col.records)
+    frames = [r for r in col.records if r["type"] == "frame"]
+    assert all(r["payload"] == frame(r["position"]).payload.hex() for r in frames)
+    assert all(r["state"] == "L2" and r["snr"] == 12.5 for r in col.records if r["type"] == "state")
+    print(f"[OK] UDP: 接收 {len(col.records)} / 1001 条, {rep.stats()}")
+
+    # 2. TCP
+    col = TCPCollector()
+    col.start()
+    rep = ReportSystem(TCPTransport("127.0.0.1", col.port)).start()
+    for i in range(500):
+        rep.report_state(f"L{i % 3 + 1}")
+    rep.stop()
+    col.join(timeout=2.0)
+    assert len(col.data.splitlines()) == 500
+    print(f"[OK] TCP: {rep.stats()}")
+
+    # 3. 文件
+    path = os.path.join(tempfile.mkdtemp(), "report.jsonl")
+    rep = ReportSystem(FileTransport(path)).start()
+    for i in range(300):
+        rep.report_frame("L3", frame(i))
+    rep.stop()
+    with open(path) as f:
+        assert [json.loads(line)["position"] for line in f] == list(range(300))
+    print(f"[OK] 文件: {rep.stats()}")
+
+    # 4. 丢弃策略（不启动发送线程，队列必然写满）
+    for policy, kept in [("drop_oldest", list(range(90, 100))), ("drop_newest", list(range(10)))]:
+        rep = ReportSystem(SlowTransport(0), max_queue=10, policy=policy)
+        for i in range(100):
+            rep.report_frame("L1", frame(i))
+        assert [r["position"] for r in rep._queue] == kept
+        assert rep.stats()["dropped"] == 90
+    print("[OK] drop_oldest 保留最新记录，drop_newest 保留最早记录")
+
+    # 5. 无法编码为 JSON 的记录计入丢弃，同批其余记录照常发送
+    slow = SlowTransport(0)
+    rep = ReportSystem(slow).start()
+    rep.report_state("L1")
+    rep.report_state("L2", extra={1, 2})
+    rep.report_state("L3", snr=float("nan"))  # allow_nan 默认开启，可以编码
+    rep.stop()
+    s = rep.stats()
+    assert s["queued"] == 3 and s["dropped"] == 1 and s["sent"] == 2 and slow.records == 2, s
+    print(f"[OK] 无法编码的记录计入丢弃: {s}")
+
+    # 6. stop() 超时：发送端保持打开，直到线程发完当前批次后自行关闭
+    slow = SlowTransport(0.5)
+    rep = ReportSystem(slow, flush_interval=0.01).start()
+    rep.report_state("L1")
+    time.sleep(0.1)
+    assert not rep.stop(timeout=0.05) and not slow.closed
+    rep._thread.join()
+    assert slow.closed and rep.stats()["sent"] == 1 and rep.stats()["send_errors"] == 0
+    print("[OK] stop() 超时时不关闭发送中的发送端，线程退出后关闭")
+
+    # 7. 慢速发送端：report 调用耗时不受发送阻塞影响
+    slow = SlowTransport(0.05)
+    rep = ReportSystem(slow, max_queue=256, batch_size=64).start()
+    worst = 0.0
+    t_end = time.perf_counter() + 1.0
+    n = 0
+    while time.perf_counter() < t_end:
+        t0 = time.perf_counter()
+        rep.report_frame("L1", frame(n))
+        worst = max(worst, time.perf_counter() - t0)
+        n += 1
+    rep.stop()
+    s = rep.stats()
+    assert s["queued"] == n and s["sent"] + s["dropped"] == n
+    print(f"[OK] 慢速发送端：{n} 次 report，最大单次耗时 {worst * 1e6:.0f} us，"
+          f"发送 {s['sent']} 条 / {s['batches']} 批，丢弃 {s['dropped']} 条")
+
+
+if __name__ == "__main__":
+    run_report_system_test()
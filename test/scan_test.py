@@ -0,0 +1,73 @@
+import sys
+import os
+import itertools
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radio.sim_device import SimReceiver
+from radio.synth import preset_emitter
+from radio.scanner import ScanScheduler
+from monitor.scan_monitor import ScanMonitor
+
+# 多 LO 扫描验证：重调后锁定数据被丢弃、各 LO 独立检测，以及仿真设备上的重调耗时与重访周期
+
+FS = 2e6
+BLOCK = 1024 * 16
+LO_A = 432.7e6  # 覆盖 431.7 ~ 433.7 MHz（一、二级干扰频点）
+LO_B = 434.2e6  # 覆盖 433.2 ~ 435.2 MHz
+
+
+def make_device(realtime=False, retune_delay=0.002, settle_buffers=1):
+    emitters = [
+        preset_emitter("L1", LO_A, fs=FS, seed=1),  # 一级干扰
+        preset_emitter("L2", LO_A, fs=FS, seed=2),  # 二级干扰
+    ]
+    return SimReceiver(emitters, fs=FS, fc=LO_A, buffer_size=BLOCK, retune_delay=retune_delay,
+                       settle_buffers=settle_buffers, realtime=realtime)
+
+
+def run_plan(settle_blocks, num_blocks=60):
+    sim = make_device()
+    sched = ScanScheduler(sim, [(LO_A, 0.02), (LO_B, 0.02)], settle_blocks=settle_blocks)
+    mon = ScanMonitor(sched.los, FS, avg_alpha=None)  # 不做跨块平均，逐块反映输入
+    states = {LO_A: [], LO_B: []}
+    for block in itertools.islice(sched.scan(), num_blocks):
+        states[block.lo].append(mon.process(block))
+    return sim, sched, states
+
+
+def run_scan_test():
+    # 1. 驻留换算、标注与锁定数据丢弃
+    sim, sched, states = run_plan(settle_blocks=1)
+    assert sched.plan == [(LO_A, 3), (LO_B, 3)]  # 20 ms / 8.192 ms 向上取整
+    assert sched.discarded == sim.settling_blocks == sim.retunes
+    assert set(states[LO_A]) <= {"L1", "L2"} and len(states[LO_A]) == 30
+    assert set(states[LO_B]) == {"NONE"}
+    print(f"[OK] 丢弃 {sched.discarded} 块锁定数据；LO_A 判决 {sorted(set(states[LO_A]))}，LO_B 全部 NONE")
+
+    # 2. 对照：不丢弃锁定数据时，切回 LO_A 的首块仍是 LO_B 的数据，干扰被漏检
+    _, _, states = run_plan(settle_blocks=0)
+    missed = states[LO_A].count("NONE")
+    assert missed > 0
+    print(f"[OK] 对照：不丢弃锁定数据时 LO_A 漏检 {missed}/{len(states[LO_A])} 块")
+
+    # 3. 实时仿真：重调耗时与重访周期
+    print(f"{'驻留(块)':>8s} {'LO数':>4s} {'重调(ms)':>9s} {'重访实测(ms)':>12s} {'重访理论(ms)':>12s}")
+    block_time = BLOCK / FS
+    for dwell_blocks, los in [(1, [LO_A, LO_B]), (4, [LO_A, LO_B]), (2, [LO_A, LO_B, 433.7e6])]:
+        sim = make_device(realtime=True)
+        plan = [(lo, dwell_blocks * block_time) for lo in los]
+        sched = ScanScheduler(sim, plan, settle_blocks=1)
+        for _ in itertools.islice(sched.scan(), dwell_blocks * len(los) * 6):
+            pass
+        s = sched.stats()
+        expected = len(los) * (sim.retune_delay + (dwell_blocks + 1) * block_time) * 1e3
+        measured = np.mean(list(s["revisit_ms"].values()))
+        print(f"{dwell_blocks:8d} {len(los):4d} {s['retune_ms']:9.2f} {measured:12.1f} {expected:12.1f}")
+        # 实测包含仿真设备合成数据的耗时，略高于理论值
+        assert abs(measured - expected) < 0.3 * expected
+
+
+if __name__ == "__main__":
+    run_scan_test()
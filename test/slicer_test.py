@@ -0,0 +1,73 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dsp.multi_level_decision import multi_level_decision, MultiLevelSlicer
+
+# 四电平判决验证：向量化结果与旧版逐点循环一致；流式判决器跨块跟踪漂移电平
+
+
+def legacy_multi_level_decision(synced_samples):
+    """旧版排序 + 逐点循环实现，仅作为等价性与耗时参考"""
+    sorted_samples = np.sort(synced_samples)
+    n = len(sorted_samples)
+    estimated_levels = sorted_samples[[int(n * i / 4) for i in range(4)]]
+    thresholds = (estimated_levels[:-1] + estimated_levels[1:]) / 2
+    symbols = np.zeros_like(synced_samples, dtype=int)
+    for i, sample in enumerate(synced_samples):
+        if sample < thresholds[0]:
+            symbols[i] = 0
+        elif sample < thresholds[1]:
+            symbols[i] = 1
+        elif sample < thresholds[2]:
+            symbols[i] = 2
+        else:
+            symbols[i] = 3
+    return symbols, estimated_levels
+
+
+def run_slicer_test():
+    np.random.seed(0)
+
+    # 1. 与旧版一致
+    for n in [1, 3, 100, 2047]:
+        x = np.random.randn(n)
+        ref_sym, ref_lv = legacy_multi_level_decision(x)
+        sym, lv = multi_level_decision(x)
+        assert np.array_equal(ref_sym, sym) and np.array_equal(ref_lv, lv)
+    sym, lv = multi_level_decision([])
+    assert len(sym) == 0 and len(lv) == 0
+    print("[OK] multi_level_decision 与旧版逐点实现一致，空输入同样返回二元组")
+
+    # 2. 电平漂移 + 符号分布不均时的跟踪
+    levels = np.array([-3, -1, 1, 3]) * 1e5
+    slicer = MultiLevelSlicer()
+    ser_slicer, ser_block = [], []
+    for k in range(50):
+        p = [0.4, 0.1, 0.1, 0.4] if k % 2 else [0.25] * 4
+        tx = np.random.choice(4, 2000, p=p)
+        x = levels[tx] + k * 2e3 + 3e4 * np.random.randn(2000)
+        sym, conf = slicer.process(x)
+        ser_slicer.append(np.mean(sym != tx))
+        ser_block.append(np.mean(multi_level_decision(x)[0] != tx))
+    print(f"[OK] 平均误符号率: 流式判决器 {np.mean(ser_slicer):.4f} / 逐块分位点 {np.mean(ser_block):.4f}")
+    print(f"     跟踪电平: {np.round(slicer.levels / 1e3, 1)} kHz, 平均置信度 {conf.mean():.2f}")
+
+    # 3. 耗时
+    x = np.random.randn(20000)
+    for name, func, rep in [
+        ("旧版逐点循环", legacy_multi_level_decision, 3),
+        ("multi_level_decision", multi_level_decision, 30),
+        ("MultiLevelSlicer", slicer.process, 30),
+    ]:
+        t0 = time.perf_counter()
+        for _ in range(rep):
+            func(x)
+        print(f"{name:22s}: {(time.perf_counter() - t0) / rep * 1e3:7.3f} ms / 20000 样本")
+
+
+if __name__ == "__main__":
+    run_slicer_test()
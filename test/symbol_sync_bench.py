@@ -0,0 +1,129 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ber_sweep import align_errors
+from demod.base_demod import BaseFSKDemod
+from dsp.multi_level_decision import MultiLevelSlicer
+from dsp.symbol_sync import TimingRecovery, pll_function
+from radio.synth import FSKEmitter, Synthesizer
+
+# 定时恢复：各 sps 下的锁定（无噪声时零误码、无滑码）、分块连续性，以及与旧版逐点实现的吞吐量对比
+
+FS = 2e6
+SPS_LIST = (4, 7, 10)  # main.py 中各级使用的每符号采样点数
+DURATION = 0.2
+BLOCK = 1024 * 16  # 与 PlutoReceiver.rx_buffer_size 一致
+
+
+def legacy_pll_function(freq_deviations, fs, symbol_rate, alpha=0.1, detect_threshold=1e4):
+    """旧版逐采样点峰值检测实现，仅作为吞吐量基准"""
+    sps = int(fs / symbol_rate)
+    threshold = detect_threshold
+    abs_freq_diff = np.abs(np.diff(freq_deviations))
+
+    mu = 0.0
+    last_peak_time = 0
+    last_lock_time = 0
+    sync_symbols = []
+
+    def linear_interpolate(sig, pos):
+        idx = int(np.floor(pos))
+        t = pos - idx
+        if idx < 0 or idx >= len(sig) - 1:
+            return sig[min(max(idx, 0), len(sig) - 1)]
+        y0 = sig[idx]
+        y1 = sig[idx + 1]
+        return y0 + t * (y1 - y0)
+
+    for n in range(1, len(abs_freq_diff) - 1):
+        is_peak = (
+            abs_freq_diff[n] > abs_freq_diff[n - 1]
+            and abs_freq_diff[n] > abs_freq_diff[n + 1]
+            and abs_freq_diff[n] > threshold
+        )
+        if is_peak and (n - last_peak_time) > sps // 2:
+            last_peak_time = n
+            expected_boundary = last_lock_time + sps / 2
+            error = n - expected_boundary
+            mu += alpha * error
+
+        if n >= last_lock_time + sps + mu:
+            interp_pos = last_lock_time + sps + mu
+            if interp_pos < len(freq_deviations):
+                sync_symbols.append(linear_interpolate(freq_deviations, interp_pos))
+            last_lock_time = interp_pos
+            mu = 0.0
+
+    return sync_symbols
+
+
+def discriminator_output(sps, noise_db=-60, seed=0):
+    """4-RRC-FSK 经 BaseFSKDemod 前端（下变频 -> RRC -> 鉴频）的输出，返回 (鉴频输出, 发送符号)"""
+    baud = FS / sps
+    em = FSKEmitter(0.0, baud, 0.0, fs=FS, seed=seed)
+    synth = Synthesizer([em], FS, noise_db=noise_db, seed=seed + 1)
+    demod = BaseFSKDemod(FS, 0.0, baud, sps)
+    freq, tx = [], []
+    for _ in range(int(FS * DURATION) // BLOCK):
+        iq = synth.generate(BLOCK)
+        tx.append(em.last_symbols)
+        freq.append(demod.disc.process(demod.rrc.process(demod.nco.mix(iq))).copy())
+    return np.concatenate(freq), np.concatenate(tx)
+
+
+def timeit(func, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_benchmark():
+    rows = []
+    for sps in SPS_LIST:
+        freq, tx = discriminator_output(sps)
+        rs = FS / sps
+        n = len(freq)
+
+        # 1. 锁定：无噪声时判决结果与发送符号逐个一致，不丢 / 插符号
+        samples, _ = TimingRecovery(FS, rs).process(freq)
+        symbols, _ = MultiLevelSlicer().process(samples)
+        compared, sym_err, _, slips = align_errors(symbols, tx)
+        assert compared > 0 and sym_err == 0 and slips == 0, (sps, compared, sym_err, slips)
+
+        # 2. 连续性：分块喂入（含小于捕获窗口的块）与整段处理完全一致
+        one_samples, one_index = TimingRecovery(FS, rs).process(freq)
+        for block in (BLOCK, 777, 3):
+            tr = TimingRecovery(FS, rs)
+            parts = [tr.process(freq[i:i + block]) for i in range(0, n, block)]
+            assert np.array_equal(np.concatenate([p[1] for p in parts]), one_index), (sps, block)
+            assert np.array_equal(np.concatenate([p[0] for p in parts]), one_samples), (sps, block)
+        assert np.array_equal(pll_function(freq, FS, rs), one_samples)
+        assert np.array_equal(pll_function(freq, FS, rs, alpha=0.15, detect_threshold=1e4), one_samples)
+
+        # 3. 吞吐量
+        def stream():
+            tr = TimingRecovery(FS, rs)
+            for i in range(0, n, BLOCK):
+                tr.process(freq[i:i + BLOCK])
+
+        t_ref = timeit(lambda: legacy_pll_function(freq, FS, rs), repeat=1)
+        t_stream = timeit(stream)
+        rows.append((sps, len(one_samples), compared, n / t_ref / 1e6, n / t_stream / 1e6, t_ref / t_stream))
+
+    print("===== 定时恢复 =====")
+    print(f"{'sps':>3s} {'符号数':>7s} {'零误码符号':>9s} {'旧版 (MS/s)':>11s} {'分块流式 (MS/s)':>15s} {'加速比':>7s}")
+    for sps, num, compared, ref, rate, speedup in rows:
+        print(f"{sps:3d} {num:7d} {compared:9d} {ref:11.2f} {rate:15.2f} {speedup:7.1f}x")
+    print(f"[OK] 各 sps 无噪声零误码、无滑码；分块喂入与整段处理一致；实时需求 {FS / 1e6:.2f} MS/s")
+
+
+if __name__ == "__main__":
+    run_benchmark()
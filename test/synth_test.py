@@ -0,0 +1,110 @@
+import sys
+import os
+import time
+import numpy as np
+from commpy.filters import rrcosfilter
+from scipy.signal import fftconvolve
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radio.synth import FSKEmitter, Synthesizer, preset_emitter
+from monitor.energy_detector import Energy_Detector
+
+# 合成器验证：分块生成与整段一致、频点 / 功率 / 噪声底正确、标签与检测结果吻合，以及相对旧版逐符号循环的速度
+
+FS = 2e6
+CENTER_FREQ = 433e6
+BLOCK = 1024 * 16
+
+
+def legacy_wave(fc_offset, rs, alpha, num_taps, pwr_dbm, fs, duration_sec):
+    """旧版 WaveSource.generate（逐符号循环上采样 + 两次整段 exp），仅用于对比速度"""
+    num_samples = int(fs * duration_sec)
+    num_symbols = int(rs * duration_sec)
+    normalized_symbols = np.random.choice([-3, -1, 1, 3], num_symbols) / 3.0
+    sps = fs / rs
+    upsampled = np.zeros(num_samples)
+    for i in range(num_symbols):
+        idx = int(i * sps)
+        if idx < num_samples:
+            upsampled[idx] = normalized_symbols[i]
+    _, taps = rrcosfilter(num_taps, alpha, 1 / rs, fs)
+    taps /= np.sum(taps)
+    freq_control = fftconvolve(upsampled, taps, mode="same")
+    phase = 2 * np.pi * rs * np.cumsum(freq_control) / fs
+    t = np.arange(num_samples) / fs
+    return np.exp(1j * phase) * np.exp(1j * 2 * np.pi * fc_offset * t) * 10 ** (pwr_dbm / 20)
+
+
+def mean_freq(iq):
+    """平均瞬时频率（按相位差的圆周平均，跨越 ±fs/2 的信号不会偏）"""
+    return np.angle(np.sum(iq[1:] * np.conj(iq[:-1]))) * FS / (2 * np.pi)
+
+
+def run_synth_test():
+    # 1. 分块生成与一次生成结果一致（相位、符号时钟、滤波历史均跨块连续）
+    kw = dict(power_db=-10, fs=FS, clock_ppm=50, freq_drift=2e3, seed=3)
+    whole = FSKEmitter(-0.8e6, 500e3, **kw).generate(10 * BLOCK)
+    e = FSKEmitter(-0.8e6, 500e3, **kw)
+    sizes = [BLOCK // 3, BLOCK, 7, 3 * BLOCK, 6 * BLOCK - BLOCK // 3 - 7]
+    parts = np.concatenate([e.generate(n) for n in sizes])
+    assert np.allclose(whole, parts, atol=1e-4)
+    print(f"[OK] 分块生成与整段生成一致 (最大误差 {np.max(np.abs(whole - parts)):.1e})")
+
+    # 2. 频点、功率与噪声底
+    for level in ("L1", "L2", "L3"):
+        em = preset_emitter(level, CENTER_FREQ, FS, seed=1)
+        iq = em.generate(8 * BLOCK)
+        power = 10 * np.log10(np.mean(np.abs(iq) ** 2))
+        centroid = mean_freq(iq)
+        assert abs(power - 20 * np.log10(em.amp)) < 0.1
+        assert abs(centroid - em.freq_offset) < 0.05 * em.baud, (level, centroid)
+    noise = Synthesizer([], FS, noise_db=-40, seed=0).generate(8 * BLOCK)
+    assert abs(10 * np.log10(np.mean(np.abs(noise) ** 2)) + 40) < 0.1
+    print("[OK] 各级干扰中心频点 / 功率与设定一致，噪声功率 -40 dB")
+
+    # 3. 频偏漂移：1 s 内中心频点按设定速度移动
+    em = FSKEmitter(0.0, 100e3, fs=FS, freq_drift=100e3, seed=2)
+    first = mean_freq(em.generate(BLOCK))
+    em.generate(int(FS) - 2 * BLOCK)
+    last = mean_freq(em.generate(BLOCK))
+    assert abs((last - first) - 100e3) < 5e3, (first, last)
+    print(f"[OK] 频偏漂移 100 kHz/s：首尾块中心频点相差 {(last - first) / 1e3:.1f} kHz")
+
+    # 4. 带标签的渲染：检测结果与标签一致
+    # （广播源单独存在且明显高于噪声底时检测器本身即判为 L3，这里把广播源压到噪声底以下）
+    emitters = [preset_emitter("BC", CENTER_FREQ, FS, power_db=-75, seed=0)]
+    emitters += [preset_emitter(lvl, CENTER_FREQ, FS, seed=i) for i, lvl in enumerate(("L1", "L3"), 1)]
+    synth = Synthesizer(emitters, FS, noise_db=-60, seed=0)
+    detector = Energy_Detector(fs=FS, avg_alpha=None)
+    plan = [("NONE", 20), ("L1", 20), ("L3", 20), ("NONE", 20)]
+    agree = total = 0
+    for iq, label in synth.render(plan, BLOCK):
+        agree += detector.detect(iq, CENTER_FREQ) == label
+        total += 1
+    assert agree / total > 0.95, agree / total
+    print(f"[OK] 渲染 {total} 块，检测结果与标签一致率 {agree / total:.3f}")
+
+    # 5. 速度：广播源 + 三级干扰 + 噪声
+    duration = 2.0
+    emitters = [preset_emitter(lvl, CENTER_FREQ, FS, seed=i) for i, lvl in enumerate(("BC", "L1", "L2", "L3"))]
+    synth = Synthesizer(emitters, FS, noise_db=-60, seed=0)
+    n_blocks = int(duration * FS / BLOCK)
+    t0 = time.perf_counter()
+    for _ in range(n_blocks):
+        for e in emitters:
+            e.level = None  # 全部常开
+        synth.generate(BLOCK)
+    t_new = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    np.random.seed(0)
+    legacy = sum(legacy_wave(e.freq_offset, e.baud, 0.25, 88, -10, FS, n_blocks * BLOCK / FS) for e in emitters)
+    t_old = time.perf_counter() - t0
+    del legacy
+    rt = n_blocks * BLOCK / FS
+    print(f"[SPEED] 4 个发射源 + 噪声，{rt:.2f}s 信号: 流式合成 {t_new:.3f}s ({rt / t_new:.1f}x 实时)，"
+          f"旧版整段生成 {t_old:.3f}s ({rt / t_old:.1f}x 实时)")
+
+
+if __name__ == "__main__":
+    run_synth_test()
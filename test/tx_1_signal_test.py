@@ -1,40 +1,26 @@
 import numpy as np
 import adi
 import time
-from commpy.filters import rrcosfilter
-from scipy.signal import fftconvolve
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radio.synth import FSKEmitter
  
 # 4-RRC-FSK 波形发生器
 
-class RRCFSKSource:
+class RRCFSKSource(FSKEmitter):
+    """零频偏、单位幅度的 4-RRC-FSK（合成见 radio/synth.py），最大频偏 = Rs"""
+
     def __init__(self, rs, alpha, num_taps, fs=2e6):
-        self.rs = rs                  # Symbol rate
-        self.alpha = alpha
-        self.num_taps = num_taps
-        self.fs = fs
-        self.delta_f = rs             # 规则：最大频偏 = Rs
+        self.rs = rs
+        super().__init__(0.0, rs, 0.0, alpha, num_taps, fs=fs)
 
     def generate(self, duration):
-        num_samples = int(self.fs * duration)
-        num_symbols = int(self.rs * duration)
-
-        # 4-FSK 符号
-        symbols = np.random.choice([-3, -1, 1, 3], num_symbols) / 3.0
-
-        # 上采样
-        sps = int(self.fs / self.rs)
-        up = np.zeros(num_samples)
-        up[::sps] = symbols[:len(up[::sps])]
-
-        # RRC 滤波
-        _, rrc = rrcosfilter(self.num_taps, self.alpha, 1/self.rs, self.fs)
-        rrc /= np.sum(rrc)
-
-        freq_ctrl = fftconvolve(up, rrc, mode="same")
-
-        # FSK 相位积分
-        phase = 2 * np.pi * self.delta_f * np.cumsum(freq_ctrl) / self.fs
-        return np.exp(1j * phase)
+        self.seed = np.random.randint(2 ** 31)
+        self.reset()
+        return super().generate(int(self.fs * duration))
 
 # Pluto 自发自收
 
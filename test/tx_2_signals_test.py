@@ -1,8 +1,11 @@
 import numpy as np
-import adi
 import time
-from commpy.filters import rrcosfilter
-from scipy.signal import fftconvolve
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radio.synth import FSKEmitter
 
 # --- 用户手动配置区 ---
 CURRENT_LEVEL = 3       # 在这里修改等级：1, 2, 或 3
@@ -10,34 +13,22 @@ RECORD_DURATION = 5     # 运行一次发射并录制的时长（秒）
 OUTPUT_FILE = f"level_{CURRENT_LEVEL}_capture.iq" # 自动命名文件
 # ----------------------
 
-class WaveSource:
+class WaveSource(FSKEmitter):
+    """单段发射波形（合成见 radio/synth.py），每次 generate 为独立的一段随机符号"""
+
     def __init__(self, name, fc_offset, rs, alpha, num_taps, pwr_dbm, fs=2e6):
-        self.name, self.fc_offset, self.rs = name, fc_offset, rs
-        self.alpha, self.num_taps, self.pwr_dbm, self.fs = alpha, num_taps, pwr_dbm, fs
-        self.delta_f = rs 
+        self.fc_offset, self.rs, self.pwr_dbm = fc_offset, rs, pwr_dbm
+        super().__init__(fc_offset, rs, pwr_dbm, alpha, num_taps, fs=fs, name=name)
 
     def generate(self, duration_sec=0.5):
-        num_samples = int(self.fs * duration_sec)
-        num_symbols = int(self.rs * duration_sec)
-        raw_symbols = np.random.choice([-3, -1, 1, 3], num_symbols)
-        normalized_symbols = raw_symbols / 3.0
-        sps = self.fs / self.rs
-        upsampled = np.zeros(num_samples)
-        for i in range(num_symbols):
-            idx = int(i * sps)
-            if idx < num_samples: upsampled[idx] = normalized_symbols[i]
-        ts = 1 / self.rs
-        _, taps = rrcosfilter(self.num_taps, self.alpha, ts, self.fs)
-        taps /= np.sum(taps)
-        freq_control = fftconvolve(upsampled, taps, mode="same")
-        dt = 1 / self.fs
-        phase = 2 * np.pi * self.delta_f * np.cumsum(freq_control) * dt
-        baseband_fsk = np.exp(1j * phase)
-        t = np.arange(num_samples) / self.fs
-        shifted_signal = baseband_fsk * np.exp(1j * 2 * np.pi * self.fc_offset * t)
-        return shifted_signal * 10**(self.pwr_dbm / 20)
+        # 种子取自全局随机数发生器，np.random.seed 仍能固定波形
+        self.seed = np.random.randint(2 ** 31)
+        self.reset()
+        return super().generate(int(self.fs * duration_sec))
 
 def main():
+    import adi  # 仅发射时需要，WaveSource 可在无硬件环境下导入
+
     FS = 2e6
     CENTER_FREQ = 433e6
     sdr = None
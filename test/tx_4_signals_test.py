@@ -1,62 +1,26 @@
 import numpy as np
 import adi
 import time
-from commpy.filters import rrcosfilter
-from scipy.signal import fftconvolve
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radio.synth import FSKEmitter
+
+class WaveSource(FSKEmitter):
+    """单段发射波形（合成见 radio/synth.py），每次 generate 为独立的一段随机符号"""
 
-class WaveSource:
     def __init__(self, name, fc_offset, rs, alpha, num_taps, pwr_dbm, fs=2e6):
-        self.name = name
-        self.fc_offset = fc_offset  # Hz
-        self.rs = rs                # Symbol Rate (Hz)
-        self.alpha = alpha
-        self.num_taps = num_taps
-        self.pwr_dbm = pwr_dbm
-        self.fs = fs
-        # 最大频偏 Delta_f = Symbol Rate
-        self.delta_f = rs 
+        self.fc_offset, self.rs, self.pwr_dbm = fc_offset, rs, pwr_dbm
+        super().__init__(fc_offset, rs, pwr_dbm, alpha, num_taps, fs=fs, name=name)
 
     def generate(self, duration_sec=0.1):
-        num_samples = int(self.fs * duration_sec)
-        num_symbols = int(self.rs * duration_sec)
-        
-        # 1. 生成 4-FSK 符号映射
-        # 为了让最大符号 3 对应 Delta_f，将符号归一化到 [-1, 1] 区间
-        # 映射：-3 -> -1.0, -1 -> -0.33, 1 -> 0.33, 3 -> 1.0
-        raw_symbols = np.random.choice([-3, -1, 1, 3], num_symbols)
-        normalized_symbols = raw_symbols / 3.0
-        
-        # 2. 上采样
-        sps = self.fs / self.rs
-        upsampled = np.zeros(num_samples)
-        for i in range(num_symbols):
-            idx = int(i * sps)
-            if idx < num_samples:
-                upsampled[idx] = normalized_symbols[i]
+        # 种子取自全局随机数发生器，np.random.seed 仍能固定波形
+        self.seed = np.random.randint(2 ** 31)
+        self.reset()
+        return super().generate(int(self.fs * duration_sec))
 
-        # 3. RRC 脉冲成形滤波 (作为频率演变曲线)
-        ts = 1 / self.rs
-        _, taps = rrcosfilter(self.num_taps, self.alpha, ts, self.fs)
-        taps /= np.sum(taps) # 保持直流增益
-        
-        # 得到平滑后的频率控制信号 (范围约在 -1 到 1 之间)
-        freq_control = fftconvolve(upsampled, taps, mode="same")
-        
-        # 4. FSK 积分调制
-        # 瞬时频率 f(t) = Delta_f * freq_control
-        # 相位 phi(t) = 2 * pi * sum( f(t) * dt )
-        dt = 1 / self.fs
-        phase = 2 * np.pi * self.delta_f * np.cumsum(freq_control) * dt
-        baseband_fsk = np.exp(1j * phase)
-
-        # 5. 频移至中心频点偏移处
-        t = np.arange(num_samples) / self.fs
-        shifted_signal = baseband_fsk * np.exp(1j * 2 * np.pi * self.fc_offset * t)
-        
-        # 6. 功率缩放
-        # 参考：0dBm 对应幅值 1.0 (在归一化前)
-        amplitude = 10**(self.pwr_dbm / 20)
-        return shifted_signal * amplitude
 
 # --- 硬件配置 ---
 FS = 2e6
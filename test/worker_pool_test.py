@@ -0,0 +1,73 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from demod.worker_pool import WorkerPool
+from radio.ring_buffer import IQRingBuffer
+
+# 预热线程池验证：迟滞过滤抖动、切换耗时、恢复后首块延迟
+
+FS = 2e6
+BLOCK = 1024 * 16
+LEVELS = {
+    "L1": (-1.3e6, 500e3, 4),
+    "L2": (-0.9e6, 285e3, 7),
+    "L3": (0, 200e3, 10),
+}
+
+
+def run_worker_pool_test():
+    np.random.seed(0)
+    ring = IQRingBuffer(block_size=BLOCK)
+    iq = (np.random.randn(BLOCK) + 1j * np.random.randn(BLOCK)).astype(np.complex64)
+
+    t0 = time.perf_counter()
+    pool = WorkerPool(ring, LEVELS, FS, switch_hold=3, verbose=False)
+    pool.start()
+    print(f"预热 {len(LEVELS)} 条链路耗时: {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+    # 1. 单帧抖动被迟滞过滤
+    for state in ["L1", "NONE", "L2", "NONE", "L1", "NONE"]:
+        pool.update(state)
+        ring.write(iq)
+    assert pool.current == "NONE" and pool.switches == 0
+    assert all(w.blocks == 0 for w in pool.workers.values())
+
+    # 2. 稳定状态触发切换，只有目标链路在处理
+    sequence = ["L2"] * 10 + ["L3"] * 10 + ["NONE"] * 5 + ["L1"] * 10
+    for state in sequence:
+        pool.update(state)
+        ring.write(iq)
+        time.sleep(0.02)
+    time.sleep(0.1)
+    assert pool.current == "L1" and pool.switches == 4
+
+    m = pool.metrics()
+    pool.stop()
+
+    print(f"[OK] 切换 {m['switches']} 次，过滤抖动 {m['suppressed']} 次")
+    print(f"切换调用耗时: 平均 {m['switch_latency_us']['mean']:.1f} us, "
+          f"最大 {m['switch_latency_us']['max']:.1f} us")
+    for level, fb in m["first_block_latency"].items():
+        print(f"{level} 恢复后首块处理完成: 平均 {fb['mean_ms']:.2f} ms, 最大 {fb['max_ms']:.2f} ms")
+
+    # 3. 信道化：按符号率规划抽取倍数，只有 L3 (sps 10) 能在每符号 >= 4 点的前提下抽取
+    pool = WorkerPool(ring, LEVELS, FS, switch_hold=1, verbose=False, channelize=True)
+    pool.start()
+    assert {level: w.demod.decimation for level, w in pool.workers.items()} == {"L1": 1, "L2": 1, "L3": 2}
+    for _ in range(5):
+        pool.update("L3")
+        ring.write(iq)
+        time.sleep(0.02)
+    time.sleep(0.1)
+    blocks = pool.workers["L3"].blocks
+    pool.stop()
+    assert blocks > 0
+    print(f"[OK] 信道化链路: L3 抽取 2 倍后处理 {blocks} 块")
+
+
+if __name__ == "__main__":
+    run_worker_pool_test()
@@ -0,0 +1,342 @@
+# 运行时埋点：各级耗时 / 吞吐量 / 缓冲区数据龄 / 丢弃计数
+import copy
+import json
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """
+    HDR 风格的对数分桶直方图
+    - 桶数在构造时确定（默认 1e-7 ~ 60 s、相对精度 1% 约 2000 个桶），内存固定，不随样本数增长
+    - record() 为一次对数 + 一次计数自增，record_many() 对一批数值向量化分桶；分位数的相对误差不超过 precision
+    - 本身不加锁，多线程使用时由 Stage 保护
+    """
+
+    def __init__(self, lowest=1e-7, highest=60.0, precision=0.01):
+        self.lowest = lowest
+        self.highest = highest
+        self.precision = precision
+        self._log_low = math.log(lowest)
+        self._log_base = math.log1p(precision)
+        self.num_buckets = int(math.ceil((math.log(highest) - self._log_low) / self._log_base)) + 2
+        self.reset()
+
+    def reset(self):
+        self.counts = np.zeros(self.num_buckets, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        if value <= self.lowest:
+            i = 0
+        else:
+            i = min(int((math.log(value) - self._log_low) / self._log_base) + 1, self.num_buckets - 1)
+        self.counts[i] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def record_many(self, values):
+        """一次记录一批数值，分桶与逐个 record() 相同"""
+        if not len(values):
+            return
+        v = np.asarray(values, dtype=np.float64)
+        i = ((np.log(np.maximum(v, self.lowest)) - self._log_low) / self._log_base).astype(np.int64) + 1
+        i = np.where(v <= self.lowest, 0, np.minimum(i, self.num_buckets - 1))
+        self.counts += np.bincount(i, minlength=self.num_buckets)
+        self.count += len(v)
+        self.total += float(v.sum())
+        self.max = max(self.max, float(v.max()))
+
+    def _bucket_value(self, i):
+        # 桶的几何中点
+        if i == 0:
+            return self.lowest
+        return math.exp(self._log_low + (i - 0.5) * self._log_base)
+
+    def percentiles(self, qs):
+        """返回各分位数 (0~100) 对应的值；无记录时全为 0"""
+        if self.count == 0:
+            return [0.0 for _ in qs]
+        cum = np.cumsum(self.counts)
+        out = []
+        for q in qs:
+            i = int(np.searchsorted(cum, max(1, math.ceil(q / 100 * self.count))))
+            out.append(min(self._bucket_value(i), self.max))
+        return out
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class Stage:
+    """
+    一个处理阶段：耗时直方图 + 处理的采样数
+    - 记录只把 (耗时, 采样数) 追加到待处理列表（list.append 在 GIL 下是原子操作，不加锁），
+      攒满 PENDING 条再加锁一次性分桶：处理线程在两块数据之间缓存已冷，逐条加锁分桶的实际开销远大于微基准
+    - 快照时加锁把待处理记录并入直方图后换入新的直方图（双缓冲），统计在锁外进行；
+      取待处理记录用 "复制前 n 条 + 删除前 n 条"，其间追加的记录留在列表中，不会丢失或计入两个快照
+    """
+
+    PENDING = 256
+
+    def __init__(self, name):
+        self.name = name
+        self.hist = LatencyHistogram()
+        self.samples = 0
+        self.lock = threading.Lock()
+        self._pending = []
+
+    def record(self, elapsed, samples=0):
+        pending = self._pending
+        pending.append((elapsed, samples))
+        if len(pending) >= self.PENDING:
+            self.merge()
+
+    def merge(self):
+        """把待处理记录并入直方图"""
+        with self.lock:
+            self._merge()
+
+    def _merge(self):
+        # 调用方持有 self.lock
+        n = len(self._pending)
+        if n:
+            batch = self._pending[:n]
+            del self._pending[:n]
+            elapsed, samples = zip(*batch)
+            self.hist.record_many(elapsed)
+            self.samples += sum(samples)
+
+    def swap(self):
+        """换入空的直方图与采样计数，返回换出的 (直方图, 采样数)"""
+        fresh = LatencyHistogram(self.hist.lowest, self.hist.highest, self.hist.precision)
+        with self.lock:
+            self._merge()
+            hist, samples = self.hist, self.samples
+            self.hist, self.samples = fresh, 0
+        return hist, samples
+
+    def copy(self):
+        """不清空，返回当前 (直方图副本, 采样数)"""
+        with self.lock:
+            self._merge()
+            return copy.deepcopy(self.hist), self.samples
+
+
+class _Span:
+    __slots__ = ("stage", "samples", "t0")
+
+    def __init__(self, stage, samples):
+        self.stage = stage
+        self.samples = samples
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # 与 Stage.record 相同，内联以减少一次调用
+        st = self.stage
+        pending = st._pending
+        pending.append((time.perf_counter() - self.t0, self.samples))
+        if len(pending) >= st.PENDING:
+            st.merge()
+        return False
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(metrics, name, samples=0):
+    """metrics 为 None 时返回空操作的上下文，埋点代码无需判断是否启用"""
+    if metrics is None:
+        return _NULL_SPAN
+    return metrics.span(name, samples)
+
+
+def stage_span(stage, samples=0):
+    """同 span()，stage 为 Metrics.stage() 预先取出的阶段（None 时为空操作）：每次计时不再查表，用于逐块调用的热路径"""
+    if stage is None:
+        return _NULL_SPAN
+    return _Span(stage, samples)
+
+
+class Metrics:
+    """
+    埋点注册表
+    - span(name, samples) 用单调时钟 (perf_counter) 计时一个阶段
+    - observe(name, value) 记录任意数值分布（如缓冲区数据龄）
+    - drop(name, n) 累加丢弃计数
+    - add_source(name, func) 在快照中附带其他模块的 stats()
+    - snapshot(reset=True) 输出自上次快照以来各阶段的 p50 / p99 / 最大耗时与吞吐量
+    记录线程与快照线程可以并发：各阶段 / 数值分布由 Stage 双缓冲，快照换出旧数据后再统计，
+    记录不会丢失或计入两个快照；新建阶段与丢弃计数由注册表的锁保护
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.values = {}
+        self.drops = {}
+        self.sources = {}
+        self._lock = threading.Lock()
+        self._t_start = time.monotonic()
+        self._t_last = self._t_start
+
+    def stage(self, name):
+        st = self.stages.get(name)
+        if st is None:
+            with self._lock:
+                st = self.stages.get(name)
+                if st is None:
+                    st = self.stages[name] = Stage(name)
+        return st
+
+    def span(self, name, samples=0):
+        return _Span(self.stage(name), samples)
+
+    def record(self, name, elapsed, samples=0):
+        self.stage(name).record(elapsed, samples)
+
+    def observe(self, name, value):
+        # 数值分布与阶段共用 Stage 结构（只用其直方图）
+        st = self.values.get(name)
+        if st is None:
+            with self._lock:
+                st = self.values.get(name)
+                if st is None:
+                    st = self.values[name] = Stage(name)
+        st.record(value)
+
+    def drop(self, name, n=1):
+        with self._lock:
+            self.drops[name] = self.drops.get(name, 0) + n
+
+    def add_source(self, name, func):
+        self.sources[name] = func
+
+    def snapshot(self, reset=True):
+        now = time.monotonic()
+        window = max(now - self._t_last, 1e-9)
+        stages = {}
+        for name, st in list(self.stages.items()):
+            h, samples = st.swap() if reset else st.copy()
+            p50, p99 = h.percentiles((50, 99))
+            stages[name] = {
+                "count": h.count,
+                "p50_ms": p50 * 1e3,
+                "p99_ms": p99 * 1e3,
+                "max_ms": h.max * 1e3,
+                "mean_ms": h.mean() * 1e3,
+                "busy": h.total / window,  # 该阶段占用的时间比例
+                "samples_per_s": samples / window,
+            }
+        values = {}
+        for name, st in list(self.values.items()):
+            h, _ = st.swap() if reset else st.copy()
+            p50, p99 = h.percentiles((50, 99))
+            values[name] = {"count": h.count, "p50": p50, "p99": p99, "max": h.max}
+        sources = {}
+        for name, func in list(self.sources.items()):
+            try:
+                sources[name] = func()
+            except Exception as e:
+                sources[name] = {"error": str(e)}
+        with self._lock:
+            drops = dict(self.drops)
+        if reset:
+            self._t_last = now
+        return {
+            "time": time.time(),
+            "uptime_s": now - self._t_start,
+            "window_s": window,
+            "stages": stages,
+            "values": values,
+            "drops": drops,
+            "sources": sources,
+        }
+
+
+class MetricsServer:
+    """
+    周期快照输出
+    - 每 interval 秒做一次快照（按窗口统计），保存为 latest
+    - path 非空时原子替换写入 JSON 文件
+    - port 非空时在 host:port 提供 HTTP GET，返回最近一次快照的 JSON
+    """
+
+    def __init__(self, metrics, interval=1.0, path=None, host="127.0.0.1", port=None):
+        self.metrics = metrics
+        self.interval = interval
+        self.path = path
+        self.latest = {}
+        self.running = False
+        self._thread = None
+        self._httpd = None
+        if port is not None:
+            self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+            self.port = self._httpd.server_address[1]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(server.latest, ensure_ascii=False, default=str).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        if self._httpd is not None:
+            threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def publish(self):
+        self.latest = self.metrics.snapshot(reset=True)
+        if self.path:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.latest, f, indent=2, ensure_ascii=False, default=str)
+            os.replace(tmp, self.path)
+        return self.latest
+
+    def _run(self):
+        next_t = time.monotonic() + self.interval
+        while self.running:
+            time.sleep(max(0.0, next_t - time.monotonic()))
+            next_t += self.interval
+            if self.running:
+                self.publish()
+
+    def stop(self):
+        self.running = False
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()